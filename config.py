@@ -2,15 +2,37 @@ import os
 
 DIFFICULTY = "easy"
 LAYOUT = "default"
-PAST_CHORDS = []
 MAX_HISTORY = 4
 TIMER_INTERVAL_MS = 5000
+PLAY_CHORDS = False
+STRUM_PATTERN = "down"  # key of utils.synth.STRUM_PATTERNS
+METRONOME_BPM = 80
+BEATS_PER_BAR = 4
+BARS_PER_CHORD = 2
+METRONOME_PATTERN = "folk"  # key of utils.metronome.STRUM_PATTERNS
+LISTEN_CHORDS = False  # advance once the shown chord is heard from the microphone
+LISTEN_INTERVAL_MS = 40  # time between two chord analyses while listening
+RECORDING_DIR = "recordings"
+RECORDING_FORMAT = "wav"  # "wav" or "flac" (encoded by the FLAC tool bundled with SpeechRecognition)
+RECORDING_CHUNK_SECONDS = 300  # length of one part file of a recording
+TRACE_DIR = "traces"  # where Help > Record trace writes its Chrome/Perfetto trace files
+QUIZ_PAUSE_MS = 400  # pause between an answer and the next quiz question
 LANG_CODE = ""
 BASE_FONT = ""
 CHORD_DISPLAY_SETTING = "frets"
 PREFERED_HAND = "right"
+TUNING = "standard"
 CONFIG_PATH = "config.json"
 CHORD_PATH = "chords/chord_db.json"
+CHORD_STORAGE = "json"  # "json" or "sqlite"
+CHORD_DB_PATH = "chords/chord_db.sqlite"
+CHORD_PACK_DIR = os.path.join("chords", "packs")
+DISABLED_PACKS = []
+WATCH_CHORDS = False
+PRACTICE_LOG_PATH = "practice_log.sqlite"  # empty to turn the practice log off
 ASSET_PATH = os.path.join("assets", "images")
 TEXTURE_PATH = os.path.join(ASSET_PATH, "wood_texture.jpg")
+CLASSROOM_PAGE_DIR = os.path.join("assets", "classroom")
+SINGLE_INSTANCE = True  # a second launch hands its command to the running trainer
+CONTROL_SOCKET_PATH = ""  # empty for a socket in the user's runtime directory (Windows: port file in %LOCALAPPDATA%)
 DISCORD_CLIENT_ID = "1381930896046817411"
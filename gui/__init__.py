@@ -4,7 +4,9 @@ from .fretboardDefault import DefaultFretboard
 from .fretboardLegacy import LegacyFretboard
 from .mainGuiLogicManager import GuiLogicManager
 from .chordEditorGUI import ChordEditor
+from .tunerGUI import TunerWindow
 from .editorLogicManager import ChordEditorLogic
 from .menubar import create_menubar
+from .remoteControl import RemoteControl
 
-__all__ = ["DefaultChordTrainerGUI", "DefaultFretboard", "LegacyChordTrainerGUI", "LegacyFretboard", "GuiLogicManager", "create_menubar", "ChordEditor", "ChordEditorLogic"]
+__all__ = ["DefaultChordTrainerGUI", "DefaultFretboard", "LegacyChordTrainerGUI", "LegacyFretboard", "GuiLogicManager", "create_menubar", "ChordEditor", "ChordEditorLogic", "TunerWindow", "RemoteControl"]
@@ -52,7 +52,8 @@ class ChordEditor(ctk.CTkToplevel):
 
         self.is_dirty = False # just to make sure "no changes" are saved to the file later
         self.saved = False
-        self.data = utils.load_chords(self.lang, filter_by_difficulty=False)
+        self.data = utils.load_chords(self.lang, filter_by_difficulty=False, include_packs=False)
+        self.logic.build_chord_index(self.data)
         self.tables = {}      
         self.config_data = utils.load_config()
         self.mode = self.config_data.get("theme", "dark")
@@ -188,7 +189,7 @@ class ChordEditor(ctk.CTkToplevel):
 
         tree = ttk.Treeview(
             tree_frame,
-            columns=("name", "fingering", "fingers", "notes_on_strings", "chord_notes", "intervals"),
+            columns=("name", "fingering", "fingers", "notes_on_strings", "chord_notes", "intervals", "score"),
             show="headings",
             style="Custom.Treeview"
         )
@@ -206,6 +207,7 @@ class ChordEditor(ctk.CTkToplevel):
         tree.heading("notes_on_strings", text=f"{self.lang['editor_notes_on_strings']}", anchor="center")
         tree.heading("chord_notes", text=f"{self.lang['editor_chord_notes']}", anchor="center")
         tree.heading("intervals", text=f"{self.lang['editor_interval']}", anchor="center")
+        tree.heading("score", text=f"{self.lang['editor_score']}", anchor="center")
 
         # Define column properties
         for col in tree["columns"]:
@@ -307,7 +309,7 @@ class ChordEditor(ctk.CTkToplevel):
             )
             return
 
-        data = self.logic.prepare_save_data(self.tables)
+        data = self.logic.prepare_save_data(self.tables, self.data)
         success, error = self.logic.save_data(data)
 
         if success:
@@ -365,6 +367,10 @@ class ChordEditor(ctk.CTkToplevel):
         if self.edit_box:
             return
 
+        # computed columns are read-only
+        if tree["columns"][int(col[1:]) - 1] in self.logic.computed_columns:
+            return
+
         x, y, width, height = tree.bbox(row_id, col)
         if not width:
             return
@@ -384,6 +390,12 @@ class ChordEditor(ctk.CTkToplevel):
             old_value = tree.set(row_id, col)
             if new_value != old_value:
                 tree.set(row_id, col, new_value)
+                column_name = tree["columns"][int(col[1:]) - 1]
+                if column_name == "fingering":
+                    self._suggest_from_fingering(tree, row_id, new_value)
+                if column_name in ("fingering", "fingers"):
+                    tree.set(row_id, "score", self.logic.score_for_row(
+                        tree.set(row_id, "fingering"), tree.set(row_id, "fingers")))
                 self.is_dirty = True
                 self.update_buttons_state()
             self.edit_box.destroy()
@@ -402,6 +414,31 @@ class ChordEditor(ctk.CTkToplevel):
         self.edit_box.bind("<Escape>", lambda e: self.cancel_edit())
 
 
+    def _suggest_from_fingering(self, tree, row_id, fingering):
+        """
+        Fill in chord name, fingers and string notes for cells that are still placeholders.
+
+        Args:
+            tree (Treeview): The Treeview widget.
+            row_id (str): The ID of the edited row.
+            fingering (str): The new fingering cell value.
+        """
+
+        empty = self.logic.placeholders | {""}
+        if tree.set(row_id, "name").strip() in empty:
+            suggestion = self.logic.suggest_chord_name(fingering)
+            if suggestion:
+                tree.set(row_id, "name", suggestion)
+        if tree.set(row_id, "fingers").strip() in empty:
+            fingers = self.logic.suggest_fingers(fingering)
+            if fingers:
+                tree.set(row_id, "fingers", fingers)
+        if tree.set(row_id, "notes_on_strings").strip() in empty:
+            notes = self.logic.suggest_notes_on_strings(fingering)
+            if notes:
+                tree.set(row_id, "notes_on_strings", notes)
+
+
     def cancel_edit(self):
         """Cancel editing and remove the edit box without saving changes."""
         if self.edit_box:
@@ -1,7 +1,12 @@
+import time
 import customtkinter as ctk
 import config
+from tkinter import messagebox
 from gui.fretboardDefault import DefaultFretboard
 from gui.mainGuiLogicManager import GuiLogicManager
+from utils.chord_keys import ChordKeyIndex
+from utils.quiz import ChordQuiz
+from utils.tunings import chord_fingering
 
 
 class DefaultChordTrainerGUI(ctk.CTkFrame):
@@ -15,7 +20,7 @@ class DefaultChordTrainerGUI(ctk.CTkFrame):
     Attributes:
         chords (list): List of chord data dictionaries.
         lang (dict): Dictionary with language-specific UI labels.
-        mode_var (StringVar): Current mode selection (random, song, twitch).
+        mode_var (StringVar): Current mode selection (random, transition drill, song, twitch).
         logic (GuiLogicManager): Handles all non-visual chord logic.
     """
 
@@ -31,15 +36,34 @@ class DefaultChordTrainerGUI(ctk.CTkFrame):
 
         super().__init__(master)
         self.chords = chords
+        self.chord_keys = ChordKeyIndex(chords)
         self.lang = lang
         self._last_fingering = []
         self._last_fingers = []
+        self.identify_mode = False
+        self._identify_fingering = []
+        self.quiz = None
+        self._quiz_fingering = []
+        self._quiz_after_id = None
 
         self.modes = [
             f"{self.lang['trainer_mode_random']}", 
+            f"{self.lang['trainer_mode_transition']}",
+            f"{self.lang['trainer_mode_quiz']}",
             f"{self.lang['trainer_mode_song']}", 
             f"{self.lang['trainer_mode_twitch']}"
             ]
+        # modes the logic manager already supports, mapped to their internal key
+        self.mode_keys = {
+            f"{self.lang['trainer_mode_random']}": "random",
+            f"{self.lang['trainer_mode_transition']}": "transition",
+            f"{self.lang['trainer_mode_quiz']}": "quiz",
+        }
+        self.band_keys = {
+            f"{self.lang['transition_band_small']}": "small",
+            f"{self.lang['transition_band_medium']}": "medium",
+            f"{self.lang['transition_band_large']}": "large",
+        }
         self.mode_var = ctk.StringVar(value=f"{self.lang['trainer_mode_random']}")
 
         self.build_widgets()
@@ -58,14 +82,16 @@ class DefaultChordTrainerGUI(ctk.CTkFrame):
         """ Trigger the logic to display the first chord. """
         self.logic.next_chord(self.lang)
 
-    def reload_chords(self, chords):
+    def reload_chords(self, chords, chord_keys=None):
         """
         Reload the chord list (e.g. after language or difficulty change).
 
         Args:
             chords (list): The new list of chords.
+            chord_keys (ChordKeyIndex, optional): Lookup of the chords, e.g. the one of the session.
         """
         self.chords = chords
+        self.chord_keys = chord_keys or ChordKeyIndex(chords)
 
     def update_chord_label(self, text):
         """
@@ -74,7 +100,8 @@ class DefaultChordTrainerGUI(ctk.CTkFrame):
         Args:
             text (str): The new chord name.
         """
-        self.current_chord.configure(text=text)
+        if self.quiz is None:
+            self.current_chord.configure(text=text)
 
     def update_fretboard(self, fingering, fingers):
         """
@@ -84,9 +111,50 @@ class DefaultChordTrainerGUI(ctk.CTkFrame):
             fingering (list): List of finger positions per string.
             fingers (list): List of finger numbers per string.
         """
-        self.fretboard_middle.draw_chord(fingering, fingers)
         self._last_fingering = fingering
         self._last_fingers = fingers
+        if not self.identify_mode and self.quiz is None:
+            self.fretboard_middle.draw_chord(fingering, fingers)
+
+    def update_alternatives(self, voicings):
+        """
+        Show buttons for alternative voicings of the current chord.
+
+        Args:
+            voicings (list): Alternative (fingering, fingers) tuples, easiest first.
+        """
+        for button in self.alternative_buttons:
+            button.destroy()
+        self.alternative_buttons = []
+
+        if not voicings:
+            self.alternatives_empty_label.pack(expand=True, pady=(0, 5))
+            return
+        self.alternatives_empty_label.pack_forget()
+
+        buttons = [(self.lang["alternatives_original"], self._last_fingering, self._last_fingers)]
+        buttons += [("-".join(fingering), fingering, fingers) for fingering, fingers in voicings]
+        for index, (text, fingering, fingers) in enumerate(buttons):
+            pady = (2, 10) if index == len(buttons) - 1 else (2, 2)
+            button = ctk.CTkButton(
+                self.alternatives_frame, text=text,
+                font=(config.BASE_FONT, 14),
+                command=lambda f=fingering, n=fingers: self.show_alternative(f, n))
+            button.pack(pady=pady)
+            self.alternative_buttons.append(button)
+
+    def show_alternative(self, fingering, fingers):
+        """
+        Draw an alternative voicing without changing the current chord.
+
+        Args:
+            fingering (list): Fret per string.
+            fingers (list): Finger numbers per string.
+        """
+        if not self.identify_mode and self.quiz is None:
+            self.fretboard_middle.draw_chord(fingering, fingers)
+            if config.PLAY_CHORDS:
+                self.logic.play_fingering(fingering)
 
     def update_learned_label(self, text):
         """
@@ -145,6 +213,207 @@ class DefaultChordTrainerGUI(ctk.CTkFrame):
             config.PREFERED_HAND = "right"
         self.fretboard_middle.redraw()
 
+    def toggle_identify_mode(self):
+        """
+        Switch between showing chords and identifying a fingering clicked on the fretboard.
+        """
+        self.identify_mode = bool(self.identify_switch.get())
+        if self.identify_mode:
+            self._identify_fingering = ["0"] * self.fretboard_middle.strings
+            self.fretboard_middle.click_callback = self.on_fretboard_click
+            self.fretboard_middle.draw_chord(self._identify_fingering, ["0"] * len(self._identify_fingering))
+            self.show_identified_chords()
+        else:
+            self.fretboard_middle.click_callback = None
+            self.fretboard_middle.draw_chord(self._last_fingering, self._last_fingers)
+            self.update_status_display_label("")
+
+    def on_fretboard_click(self, string_index, fret):
+        """
+        Toggle the clicked fret on a string and identify the resulting fingering.
+
+        Args:
+            string_index (int): Index of the clicked string.
+            fret (int): Clicked fret, 0 for the open string.
+        """
+        current = self._identify_fingering[string_index]
+        self._identify_fingering[string_index] = "0" if current == str(fret) else str(fret)
+        self.fretboard_middle.draw_chord(self._identify_fingering, ["0"] * len(self._identify_fingering))
+        self.show_identified_chords()
+
+    def show_identified_chords(self):
+        """ Show the chord names matching the fingering built in identify mode. """
+        candidates = self.logic.identify_fingering(self._identify_fingering)
+        if candidates:
+            names = ", ".join(c["name"] for c in candidates[:5])
+            self.update_status_display_label(self.lang["identify_result"].format(names=names))
+        else:
+            self.update_status_display_label(self.lang["identify_no_match"])
+
+    def set_tuning(self, tuning):
+        """
+        Redraw the fretboard for another tuning.
+
+        Args:
+            tuning (Tuning): The new tuning profile.
+        """
+        self.fretboard_middle.set_tuning(tuning)
+        if self.identify_mode:
+            self._identify_fingering = ["0"] * tuning.strings
+            self.fretboard_middle.draw_chord(self._identify_fingering, ["0"] * tuning.strings)
+            self.show_identified_chords()
+
+    def set_mode(self):
+        """ Pass the selected learn mode on to the logic manager. """
+        mode = self.mode_keys.get(self.mode_var.get(), "random")
+        self.logic.mode = mode
+        self.transition_band_setting.configure(state="normal" if mode == "transition" else "disabled")
+        if mode == "quiz":
+            self.start_quiz()
+        elif self.quiz is not None:
+            self.stop_quiz()
+
+    def start_quiz(self):
+        """ Switch the trainer into the reaction time quiz. """
+        if self.logic.timer_active:
+            self.logic.toggle_timer(self.lang)
+        if self.logic.metronome is not None:
+            self.toggle_metronome()
+        self.metronome_button.configure(state="disabled")
+        if self.identify_mode:
+            self.identify_switch.deselect()
+            self.toggle_identify_mode()
+        self.identify_switch.configure(state="disabled")
+        self.set_next_chord_button_state("disabled")
+        self.timer_button.configure(state="disabled")
+        self.quiz = ChordQuiz(self.logic.chords)
+        self.quiz_frame.pack(fill="x", padx=5, pady=5, after=self.mode_frame)
+        self.ask_quiz_question()
+
+    def stop_quiz(self):
+        """ Leave the quiz, show the reaction times of the session and continue training. """
+        if self._quiz_after_id is not None:
+            self.after_cancel(self._quiz_after_id)
+            self._quiz_after_id = None
+        quiz, self.quiz = self.quiz, None
+        self.quiz_frame.pack_forget()
+        self.fretboard_middle.click_callback = None
+        self.identify_switch.configure(state="normal")
+        self.timer_button.configure(state="normal")
+        self.metronome_button.configure(state="normal")
+        self.set_next_chord_button_state("normal")
+        self.update_status_display_label("")
+        self.logic.next_chord(self.lang)
+        if quiz.answered:
+            summary = self.lang["quiz_summary"].format(
+                correct=quiz.correct, answered=quiz.answered,
+                mean=round(quiz.histogram.mean_ms()), median=quiz.histogram.percentile_ms(50))
+            messagebox.showinfo(self.lang["quiz_summary_title"], f"{summary}\n\n{quiz.histogram.format()}")
+
+    def ask_quiz_question(self):
+        """
+        Draw the next quiz question and start the clock once it is on screen.
+
+        Diagram questions show a fingering to be named with the picker or by voice;
+        name questions show a chord name to be placed on the fretboard.
+        """
+        self._quiz_after_id = None
+        question = self.quiz.next_question()
+        if question is None:
+            return
+        self.chord_interval.configure(text="")
+        self.chord_tones.configure(text="")
+        if question.kind == "diagram":
+            self.current_chord.configure(text="?")
+            self.fretboard_middle.click_callback = None
+            self.fretboard_middle.draw_chord(*chord_fingering(question.chord, self.logic.tuning))
+            for index, button in enumerate(self.quiz_buttons):
+                if index < len(question.choices):
+                    button.configure(text=question.choices[index], state="normal")
+                else:
+                    button.configure(text="", state="disabled")
+        else:
+            self.current_chord.configure(text=question.chord["name"])
+            self._quiz_fingering = ["0"] * self.fretboard_middle.strings
+            self.fretboard_middle.click_callback = self.on_quiz_click
+            self.fretboard_middle.draw_chord(self._quiz_fingering, ["0"] * len(self._quiz_fingering))
+            for button in self.quiz_buttons:
+                button.configure(state="disabled")
+        # configure() only schedules the redraw; flush it so the clock starts with the frame that shows the question
+        self.update_idletasks()
+        self.quiz.stimulus_drawn(time.perf_counter_ns())
+
+    def answer_quiz_name(self, name, stamp_ns=None):
+        """
+        Answer a diagram question with a chord name from the picker or voice.
+
+        Args:
+            name (str): The answered chord name.
+            stamp_ns (int, optional): perf_counter_ns() of the answer, defaults to now.
+        """
+        stamp_ns = stamp_ns or time.perf_counter_ns()
+        if self.quiz is not None and self.quiz.question.kind == "diagram":
+            self.show_quiz_result(self.quiz.answer_name(name, stamp_ns))
+
+    def skip_quiz_question(self, stamp_ns=None):
+        """
+        Give up on the current quiz question.
+
+        Args:
+            stamp_ns (int, optional): perf_counter_ns() of the request, defaults to now.
+        """
+        if self.quiz is not None:
+            self.show_quiz_result(self.quiz.skip(stamp_ns or time.perf_counter_ns()))
+
+    def on_quiz_click(self, string_index, fret):
+        """
+        Place or remove a finger for a name question; the answer counts once the shape is a voicing of the chord.
+
+        Args:
+            string_index (int): Index of the clicked string.
+            fret (int): Clicked fret, 0 for the open string.
+        """
+        stamp_ns = time.perf_counter_ns()
+        current = self._quiz_fingering[string_index]
+        self._quiz_fingering[string_index] = "0" if current == str(fret) else str(fret)
+        self.fretboard_middle.draw_chord(self._quiz_fingering, ["0"] * len(self._quiz_fingering))
+        candidates = self.logic.identify_fingering(self._quiz_fingering)
+        self.show_quiz_result(self.quiz.answer_fingering(candidates, stamp_ns))
+
+    def show_quiz_result(self, result):
+        """
+        Show the outcome of an answer and ask the next question after a short pause.
+
+        Args:
+            result (QuizResult or None): The outcome; None if the input was no answer.
+        """
+        if result is None:
+            return
+        self.fretboard_middle.click_callback = None
+        for button in self.quiz_buttons:
+            button.configure(state="disabled")
+        milliseconds = result.reaction_ns // 1_000_000
+        if result.correct:
+            self.update_status_display_label(self.lang["quiz_correct"].format(ms=milliseconds))
+        else:
+            self.update_status_display_label(self.lang["quiz_wrong"].format(name=result.chord["name"]))
+        self.current_chord.configure(text=result.chord["name"])
+        self.update_learned_label(self.lang["quiz_score"].format(
+            correct=self.quiz.correct, answered=self.quiz.answered, median=self.quiz.histogram.percentile_ms(50)))
+        if self.logic.practice_log is not None:
+            self.logic.practice_log.record(result.chord["name"], time.time() - result.reaction_ns / 1e9,
+                                           result.reaction_ns / 1e9, "quiz", config.DIFFICULTY)
+        self._quiz_after_id = self.after(config.QUIZ_PAUSE_MS, self.ask_quiz_question)
+
+    def set_transition_band(self, value):
+        """
+        Set how hard the chord changes in the transition drill should be.
+
+        Args:
+            value (str): Selected band label from the language dict.
+        """
+        self.logic.transition_band = self.band_keys.get(value, "medium")
+
     def set_next_chord_button_state(self, state):
         """
         Enable or disable the next/previous chord buttons.
@@ -162,7 +431,7 @@ class DefaultChordTrainerGUI(ctk.CTkFrame):
 
     def update_previous_chords(self):
         """ Update the label that shows previously played chords. """
-        self.chord_history.configure(text=f"{self.lang['chord_history']}\n" + " ".join(config.PAST_CHORDS))
+        self.chord_history.configure(text=f"{self.lang['chord_history']}\n" + " ".join(self.logic.session.history))
 
     def update_interval(self, chord):
         """
@@ -171,7 +440,9 @@ class DefaultChordTrainerGUI(ctk.CTkFrame):
         Args:
             chord (str): Name of the chord.
         """
-        chord_obj = next((c for c in self.chords if c["name"].lower() == chord.lower()), None)
+        chord_obj = self.chord_keys.get(chord)
+        if self.quiz is not None:
+            return
         if chord_obj:
             intervals = chord_obj.get("intervals", [])
             self.chord_interval.configure(text=f"{self.lang['chord_interval']} {'-'.join(intervals)}")
@@ -185,7 +456,9 @@ class DefaultChordTrainerGUI(ctk.CTkFrame):
         Args:
             chord (str): Name of the chord.
         """
-        chord_obj = next((c for c in self.chords if c["name"].lower() == chord.lower()), None)
+        chord_obj = self.chord_keys.get(chord)
+        if self.quiz is not None:
+            return
         if chord_obj:
             tones = chord_obj.get("chord_notes", [])
             self.chord_tones.configure(text=f"{self.lang['chord_notes']} {'-'.join(tones)}")
@@ -199,7 +472,7 @@ class DefaultChordTrainerGUI(ctk.CTkFrame):
         Args:
             history_index (int or None): The current index in the chord history.
         """
-        total = len(config.PAST_CHORDS)
+        total = len(self.logic.session.history)
 
         # Forward button: enabled only if there is something forward to go
         if history_index is not None and history_index < -1:
@@ -215,12 +488,38 @@ class DefaultChordTrainerGUI(ctk.CTkFrame):
         else:
             self.prev_in_history_button.configure(state="disabled")
 
+    def toggle_metronome(self):
+        """ Start or stop the metronome and lock the controls that would fight with it. """
+        running = self.logic.toggle_metronome()
+        self.metronome_button.configure(text=self.lang["metronome_stop" if running else "metronome_start"])
+        self.timer_button.configure(state="disabled" if running else "normal")
+        self.set_next_chord_button_state("disabled" if running else "normal")
+        if not running:
+            self.update_navigation_buttons(self.logic.history_index)
+
+    def update_metronome_bpm(self, value):
+        """Pass the tempo from the slider on and display it."""
+        bpm = int(round(value))
+        self.logic.set_metronome_bpm(bpm)
+        self.metronome_slider_label.configure(text=self.lang["metronome_bpm"].format(bpm=bpm))
+
     def update_timer_interval(self, value):
-        """Update the global timer interval and display it."""
+        """Update the timer interval of the session and display it."""
         seconds = int(round(value))
-        config.TIMER_INTERVAL_MS = seconds * 1000
+        self.logic.session.timer_interval_ms = seconds * 1000
         self.timer_slider_label.configure(text=f"Timer: {seconds} s")
 
+    def set_timer_interval(self, seconds):
+        """
+        Move the timer slider, e.g. for a command from the control socket.
+
+        Args:
+            seconds (int): Seconds per chord, clamped to the slider range.
+        """
+        seconds = max(1, min(15, seconds))
+        self.timer_slider.set(seconds)
+        self.update_timer_interval(seconds)
+
     def build_widgets(self):
         """ Construct and arrange all GUI components and frames. """
         # outer frame
@@ -270,6 +569,16 @@ class DefaultChordTrainerGUI(ctk.CTkFrame):
         self.chord_history = ctk.CTkLabel(self.chord_stats_frame, text="", wraplength=180, font=(config.BASE_FONT, 16))
         self.chord_history.pack(expand=True, pady=(5, 10))
 
+        # alternative voicings frame
+        self.alternatives_frame = ctk.CTkFrame(self.left_frame, border_width=1, corner_radius=5)
+        self.alternatives_frame.pack(fill="x", padx=5, pady=5)
+
+        self.alternatives_label = ctk.CTkLabel(self.alternatives_frame, text=f"{self.lang['alternatives_headline']}", font=(config.BASE_FONT, 18, "underline"))
+        self.alternatives_label.pack(expand=True, pady=5)
+
+        self.alternatives_empty_label = ctk.CTkLabel(self.alternatives_frame, text=f"{self.lang['alternatives_none']}", font=(config.BASE_FONT, 16))
+        self.alternative_buttons = []
+
         # maybe add chord info like "did you know?" somewhere
 
         # middle frame of second inner frame (fretboard)
@@ -310,7 +619,14 @@ class DefaultChordTrainerGUI(ctk.CTkFrame):
             font=(config.BASE_FONT, 16),
             command=self.set_prefered_hand)
         self.left_hand_setting.set(f"{self.lang['chord_hand_right']}")
-        self.left_hand_setting.pack(expand=True, padx=10, pady=(0, 10))
+        self.left_hand_setting.pack(expand=True, padx=10, pady=(0, 5))
+
+        self.identify_switch = ctk.CTkSwitch(
+            self.display_settings_frame,
+            text=f"{self.lang['identify_mode']}",
+            font=(config.BASE_FONT, 16),
+            command=self.toggle_identify_mode)
+        self.identify_switch.pack(expand=True, padx=10, pady=(5, 10))
 
         # learnmode frame
         self.mode_frame = ctk.CTkFrame(self.right_frame, border_width=1, corner_radius=5)
@@ -319,10 +635,39 @@ class DefaultChordTrainerGUI(ctk.CTkFrame):
         self.mode_label = ctk.CTkLabel(self.mode_frame, text=f"{self.lang['trainer_learnmode']}", font=(config.BASE_FONT, 18, "underline"))
         self.mode_label.pack(expand=True, pady=5)
 
-        for index, mode in enumerate(self.modes):
-            pady = (2, 10) if index == len(self.modes) - 1 else (2, 2)
-            rb = ctk.CTkRadioButton(self.mode_frame, text=mode, variable=self.mode_var, value=mode, radiobutton_width=18, radiobutton_height=18, state="disabled")
-            rb.pack(anchor="w", padx=10, pady=pady)
+        for mode in self.modes:
+            state = "normal" if mode in self.mode_keys else "disabled"
+            rb = ctk.CTkRadioButton(self.mode_frame, text=mode, variable=self.mode_var, value=mode, radiobutton_width=18, radiobutton_height=18, state=state, command=self.set_mode)
+            rb.pack(anchor="w", padx=10, pady=(2, 2))
+
+        self.transition_band_setting = ctk.CTkSegmentedButton(
+            self.mode_frame,
+            values=list(self.band_keys),
+            font=(config.BASE_FONT, 14),
+            command=self.set_transition_band,
+            state="disabled")
+        self.transition_band_setting.set(f"{self.lang['transition_band_medium']}")
+        self.transition_band_setting.pack(expand=True, padx=10, pady=(5, 10))
+
+        # quiz frame, only shown in quiz mode
+        self.quiz_frame = ctk.CTkFrame(self.right_frame, border_width=1, corner_radius=5)
+
+        self.quiz_label = ctk.CTkLabel(self.quiz_frame, text=f"{self.lang['quiz_headline']}", font=(config.BASE_FONT, 18, "underline"))
+        self.quiz_label.pack(expand=True, pady=5)
+
+        # buttons are reused for every question, so answering never waits for widgets to be built
+        self.quiz_buttons = []
+        for _ in range(4):
+            button = ctk.CTkButton(self.quiz_frame, text="", font=(config.BASE_FONT, 14), state="disabled")
+            button.configure(command=lambda b=button: self.answer_quiz_name(b.cget("text")))
+            button.pack(pady=2)
+            self.quiz_buttons.append(button)
+
+        self.quiz_skip_button = ctk.CTkButton(
+            self.quiz_frame, text=f"{self.lang['quiz_skip']}",
+            font=(config.BASE_FONT, 14),
+            command=self.skip_quiz_question)
+        self.quiz_skip_button.pack(pady=(8, 10))
 
         # controls frame
         self.control_frame = ctk.CTkFrame(self.right_frame, border_width=1, corner_radius=5)
@@ -370,7 +715,29 @@ class DefaultChordTrainerGUI(ctk.CTkFrame):
             command=self.update_timer_interval,
             width=150)
         self.timer_slider.set(config.TIMER_INTERVAL_MS // 1000)
-        self.timer_slider.pack(pady=(2, 10))
+        self.timer_slider.pack(pady=(2, 5))
+
+        self.metronome_button = ctk.CTkButton(
+            self.control_frame, text=f"{self.lang['metronome_start']}",
+            font=(config.BASE_FONT, 14),
+            command=self.toggle_metronome)
+        self.metronome_button.pack(pady=2)
+
+        self.metronome_slider_label = ctk.CTkLabel(
+            self.control_frame,
+            text=self.lang["metronome_bpm"].format(bpm=config.METRONOME_BPM),
+            font=(config.BASE_FONT, 14))
+        self.metronome_slider_label.pack(pady=2)
+
+        self.metronome_slider = ctk.CTkSlider(
+            self.control_frame,
+            from_=40,
+            to=200,
+            number_of_steps=160,
+            command=self.update_metronome_bpm,
+            width=150)
+        self.metronome_slider.set(config.METRONOME_BPM)
+        self.metronome_slider.pack(pady=(2, 10))
 
 
         # third inner frame, inside of outer frame
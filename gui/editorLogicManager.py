@@ -1,6 +1,14 @@
 import re
-import json
 import config
+from utils.chord_theory import ChordIndex
+from utils.tunings import get_tuning
+from utils.gui_helpers import json_dumps_compact_lists
+from utils.difficulty import levels_for_scores, score_chords
+from utils.finger_solver import check_fingers, solve_fingers
+from utils.chord_keys import ChordKeyIndex, name_key
+from utils.tracing import traced
+from utils.chord_parser import parse_chord_symbol
+from utils.chord_store import get_chord_store
 
 
 
@@ -20,12 +28,16 @@ class ChordEditorLogic:
         placeholder_fingering (str): Placeholder text for the 'fingering' field.
         placeholders (set): Set of strings considered invalid input placeholders.
         list_columns (set): Columns that expect comma-separated lists.
+        computed_columns (set): Read-only columns calculated from other cells.
         note_pattern (Pattern): Regex for validating musical note input (e.g., C#, F♭).
         interval_pattern (Pattern): Regex for validating interval input (e.g., b3, #5, 7).
     """
     
     def __init__(self, lang):
         self.lang = lang
+        # the fingering columns always hold the standard tuning, other tunings live under "tunings"
+        self.tuning = get_tuning("standard")
+        self.chord_index = ChordIndex(tuning=self.tuning)
 
         # common placeholders
         self.placeholder_name = self.lang["editor_placeholder1"]
@@ -37,25 +49,7 @@ class ChordEditorLogic:
         }
 
         self.list_columns = {"fingering", "fingers", "notes_on_strings", "chord_notes", "intervals"}
-        self.chord_name_pattern = re.compile(
-            r"^"                                # Start string
-            r"[A-G]"                            # Root note A-G
-            r"(?:#|b|♯|♭)?"                     # Optional sharp/flat symbol
-            r"(?:m|maj|min|dim|aug|sus|add|M)?" # Optional chord quality
-            r"\d{0,2}"                          # Optional chord number (e.g. 7, 13)
-            r"(?:sus\d?)?"                      # Optional suspension (sus or sus2, sus4)
-            r"(?:[+#-]?\d*)?"                   # Optional alteration like #9, b5, +11, -13
-            r"(?:b5|#5|b9|#9|b11|#11|b13|#13)?" # Optional common alterations explicitly
-            r"(?:/[A-G](?:#|b|♯|♭)?"            # Optional slash chord bass note
-            r"(?:m|maj|min|dim|aug|sus|add|M)?" # Optional chord quality in bass note
-            r"\d{0,2}"                          # Optional number in bass note
-            r"(?:sus\d?)?"                      # Optional suspension in bass note
-            r"(?:[+#-]?\d*)?"                   # Optional alteration in bass note
-            r"(?:b5|#5|b9|#9|b11|#11|b13|#13)?" # Optional common alterations in bass note
-            r")?$",
-            re.IGNORECASE
-        )
-
+        self.computed_columns = {"score"}
         self.note_pattern = re.compile(
             r"^[A-Ga-g]"        # Note letter A-G (case insensitive)
             r"(?:#|b|♯|♭)?$"    # Optional sharp or flat (including Unicode ♯♭)
@@ -66,6 +60,7 @@ class ChordEditorLogic:
         )
 
 
+    @traced("editor.validate")
     def validate_treeviews(self, tables: dict) -> int:
         """
         Validate all cells in all Treeviews for syntax, completeness, and uniqueness.
@@ -78,8 +73,7 @@ class ChordEditorLogic:
         """
 
         invalid_cells = 0
-        seen_names = {}
-        seen_fingering = {}
+        seen = ChordKeyIndex()
 
         for level, tree in tables.items():
             for row_id in tree.get_children():
@@ -88,6 +82,8 @@ class ChordEditorLogic:
                 row_index = tree.index(row_id) + 1
 
                 for col in tree["columns"]:
+                    if col in self.computed_columns:
+                        continue
                     value = tree.set(row_id, col).strip()
                     entry[col] = value
 
@@ -114,14 +110,14 @@ class ChordEditorLogic:
                             continue
 
                         if col in {"fingering", "fingers"}:
-                            if len(parts) != 4:
+                            if len(parts) != self.tuning.strings:
                                 print(self.lang["error_editor_invalid_length"].format(
                                     level=level, row_index=row_index, col=col, parts=parts))
                                 invalid_cells += 1
                                 continue
                             for p in parts:
                                 if col == "fingering":
-                                    if not p.isdigit() or not (0 <= int(p) <= 12):
+                                    if not p.isdigit() or not self.tuning.is_valid_fret(int(p)):
                                         print(self.lang["error_editor_invalid_number"].format(
                                             level=level, row_index=row_index, col=col, p=p))
                                         invalid_cells += 1
@@ -159,46 +155,61 @@ class ChordEditorLogic:
                                     invalid_cells += 1
                                     break
 
-                name = entry.get("name", "").strip()
-                fingering = entry.get("fingering", "")
-                norm_name = name.lower()
-                norm_fingering = fingering.replace(" ", "")
-
-                if name:
-                    if name and not self.chord_name_pattern.fullmatch(name):
-                        print(self.lang["error_editor_invalid_chord_name"].format(
-                            level=level, row_index=row_index, name=name))
+                if len(parts_cache.get("fingering", [])) == len(parts_cache.get("fingers", [])) == self.tuning.strings:
+                    for problem, position in check_fingers(parts_cache["fingering"], parts_cache["fingers"]):
+                        print(self.lang["error_editor_unplayable_fingers"].format(
+                            level=level, row_index=row_index, problem=problem, position=position + 1))
                         invalid_cells += 1
 
-                    if norm_name in seen_names:
-                        print(self.lang["error_editor_duplicate_chord_name"].format(
-                            level=level, row_index=row_index, name=name, previous_row=seen_names[norm_name]))
-                        invalid_cells += 1
-                    else:
-                        seen_names[norm_name] = row_index
+                name = entry.get("name", "").strip()
+                fingering = entry.get("fingering", "")
 
-                if fingering:
-                    if norm_fingering in seen_fingering:
-                        print(self.lang["error_editor_duplicate_fingering"].format(
-                            level=level, row_index=row_index, fingering=fingering, previous_row=seen_fingering[norm_fingering]))
-                        invalid_cells += 1
-                    else:
-                        seen_fingering[norm_fingering] = row_index
+                if name and parse_chord_symbol(name) is None:
+                    print(self.lang["error_editor_invalid_chord_name"].format(
+                        level=level, row_index=row_index, name=name))
+                    invalid_cells += 1
+
+                if name or fingering:
+                    # canonical keys catch enharmonic spellings ('C#' / 'Db') and equivalent names ('C6' / 'Am7')
+                    chord = {"name": name, "fingering": parts_cache.get("fingering", []),
+                             "chord_notes": parts_cache.get("chord_notes", [])}
+                    for kind, (previous_level, previous_row) in seen.add(chord, (level, row_index)):
+                        if kind == "name" and name:
+                            print(self.lang["error_editor_duplicate_chord_name"].format(
+                                level=level, row_index=row_index, name=name,
+                                previous_level=previous_level, previous_row=previous_row))
+                            invalid_cells += 1
+                        elif kind == "voicing" and fingering:
+                            print(self.lang["error_editor_duplicate_fingering"].format(
+                                level=level, row_index=row_index, fingering=fingering,
+                                previous_level=previous_level, previous_row=previous_row))
+                            invalid_cells += 1
 
         return invalid_cells
 
 
-    def prepare_save_data(self, tables: dict) -> dict:
+    @traced("editor.prepare_save_data")
+    def prepare_save_data(self, tables: dict, original: dict = None) -> dict:
         """
         Extract chord data from all Treeviews and convert it into a structured dict.
 
+        Fingerings for other tunings are not shown in the tables; they are carried
+        over from the originally loaded data for chords that keep their name.
+
         Args:
             tables (dict): Dictionary mapping difficulty levels to Treeview widgets.
+            original (dict, optional): The chord data the editor was opened with.
 
         Returns:
             dict: Structured chord data ready for serialization.
         """
-                
+
+        extra_tunings = {}
+        for chords in (original or {}).values():
+            for chord in chords:
+                if chord.get("tunings"):
+                    extra_tunings[name_key(chord["name"])] = chord["tunings"]
+
         data = {}
         for level, tree in tables.items():
             data[level] = []
@@ -212,6 +223,9 @@ class ChordEditorLogic:
                     "chord_notes": [s.strip() for s in item[4].split(",")],
                     "intervals": [s.strip() for s in item[5].split(",")],
                 }
+                tunings = extra_tunings.get(name_key(str(item[0])))
+                if tunings:
+                    chord["tunings"] = tunings
                 data[level].append(chord)
         return data
 
@@ -227,21 +241,16 @@ class ChordEditorLogic:
             str: Formatted JSON string with compact lists.
         """
 
-        text = json.dumps(data, ensure_ascii=False, indent=4)
-        pattern = re.compile(r'\[\s*(\".*?\"(?:,\s*\".*?\")*)\s*\]', re.DOTALL)
-
-        def replacer(match):
-            content = match.group(1)
-            compact = content.replace('\n', '').replace(' ', '')
-            return f'[{compact}]'
-
-        return pattern.sub(replacer, text)
+        return json_dumps_compact_lists(data)
 
 
+    @traced("editor.save")
     def save_data(self, data):
         """
         Write chord data to file with compact list formatting.
 
+        With the SQLite chord library only the changed chords are written, in one transaction.
+
         Args:
             data (dict): Chord data to save.
 
@@ -250,6 +259,9 @@ class ChordEditorLogic:
         """
 
         try:
+            if config.CHORD_STORAGE == "sqlite":
+                get_chord_store(config.CHORD_DB_PATH).save_data(data)
+                return True, None
             json_text = self.json_dumps_compact_lists(data)
             with open(config.CHORD_PATH, "w", encoding="utf-8") as f:
                 f.write(json_text)
@@ -258,12 +270,49 @@ class ChordEditorLogic:
             return False, e
 
 
-    def format_chord_for_display(self, chord: dict) -> tuple:
+    def format_score(self, score: float) -> str:
+        """
+        Format a computed difficulty score together with the level it suggests.
+
+        Args:
+            score (float): Score from utils.difficulty.
+
+        Returns:
+            str: Display text like '3.8 (Medium)'.
+        """
+
+        level = levels_for_scores([score])[0]
+        return f"{score:.1f} ({self.lang[f'difficulty_{level}']})"
+
+
+    def score_for_row(self, fingering: str, fingers: str) -> str:
+        """
+        Compute the score cell for the fingering and fingers cells of a row.
+
+        Args:
+            fingering (str): Fingering cell value.
+            fingers (str): Fingers cell value.
+
+        Returns:
+            str: Formatted score, or an empty string for incomplete rows.
+        """
+
+        chord = {
+            "fingering": [p.strip() for p in fingering.split(",")],
+            "fingers": [p.strip() for p in fingers.split(",")],
+        }
+        if not all(p.isdigit() for p in chord["fingering"]):
+            return ""
+        return self.format_score(float(score_chords([chord])[0]))
+
+
+    def format_chord_for_display(self, chord: dict, score: float = None) -> tuple:
         """
         Convert a chord dictionary into a tuple of displayable strings for Treeview.
 
         Args:
             chord (dict): Chord entry with structured data.
+            score (float, optional): Computed difficulty score of the chord.
 
         Returns:
             tuple: Display-friendly string values for each column.
@@ -278,10 +327,76 @@ class ChordEditorLogic:
             to_display(chord.get("fingers", [])),
             to_display(chord.get("notes_on_strings", [])),
             to_display(chord.get("chord_notes", [])),
-            to_display(chord.get("intervals", []))
+            to_display(chord.get("intervals", [])),
+            self.format_score(score) if score is not None else ""
         )
     
 
+    @traced("editor.build_chord_index")
+    def build_chord_index(self, data: dict):
+        """
+        Index all chords of all difficulty levels for name suggestions.
+
+        Args:
+            data (dict): Chord data grouped by difficulty level.
+        """
+
+        self.chord_index = ChordIndex((chord for level in data.values() for chord in level), tuning=self.tuning)
+
+
+    def suggest_chord_name(self, fingering: str):
+        """
+        Suggest a chord name for a comma-separated fingering typed into the editor.
+
+        Args:
+            fingering (str): Fingering cell value, e.g. '0, 0, 0, 3'.
+
+        Returns:
+            str or None: The most likely chord name, or None if nothing matches.
+        """
+
+        parts = [p.strip() for p in fingering.split(",")]
+        if not all(p.isdigit() for p in parts):
+            return None
+        return self.chord_index.best_name(parts)
+
+
+    def suggest_fingers(self, fingering: str):
+        """
+        Suggest finger numbers for a comma-separated fingering.
+
+        Args:
+            fingering (str): Fingering cell value, e.g. '0, 2, 3, 2'.
+
+        Returns:
+            str or None: Comma-separated finger numbers, or None if unplayable or invalid.
+        """
+
+        parts = [p.strip() for p in fingering.split(",")]
+        if len(parts) != self.tuning.strings or not all(p.isdigit() for p in parts):
+            return None
+        fingers = solve_fingers(parts)
+        return ", ".join(fingers) if fingers else None
+
+
+    def suggest_notes_on_strings(self, fingering: str):
+        """
+        Look up the notes sounding on each string for a comma-separated fingering.
+
+        Args:
+            fingering (str): Fingering cell value, e.g. '0, 0, 0, 3'.
+
+        Returns:
+            str or None: Comma-separated note names, or None for invalid input.
+        """
+
+        parts = [p.strip() for p in fingering.split(",")]
+        if len(parts) != self.tuning.strings:
+            return None
+        notes = self.tuning.notes(parts)
+        return ", ".join(notes) if notes else None
+
+
     def get_default_row(self) -> list:
         """
         Return a default row with placeholders for a new chord.
@@ -296,10 +411,12 @@ class ChordEditorLogic:
             "???",                             # unknown finger suggestion
             "???",                             # unknown notes on strings
             "???",                             # unknown chord tones
-            "???"                              # unknown intervals
+            "???",                             # unknown intervals
+            ""                                 # score, computed once a fingering is entered
         ]
 
 
+    @traced("editor.fill_table")
     def insert_chords_into_tree(self, tree, chords: list):
         """
         Populate a Treeview with a list of chords and apply alternating row tags.
@@ -309,9 +426,10 @@ class ChordEditorLogic:
             chords (list): List of chord dictionaries to insert.
         """
         
+        scores = score_chords(chords).tolist()
         for i, chord in enumerate(chords):
             tag = "evenrow" if i % 2 == 0 else "oddrow"
-            values = self.format_chord_for_display(chord)
+            values = self.format_chord_for_display(chord, scores[i])
             tree.insert("", "end", values=values, tags=(tag,))
 
 
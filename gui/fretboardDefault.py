@@ -1,6 +1,8 @@
 import customtkinter as ctk
 import config
 from PIL import Image, ImageTk
+from utils.tunings import get_tuning
+from utils.tracing import traced
 
 class DefaultFretboard(ctk.CTkCanvas):
     """
@@ -18,14 +20,15 @@ class DefaultFretboard(ctk.CTkCanvas):
             **kwargs: Additional arguments passed to CTkCanvas.
         """
 
-        self.frets = 12
-        self.strings = 4
+        tuning = get_tuning()
+        self.frets = tuning.frets
+        self.strings = tuning.strings
         self.fret_width = 45
         self.string_height = 45
         self.marker_radius = 13
         self.fingering = []
         self.fingers = []
-        self.string_names = ["G", "C", "E", "A"]
+        self.string_names = tuning.string_names
 
         width = self.fret_width * self.strings + 60
         height = self.string_height * self.frets + 60
@@ -41,10 +44,12 @@ class DefaultFretboard(ctk.CTkCanvas):
         self.padding_x = (self.canvas_width - (self.fret_width * (self.strings - 1))) // 2
         self.padding_y = 30
         self.markers = []
+        self.click_callback = None
 
         self.draw_fretboard()
         self.draw_string_names()
         # self.bind("<Configure>", self.on_resize)
+        self.bind("<Button-1>", self.on_click)
 
     def update_theme(self):
         """
@@ -80,6 +85,64 @@ class DefaultFretboard(ctk.CTkCanvas):
         self.redraw()
 
 
+    def set_tuning(self, tuning):
+        """
+        Switch the fretboard to another instrument profile and redraw it.
+
+        Args:
+            tuning (Tuning): The new tuning profile.
+        """
+        self.frets = tuning.frets
+        self.strings = tuning.strings
+        self.string_names = tuning.string_names
+        self.canvas_width = self.fret_width * self.strings + 60
+        self.canvas_height = self.string_height * self.frets + 60
+        self.config(width=self.canvas_width, height=self.canvas_height)
+        self.redraw()
+
+    def position_at(self, x, y):
+        """
+        Translate canvas coordinates into a string index and fret number.
+
+        Clicks above the nut select the open string.
+
+        Args:
+            x (int): Canvas x coordinate.
+            y (int): Canvas y coordinate.
+
+        Returns:
+            tuple or None: (string_index, fret) or None if outside the fretboard.
+        """
+        draw_index = round((x - self.padding_x) / self.fret_width)
+        if not 0 <= draw_index < self.strings:
+            return None
+        if abs(x - (self.padding_x + draw_index * self.fret_width)) > self.fret_width / 2:
+            return None
+
+        if y < self.padding_y:
+            fret = 0
+        else:
+            fret = int((y - self.padding_y) // self.string_height) + 1
+            if fret > self.frets:
+                return None
+
+        string_index = self.strings - 1 - draw_index if config.PREFERED_HAND == "left" else draw_index
+        return string_index, fret
+
+    def on_click(self, event):
+        """
+        Forward clicks on the fretboard to the registered click callback.
+
+        Args:
+            event: Tkinter mouse event.
+        """
+        if self.click_callback is None:
+            return
+        position = self.position_at(event.x, event.y)
+        if position is not None:
+            self.click_callback(*position)
+
+    @traced("fretboard.redraw")
     def redraw(self):
         """
         Clears and redraws the entire fretboard, including strings and current chord.
@@ -94,6 +157,7 @@ class DefaultFretboard(ctk.CTkCanvas):
         self.draw_chord(self.fingering, self.fingers)
 
 
+    @traced("fretboard.draw_fretboard")
     def draw_fretboard(self):
         """
         Draws the fretboard background (wood texture or fallback), frets and strings.
@@ -147,7 +211,7 @@ class DefaultFretboard(ctk.CTkCanvas):
 
     def draw_string_names(self):
         """
-        Draws the note names of the strings above the fretboard (G, C, E, A).
+        Draws the note names of the strings above the fretboard (e.g. G, C, E, A).
         Automatically mirrors for left-handed mode.
         """
         string_names = self.string_names
@@ -165,6 +229,7 @@ class DefaultFretboard(ctk.CTkCanvas):
                 font=("Arial", 12, "bold")
             )
 
+    @traced("fretboard.draw_chord")
     def draw_chord(self, fingering, fingers):
         """
         Draws markers for chord fingering on the fretboard.
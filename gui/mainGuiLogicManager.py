@@ -1,3 +1,4 @@
+import os
 import random
 import threading
 import time
@@ -6,6 +7,34 @@ import speech_recognition as sr
 from tkinter import Tk
 from utils.gui_helpers import load_chords
 from utils.discord_presence import DiscordRichPresence
+from utils.chord_theory import ChordIndex
+from utils.voicing_generator import generate_voicings
+from utils.tunings import chord_fingering, get_tuning
+from utils.finger_solver import solve_fingers
+from utils.transpose import transpose_chords
+from utils.transition_cost import TransitionCostMatrix
+from utils.chord_parser import symbol_from_speech
+from utils.chord_diff import diff_chords, diff_chord_data
+from utils.chord_keys import name_key
+from utils.file_watcher import FileWatcher
+from utils.tk_queue import TkCallQueue
+from utils.practice_log import PracticeLog
+from utils.chord_player import ChordPlayer
+from utils.metronome import RhythmEngine
+from utils.audio_capture import CaptureService
+from utils.speech_source import CaptureSpeechSource
+from utils.recorder import PracticeRecorder
+from utils.chroma import ChordVerifier, ChromaAnalyzer
+from utils.session_engine import TrainerSession
+from utils.tracing import count, span, traced
+
+
+# quantiles of the change costs from the current chord used by the transition drill
+TRANSITION_BANDS = {
+    "small": (0.0, 0.33),
+    "medium": (0.33, 0.66),
+    "large": (0.66, 1.0),
+}
 
 
 class GuiLogicManager:
@@ -13,7 +42,8 @@ class GuiLogicManager:
     Manages the core logic for the Ukulele Chord Trainer GUI.
 
     Handles chord progression, speech recognition commands, timer functionality,
-    and integration with Discord Rich Presence.
+    and integration with Discord Rich Presence. The chord list and history live
+    in a TrainerSession, which this class drives and mirrors into the widgets.
     """
     def __init__(self, master, chords, lang):
         """
@@ -25,15 +55,40 @@ class GuiLogicManager:
             lang (dict): Dictionary with language strings for UI and messages.
         """
         self.master = master
-        self.chords = chords
+        self.mode = "random"
+        self.transition_band = "medium"
+        self._cost_matrices = {}
+        self.base_chords = chords
+        self.tuning = get_tuning()
+        self.session = TrainerSession(chords, config.DIFFICULTY, config.MAX_HISTORY, config.TIMER_INTERVAL_MS,
+                                      self.tuning)
+        self.transpose_semitones = 0
+        self.capo = 0
         self.lang = lang
         self.speech_enabled = True
-        self.learned_chords = -1
         self.timer_active = False
-        self.timer_interval = config.TIMER_INTERVAL_MS
         self.timer_id = None
         self.running = True
-        self.history_index = None
+        self._chord_indexes = {}
+        self._library_data = None
+        self.chord_index = self.build_chord_index(lang)
+        self.update_cost_matrix()
+        self.main_thread = TkCallQueue(master)
+        self.file_watcher = None
+        if config.WATCH_CHORDS:
+            self.set_watching(True)
+        self.practice_log = PracticeLog(config.PRACTICE_LOG_PATH) if config.PRACTICE_LOG_PATH else None
+        self._practice = None  # (chord name, difficulty, unix time shown, monotonic time shown)
+        self.player = None
+        self.metronome = None
+        self.capture = None
+        self._capture_users = set()
+        self._capture_lock = threading.Lock()  # the speech thread acquires the capture too
+        self._listen = None  # (Subscription, ChromaAnalyzer) while listening
+        self._verifier = None  # (chord name, ChordVerifier) of the chord listened for
+        self.recorder = None
+        if config.LISTEN_CHORDS:
+            self.set_listening(True)
 
         self.discord_rpc = DiscordRichPresence(config.DISCORD_CLIENT_ID)
         self.discord_rpc.start()
@@ -41,117 +96,540 @@ class GuiLogicManager:
         self.master.after(100, lambda: self.master.get_first_chord())
         threading.Thread(target=self.speech_recognition, args=(lang,), daemon=True).start()
 
+    @property
+    def chords(self):
+        """list: The active chord list, transposed for capo and transpose settings."""
+        return self.session.chords
+
+    @property
+    def chord_keys(self):
+        """ChordKeyIndex: Lookup of the active chords by name."""
+        return self.session.chord_keys
+
+    @property
+    def shown_chord(self):
+        """str or None: Name of the chord on screen, also when it was shown outside the history."""
+        return self._practice[0] if self._practice is not None else None
+
+    @property
+    def history_index(self):
+        """int or None: Position in the chord history, None at the newest chord."""
+        return self.session.history_index
+
+    @traced("logic.build_chord_index")
+    def build_chord_index(self, lang):
+        """
+        Build the reverse chord lookup from all difficulties of the chord database.
+
+        Indexes are kept per tuning, so switching back and forth reuses them.
+
+        Args:
+            lang (dict): Language strings used for error messages.
+
+        Returns:
+            ChordIndex: Index mapping fingerings to chord names.
+        """
+        if self.tuning.key not in self._chord_indexes:
+            if self._library_data is None:
+                self._library_data = load_chords(lang, filter_by_difficulty=False)
+            self._chord_indexes[self.tuning.key] = ChordIndex(
+                (chord for level in self._library_data.values() for chord in level),
+                tuning=self.tuning)
+        return self._chord_indexes[self.tuning.key]
+
+    def set_tuning(self, key):
+        """
+        Switch to another tuning and redraw the current chord for it.
+
+        Args:
+            key (str): Tuning key from utils.tunings.TUNINGS.
+        """
+        config.TUNING = key
+        self.tuning = get_tuning(key)
+        self.session.tuning = self.tuning
+        self.chord_index = self.build_chord_index(self.lang)
+        self.master.set_tuning(self.tuning)
+        if self.session.current:
+            self.show_chord_by_name(self.session.current)
+
+    def identify_fingering(self, fingering):
+        """
+        Look up which chords a fingering could be.
+
+        Args:
+            fingering (list): Fret per string.
+
+        Returns:
+            list: Candidate dicts as returned by ChordIndex.identify.
+        """
+        return self.chord_index.identify(fingering)
+
+    def get_alternative_voicings(self, chord, limit=4):
+        """
+        Return the easiest generated voicings of a chord besides its own fingering.
+
+        Args:
+            chord (dict): The chord entry.
+            limit (int): Maximum number of alternatives.
+
+        Returns:
+            list: (fingering, fingers) tuples with suggested finger numbers.
+        """
+        own = [f.strip() for f in chord_fingering(chord, self.tuning)[0]]
+        voicings = generate_voicings(chord["name"], self.tuning.open_pitches, limit=limit + 1, max_fret=self.tuning.frets)
+        return [(v, solve_fingers(v) or ["0"] * len(v)) for v in voicings if v != own][:limit]
+
+    def transposed_chords(self, semitones, capo, chords=None):
+        """
+        Transpose chords without changing the active chord list.
+
+        Args:
+            semitones (int): Transpose amount in semitones.
+            capo (int): Capo fret.
+            chords (list, optional): Chords to transpose; defaults to all loaded chords.
+
+        Returns:
+            list: The chords as they would be shown.
+        """
+        chords = transpose_chords(self.base_chords if chords is None else chords, semitones, tuning=self.tuning)
+        return transpose_chords(chords, capo, capo=True, tuning=self.tuning)
+
+    def apply_transposition(self, chords=None):
+        """
+        Rebuild the active chord list from the loaded chords using the current capo
+        and transpose settings, without reading the chord file again.
+
+        Args:
+            chords (list, optional): Already transposed chords, see transposed_chords().
+        """
+        if chords is None:
+            chords = self.transposed_chords(self.transpose_semitones, self.capo)
+        self.session.set_chords(chords, config.DIFFICULTY)
+        self.update_cost_matrix()
+        self.master.reload_chords(self.chords, self.chord_keys)
+
+    def apply_chord_diff(self, diff):
+        """
+        Apply a change of the loaded chords to the active chord list.
+
+        Only the added, edited and removed chords are transposed; the lookup of
+        the session is updated in place and the cost matrix only computes the
+        rows of new shapes.
+
+        Args:
+            diff (ChordDiff): Changes between the old and the new loaded chords.
+        """
+        if self.session.difficulty != config.DIFFICULTY:
+            # a new difficulty replaces the whole list anyway
+            self.apply_transposition()
+            return
+        gone = self.transposed_chords(self.transpose_semitones, self.capo,
+                                      [*diff.removed, *(old for old, _ in diff.changed)])
+        new = self.transposed_chords(self.transpose_semitones, self.capo,
+                                     [*(chord for _, chord in diff.changed), *diff.added])
+        gone_keys = {name_key(chord["name"]) for chord in gone}
+        removed = [chord for chord in self.chords if name_key(chord["name"]) in gone_keys]
+        chords = [chord for chord in self.chords if name_key(chord["name"]) not in gone_keys] + new
+        if not chords:
+            # nothing of the new chords can be played with this transposition; start over from the loaded chords
+            self.apply_transposition()
+            return
+        self.session.update_chords(chords, removed, new)
+        self.update_cost_matrix()
+        self.master.reload_chords(self.chords, self.chord_keys)
+
+    def update_cost_matrix(self):
+        """
+        Keep the chord change cost matrix of the current difficulty in sync with the
+        active chord list. Matrices are cached per difficulty and only recompute
+        the chords that changed.
+        """
+        matrix = self._cost_matrices.get(config.DIFFICULTY)
+        if matrix is None:
+            self._cost_matrices[config.DIFFICULTY] = TransitionCostMatrix(self.chords)
+        else:
+            matrix.update(self.chords)
+
+    def pick_transition_chord(self, possible):
+        """
+        Pick the next chord for the transition drill by its change cost from the current chord.
+
+        Args:
+            possible (list): Chords that may be shown next.
+
+        Returns:
+            dict: The picked chord.
+        """
+        matrix = self._cost_matrices[config.DIFFICULTY]
+        current = matrix.index_of(self.session.history[-1]) if self.session.history else None
+        if current is None:
+            return random.choice(possible)
+
+        allowed = {id(c) for c in possible}
+        candidates = [i for i, c in enumerate(self.chords) if id(c) in allowed]
+        low, high = TRANSITION_BANDS[self.transition_band]
+        return self.chords[matrix.pick_in_band(current, candidates, low, high)]
+
+    def set_transposition(self, semitones=None, capo=None):
+        """
+        Change transpose or capo setting live and continue with a fresh chord.
+
+        A setting under which no chord of the difficulty can be played is refused
+        with a warning, so the session never runs out of chords.
+
+        Args:
+            semitones (int, optional): New transpose amount in semitones.
+            capo (int, optional): New capo fret.
+
+        Returns:
+            bool: Whether the setting was applied.
+        """
+        semitones = self.transpose_semitones if semitones is None else semitones
+        capo = self.capo if capo is None else capo
+        chords = self.transposed_chords(semitones, capo)
+        if not chords:
+            self.master.update_status_display_label(self.lang["warning_transpose_no_chords"])
+            return False
+        self.transpose_semitones = semitones
+        self.capo = capo
+        self.apply_transposition(chords)
+        self.clear_history()
+        return True
 
     def clear_history(self):
         """
         Clears the history of previously shown chords and resets the history index.
         Then immediately shows the next chord.
         """
-        config.PAST_CHORDS = []
-        self.history_index = None
+        self.session.clear_history()
         self.next_chord(self.lang)
 
 
-    def show_chord_by_name(self, name):
+    def show_chord_by_name(self, name, advanced_by="button"):
         """
         Display a chord by its name: updates Discord presence, labels, and fretboard.
 
         Args:
             name (str or dict): The chord name or a dict containing a 'name' key.
+            advanced_by (str): What moved on from the previous chord, for the practice log.
         """
         if isinstance(name, dict):
             name = name.get("name", "")
-        chord = next((c for c in self.chords if c["name"].strip().lower() == name.lower()), None)
-        if chord:
-            self.discord_rpc.update_chord(name)
-            self.master.update_chord_label(name)
-            self.master.update_fretboard(chord["fingering"], chord["fingers"])
-            self.master.update_interval(name)
-            self.master.update_chord_tones(name)
+        with span("logic.show_chord", chord=name):
+            with span("logic.chord_lookup"):
+                chord = self.chord_keys.get(name)
+                fingering, fingers = chord_fingering(chord, self.tuning) if chord else (None, None)
+            if chord:
+                # sound first, so it starts with the chord change and not after the redraw;
+                # while the metronome runs, the chord is strummed by its audio track;
+                # while listening, the microphone would hear the playback and count it as played
+                if (config.PLAY_CHORDS and self.metronome is None and self._listen is None
+                        and (self._practice is None or self._practice[0] != name)):
+                    self.play_fingering(fingering)
+                self.discord_rpc.update_chord(name)
+                with span("gui.chord_label"):
+                    self.master.update_chord_label(name)
+                with span("gui.fretboard"):
+                    self.master.update_fretboard(fingering, fingers)
+                with span("gui.theory_labels"):
+                    self.master.update_interval(name)
+                    self.master.update_chord_tones(name)
+                with span("logic.alternatives"):
+                    alternatives = self.get_alternative_voicings(chord)
+                with span("gui.alternatives"):
+                    self.master.update_alternatives(alternatives)
+                self.log_practice(name, advanced_by)
+                count("chords_shown")
+
+    def log_practice(self, name, advanced_by):
+        """
+        Log how long the previous chord was shown once another chord replaces it.
+
+        Args:
+            name (str): The chord now shown.
+            advanced_by (str): What moved on from the previous chord, one of practice_log.ADVANCE_REASONS.
+        """
+        now = time.monotonic()
+        if self._practice is not None:
+            previous, difficulty, shown_at, started = self._practice
+            if previous == name:
+                # redrawn, e.g. after a tuning change
+                return
+            if self.practice_log is not None:
+                self.practice_log.record(previous, shown_at, now - started, advanced_by, difficulty)
+        self._practice = (name, config.DIFFICULTY, time.time(), now)
+        if self.recorder is not None:
+            self.recorder.mark(name, advanced_by)
+
+    def play_fingering(self, fingering):
+        """
+        Play a fingering on the active tuning without blocking the GUI; a voicing
+        heard for the first time is rendered on the player's worker thread.
 
+        Args:
+            fingering (list): Fret per string.
+        """
+        if self.player is None:
+            self.player = ChordPlayer()
+        self.player.play_voicing(self.tuning.pitches(fingering), config.STRUM_PATTERN)
 
-    def next_chord(self, lang):
+    def toggle_metronome(self):
         """
-        Select and display a random chord not recently shown.
-        Manages the history buffer and updates the GUI accordingly.
+        Start or stop the metronome. While it runs, chords change on bar lines of
+        the audio track instead of the Tk timer.
+
+        Returns:
+            bool: Whether the metronome is running now.
+        """
+        if self.metronome is not None:
+            self.player.set_source(None)
+            self.metronome = None
+            return False
+        if self.timer_active:
+            self.toggle_timer(self.lang)
+        if self.player is None:
+            self.player = ChordPlayer()
+        current = self.chord_keys.get(self.session.history[-1]) if self.session.history else None
+        pitches = self.tuning.pitches(chord_fingering(current, self.tuning)[0]) if current else ()
+        self.metronome = RhythmEngine(config.METRONOME_BPM, config.BEATS_PER_BAR, config.BARS_PER_CHORD,
+                                      config.METRONOME_PATTERN, pitches, self.player.sample_rate)
+        self.queue_metronome_chord()
+        self.player.set_source(self.metronome)
+        self.poll_metronome(self.metronome)
+        return True
+
+    def queue_metronome_chord(self):
+        """ Pick the chord for the next bar line ahead of time, so the audio side can strum it right on the beat. """
+        chord = self.pick_next_chord()
+        self.metronome.queue_chord(chord, self.tuning.pitches(chord_fingering(chord, self.tuning)[0]))
+
+    def poll_metronome(self, engine):
+        """
+        Schedule the chord changes the audio callback announced for the moment they are heard.
 
         Args:
-            lang (dict): Language strings used for messages and errors.
+            engine (RhythmEngine): The engine being polled; polling ends once it is replaced.
         """
-        past_names = [n.strip().lower() for n in config.PAST_CHORDS]
+        if engine is not self.metronome:
+            return
+        while not engine.events.empty():
+            change = engine.events.get_nowait()
+            delay_ms = 0 if change.time is None else (change.time - self.player.stream_time()) * 1000
+            self.master.after(max(0, int(delay_ms)), lambda c=change.payload: self.apply_metronome_chord(engine, c))
+        self.master.after(10, lambda: self.poll_metronome(engine))
 
-        possible = [
-            a for a in self.chords
-            if a["name"].strip().lower() not in past_names
-        ]
+    def apply_metronome_chord(self, engine, chord):
+        """
+        Show the chord the metronome just changed to and queue the one after it.
 
-        if not possible:
-            config.PAST_CHORDS.clear()
-            possible = self.chords[:]
+        Args:
+            engine (RhythmEngine): The engine that made the change.
+            chord (dict): The chord now strummed.
+        """
+        if engine is not self.metronome:
+            return
+        self.next_chord(self.lang, "metronome", chord=chord)
+        self.queue_metronome_chord()
 
-        chord = random.choice(possible)
-        config.PAST_CHORDS.append(chord["name"].strip())
+    def set_metronome_bpm(self, bpm):
+        """
+        Change the metronome tempo, also while it runs.
 
-        if len(config.PAST_CHORDS) > config.MAX_HISTORY:
-            config.PAST_CHORDS.pop(0)
+        Args:
+            bpm (int): Beats per minute.
+        """
+        config.METRONOME_BPM = bpm
+        if self.metronome is not None:
+            self.metronome.set_bpm(bpm)
 
-        try:
-            with open("last_chords.txt", "w", encoding="utf-8") as f:
-                f.write(" - ".join(config.PAST_CHORDS))
-        except IOError as e:
-            print(lang["error_write_file"], e)
+    def use_capture(self, user, enabled):
+        """
+        Acquire or release the shared microphone capture. Speech recognition,
+        listen mode and the tuner read from the same input stream; it is opened
+        for the first user and closed once the last one releases it.
 
-        self.learned_chords = self.learned_chords + 1
-        self.master.update_learned_label(self.lang["learned_chords_text"].format(count=self.learned_chords))
-        self.master.update_previous_chords()
-        self.history_index = None
-        self.master.update_status_display_label("")
-        self.show_chord_by_name(chord)
-        self.master.update_navigation_buttons(self.history_index)
+        Args:
+            user (str): Name of the feature, e.g. 'speech', 'listen' or 'tuner'.
+            enabled (bool): Whether the feature needs the microphone.
+
+        Returns:
+            CaptureService or None: The running capture, None once nobody uses it.
+        """
+        with self._capture_lock:
+            if enabled:
+                if self.capture is None:
+                    capture = CaptureService()
+                    capture.start()
+                    self.capture = capture
+                self._capture_users.add(user)
+            else:
+                self._capture_users.discard(user)
+                if not self._capture_users and self.capture is not None:
+                    self.report_capture_drops()
+                    self.capture.stop()
+                    self.capture = None
+            return self.capture
+
+    def report_capture_drops(self):
+        """ Print the capture counters if any audio was dropped, so overruns do not go unnoticed. """
+        stats = self.capture.stats()
+        subscribers = {name: value for name, value in stats.items() if isinstance(value, dict)}
+        if stats["device_overflows"] or any(value["dropped"] for value in subscribers.values()):
+            print(self.lang["capture_drops"].format(overflows=stats["device_overflows"], subscribers=", ".join(
+                f"{name}: {value['dropped']} ({value['overruns']}x)" for name, value in subscribers.items())))
+
+    def set_listening(self, enabled):
+        """
+        Start or stop listening to the instrument. While listening, the next chord
+        is shown as soon as the current one is heard from the microphone.
+
+        Args:
+            enabled (bool): Whether to listen.
+        """
+        self._verifier = None
+        if self._listen is not None:
+            self.capture.unsubscribe(self._listen[0])
+            self._listen = None
+        capture = self.use_capture("listen", enabled)
+        if enabled:
+            self._listen = (capture.subscribe("listen"), ChromaAnalyzer(capture.sample_rate))
+            self.listen_for_chord(self._listen)
+
+    def listen_for_chord(self, listen):
+        """
+        Analyze the newest microphone window and advance once the shown chord is played.
+
+        Args:
+            listen (tuple): (Subscription, ChromaAnalyzer) of this listening run; the loop ends once it is replaced.
+        """
+        if listen is not self._listen:
+            return
+        subscription, analyzer = listen
+        # the metronome and the quiz decide on their own when the chord changes
+        name = self.shown_chord
+        chord = self.chord_keys.get(name) if name else None
+        if chord and self.metronome is None and self.mode != "quiz":
+            if self._verifier is None or self._verifier[0] != name:
+                self._verifier = (name, ChordVerifier(chord.get("chord_notes", [])))
+            with span("audio.chroma"):
+                heard = self._verifier[1].feed(*analyzer.analyze(subscription.window(analyzer.window)))
+            if heard:
+                self._verifier = None
+                self.next_chord(self.lang, "played")
+        self.master.after(config.LISTEN_INTERVAL_MS, lambda: self.listen_for_chord(listen))
+
+    def toggle_recording(self):
+        """
+        Start or stop recording the practice session from the microphone, with
+        an index of the chords shown during it.
+
+        Returns:
+            bool: Whether a recording is running now.
+        """
+        if self.recorder is not None:
+            self.recorder.stop()
+            self.recorder = None
+            self.use_capture("recorder", False)
+            return False
+        self.recorder = PracticeRecorder(self.use_capture("recorder", True), config.RECORDING_DIR,
+                                         config.RECORDING_FORMAT, config.RECORDING_CHUNK_SECONDS)
+        self.recorder.start()
+        if self._practice is not None:
+            self.recorder.mark(self._practice[0], "recording")
+        return True
+
+    def close(self):
+        """ Stop background work and write the practice log when the window closes. """
+        self.running = False
+        self.set_watching(False)
+        self.set_listening(False)
+        if self.recorder is not None:
+            self.toggle_recording()
+        self._capture_users.clear()
+        self.use_capture(None, False)
+        self.main_thread.stop()
+        if self.player is not None:
+            self.player.close()
+        if self.practice_log is not None:
+            self.practice_log.close()
+            self.practice_log = None
+
+
+    def pick_next_chord(self):
+        """
+        Pick a random chord not recently shown, without showing it.
+
+        Returns:
+            dict: The picked chord.
+        """
+        return self.session.pick_next_chord(self.pick_transition_chord if self.mode == "transition" else None)
+
+    def next_chord(self, lang, advanced_by="button", chord=None):
+        """
+        Select and display a random chord not recently shown.
+        Manages the history buffer and updates the GUI accordingly.
+
+        Args:
+            lang (dict): Language strings used for messages and errors.
+            advanced_by (str): What triggered the change, for the practice log.
+            chord (dict, optional): Show this chord instead of picking one, e.g. one picked ahead by the metronome.
+        """
+        with span("logic.next_chord", advanced_by=advanced_by):
+            if chord is None:
+                with span("logic.pick_next_chord", mode=self.mode):
+                    chord = self.pick_next_chord()
+            self.session.advance(chord)
 
+            with span("logic.write_last_chords"):
+                try:
+                    with open("last_chords.txt", "w", encoding="utf-8") as f:
+                        f.write(" - ".join(self.session.history))
+                except IOError as e:
+                    print(lang["error_write_file"], e)
+
+            with span("gui.history_labels"):
+                self.master.update_learned_label(self.lang["learned_chords_text"].format(count=self.session.learned))
+                self.master.update_previous_chords()
+                self.master.update_status_display_label("")
+            self.show_chord_by_name(chord, advanced_by)
+            with span("gui.navigation_buttons"):
+                self.master.update_navigation_buttons(self.history_index)
+
+    @traced("logic.forward_chord")
     def forward_chord(self):
         """
         Move forward in the chord history, if possible, and display the chord.
         Shows warnings if at the newest chord already.
         """
-        if not hasattr(self, "history_index") or self.history_index is None:
+        if self.history_index is None:
             warning = f"{self.lang['no_more_forward']}"
             self.master.update_status_display_label(warning)
             return
-        
-        if self.history_index >= -1:
+
+        chord_name = self.session.forward()
+        if chord_name is None:
             warning = f"{self.lang['already_latest']}"
             self.master.update_status_display_label(warning)
             return
 
-        self.history_index += 1
-        chord_name = config.PAST_CHORDS[self.history_index]
-        self.show_chord_by_name(chord_name)
-
-        if self.history_index == -1:
-            self.history_index = None
+        self.show_chord_by_name(chord_name, "history")
         self.master.update_status_display_label("")
         self.master.update_navigation_buttons(self.history_index)
 
+    @traced("logic.previous_chord")
     def previous_chord(self):
         """
         Move backward in the chord history and display the previous chord.
         Shows warnings if at the oldest chord already.
         """
-        if not hasattr(self, "history_index") or self.history_index is None:
-            self.history_index = -2
-        else:
-            self.history_index -= 1
-
+        chord_name = self.session.back()
         # the warnings are technically obsolet but will stay just in case
-        if abs(self.history_index) > len(config.PAST_CHORDS):
+        if chord_name is None:
             warning = f"{self.lang['no_more_back']}"
             self.master.update_status_display_label(warning)
-            self.history_index += 1
             return
-        
-        chord_name = config.PAST_CHORDS[self.history_index]
-        self.show_chord_by_name(chord_name)
+
+        self.show_chord_by_name(chord_name, "history")
         self.master.update_status_display_label("")
         self.master.update_navigation_buttons(self.history_index)
 
@@ -159,30 +637,50 @@ class GuiLogicManager:
         """
         Continuously listen for voice commands using Google's Speech API.
 
-        Recognizes commands for 'next' chord and 'stop' program.
+        Recognizes commands for 'next' chord and 'stop' program; 'show' and a spoken
+        chord name ('show C sharp minor') shows that chord if it is in the chord list.
+        In the quiz a chord name alone is taken as the answer.
 
         Args:
             lang (dict): Language strings for messages and recognized commands.
         """
         recognizer = sr.Recognizer()
-        with sr.Microphone() as source:
+        # reads from the shared capture, so the tuner and listen mode do not need a second input stream
+        with CaptureSpeechSource(self.use_capture("speech", True)) as source:
             while self.running:
                 try:
                     if not self.speech_enabled:
                         time.sleep(0.5)
+                        source.skip()
                         continue
                     print(lang["speech_info"])
                     audio = recognizer.listen(source, timeout=5)
+                    # the end of the phrase is the closest to the moment the answer was given
+                    spoken_ns = time.perf_counter_ns()
                     if not self.speech_enabled:
                         continue
-                    audio_command = recognizer.recognize_google(audio, language=config.LANG_CODE).lower()
+                    with span("speech.recognize"):
+                        audio_command = recognizer.recognize_google(audio, language=config.LANG_CODE).lower()
                     print(f"{lang['speech_recognized'].format(command=audio_command)}")
                     
-                    if lang["speech_next"] in audio_command:
-                        self.next_chord(lang)
+                    # widgets may only be touched from the Tk thread
+                    if self.mode == "quiz" and lang["speech_next"] in audio_command:
+                        self.main_thread.put(self.master.skip_quiz_question, spoken_ns)
+                    elif self.mode == "quiz" and not lang["speech_stop"] in audio_command:
+                        symbol = symbol_from_speech(audio_command)
+                        if symbol:
+                            self.main_thread.put(self.master.answer_quiz_name, symbol, spoken_ns)
+                    elif lang["speech_next"] in audio_command:
+                        self.main_thread.put(self.next_chord, lang, "voice")
                     elif lang["speech_stop"] in audio_command:
                         self.running = False
-                        self.master.quit()
+                        self.set_watching(False)
+                        self.main_thread.put(self.master.quit)
+                    else:
+                        symbol = symbol_from_speech(audio_command, lang["speech_show"])
+                        chord = self.chord_keys.get(symbol) if symbol else None
+                        if chord:
+                            self.main_thread.put(self.show_chord_by_name, chord, "voice")
                 except sr.WaitTimeoutError:
                     continue
                 except sr.UnknownValueError:
@@ -190,20 +688,109 @@ class GuiLogicManager:
                 except sr.RequestError:
                     print(f"{lang['error_api']}")
                     break
+        self.use_capture("speech", False)
 
+    @traced("logic.reload_chords")
     def reload_chords(self, lang):
         """
-        Reload the chord list from disk and update the GUI.
+        Reload the chord list from disk and apply only what changed.
 
         Args:
             lang (dict): Language strings used for error messages.
+
+        Returns:
+            ChordDiff or None: Changes of the active difficulty, None if nothing could be loaded.
         """
-        new_chords = load_chords(lang)
-        if new_chords:
-            self.chords = new_chords
-            self.master.reload_chords(new_chords)
-        else:
+        data = load_chords(lang, filter_by_difficulty=False)
+        if not data.get(config.DIFFICULTY):
             print(f"{lang['error_reloading_chords']}")
+            return None
+        return self.apply_library_changes(data)
+
+    @traced("logic.apply_library_changes")
+    def apply_library_changes(self, data):
+        """
+        Bring the chord indexes and the active chord list up to date with new chord data.
+
+        Only added, changed and removed chords are applied to the reverse lookup
+        indexes, the active chord list and its lookup and cost matrix; the chord
+        history keeps every chord that still exists.
+
+        Args:
+            data (dict): The new chord data grouped by difficulty level.
+
+        Returns:
+            ChordDiff: Changes of the active difficulty.
+        """
+        for diff in diff_chord_data(self._library_data or {}, data).values():
+            for index in self._chord_indexes.values():
+                for chord in diff.removed:
+                    index.remove_chord(chord)
+                for old, new in diff.changed:
+                    index.remove_chord(old)
+                    index.add_chord(new)
+                for chord in diff.added:
+                    index.add_chord(chord)
+        self._library_data = data
+
+        new_chords = data.get(config.DIFFICULTY, [])
+        diff = diff_chords(self.base_chords, new_chords)
+        if diff:
+            self.base_chords = new_chords
+            self.apply_chord_diff(diff)
+            self.keep_history()
+        return diff
+
+    def keep_history(self):
+        """
+        Drop chords that no longer exist from the history and redraw the current chord,
+        which may have been edited.
+        """
+        name = self.session.keep_existing()
+        self.master.update_previous_chords()
+        if name is None:
+            self.next_chord(self.lang)
+            return
+        self.show_chord_by_name(name)
+        self.master.update_navigation_buttons(self.history_index)
+
+    def chord_source_paths(self):
+        """
+        Return the files and directories the chords are loaded from.
+
+        Returns:
+            list: Paths to watch for changes.
+        """
+        if config.CHORD_STORAGE == "sqlite":
+            paths = [config.CHORD_DB_PATH, config.CHORD_DB_PATH + "-wal"]
+        else:
+            paths = [config.CHORD_PATH]
+        if os.path.isdir(config.CHORD_PACK_DIR):
+            paths.append(config.CHORD_PACK_DIR)
+        return paths
+
+    def set_watching(self, enabled):
+        """
+        Start or stop reloading the chords automatically when their files change.
+
+        Args:
+            enabled (bool): Whether to watch the chord files.
+        """
+        if self.file_watcher is not None:
+            self.file_watcher.stop()
+            self.file_watcher = None
+        if enabled:
+            # the watcher thread must not touch Tk, so the reload is handed to the main loop
+            self.file_watcher = FileWatcher(self.chord_source_paths(),
+                                            lambda paths: self.main_thread.put(self.hot_reload))
+            self.file_watcher.start()
+
+    def hot_reload(self):
+        """ Apply external changes of the chord files and report them in the status line. """
+        diff = self.reload_chords(self.lang)
+        if diff:
+            self.master.update_status_display_label(self.lang["hot_reload_applied"].format(
+                added=len(diff.added), changed=len(diff.changed), removed=len(diff.removed)))
 
     def toggle_timer(self, lang):
         """
@@ -238,7 +825,7 @@ class GuiLogicManager:
         Schedule the next countdown tick if the timer is active.
         """
         if self.timer_active:
-            self.countdown(config.TIMER_INTERVAL_MS // 1000)
+            self.countdown(self.session.timer_interval_ms // 1000)
 
     def update_timer_display(self, seconds_left):
         self.master.update_status_display_label(f"{self.lang['timer_text'].format(seconds_left=seconds_left)}")
@@ -266,7 +853,7 @@ class GuiLogicManager:
         self.update_timer_display(seconds_left)
 
         if seconds_left <= 0:
-            self.next_chord(self.lang)
-            self.countdown(config.TIMER_INTERVAL_MS // 1000)
+            self.next_chord(self.lang, "timer")
+            self.countdown(self.session.timer_interval_ms // 1000)
         else:
             self.timer_id = self.master.after(1000, lambda: self.countdown(seconds_left - 1))
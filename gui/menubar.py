@@ -1,8 +1,12 @@
+import os
+import time
 import customtkinter as ctk
 import tkinter as tk
+from tkinter import messagebox
 import config
 import utils
-from gui import LegacyChordTrainerGUI, DefaultChordTrainerGUI, ChordEditor
+from utils.tracing import tracer
+from gui import LegacyChordTrainerGUI, DefaultChordTrainerGUI, ChordEditor, TunerWindow
 
 
 
@@ -16,6 +20,7 @@ def create_menubar(root, app, lang, config_data):
     root.theme_var = tk.StringVar()
     root.theme_var.set(ctk.get_appearance_mode())
     chord_editor_ref = None 
+    tuner_ref = None
 
     
     def set_difficulty(level):
@@ -51,6 +56,100 @@ def create_menubar(root, app, lang, config_data):
                 command=lambda lvl=level: set_difficulty(lvl)
             )
 
+    def set_tuning(key):
+        """
+        Switches the instrument tuning and stores it in the config.
+
+        Args:
+            key (str): The tuning key (e.g. "standard", "baritone").
+        """
+        config_data["tuning"] = key
+        utils.save_config(config_data)
+        app.logic.set_tuning(key)
+
+    def set_capo(fret):
+        """
+        Sets the capo fret; chords are shown with their sounding names.
+
+        Args:
+            fret (int): The capo position, 0 for no capo.
+        """
+        if not app.logic.set_transposition(capo=fret):
+            root.capo_var.set(app.logic.capo)
+
+    def set_transpose(semitones):
+        """
+        Transposes all chords by the given number of semitones.
+
+        Args:
+            semitones (int): Semitones up (positive) or down (negative).
+        """
+        if not app.logic.set_transposition(semitones=semitones):
+            root.transpose_var.set(app.logic.transpose_semitones)
+
+    def set_pack_enabled(namespace, enabled):
+        """
+        Enables or disables a chord pack; only the merge is redone, no pack is parsed again.
+
+        Args:
+            namespace (str): The pack namespace.
+            enabled (bool): Whether the pack's chords are used.
+        """
+        disabled = set(config_data.get("disabled_packs", []))
+        if enabled:
+            disabled.discard(namespace)
+        else:
+            disabled.add(namespace)
+        config_data["disabled_packs"] = sorted(disabled)
+        config.DISABLED_PACKS = config_data["disabled_packs"]
+        utils.save_config(config_data)
+        utils.get_pack_library(config.CHORD_PACK_DIR).set_enabled(namespace, enabled)
+        app.logic.reload_chords(lang)
+
+    def set_watch_chords():
+        """
+        Turns automatic reloading of changed chord files on or off and stores it in the config.
+        """
+        config_data["watch_chords"] = root.watch_chords_var.get()
+        config.WATCH_CHORDS = config_data["watch_chords"]
+        utils.save_config(config_data)
+        app.logic.set_watching(config.WATCH_CHORDS)
+
+    def set_play_chords():
+        """
+        Turns chord playback on or off and stores it in the config.
+        """
+        config_data["play_chords"] = root.play_chords_var.get()
+        config.PLAY_CHORDS = config_data["play_chords"]
+        utils.save_config(config_data)
+
+    def set_listen_chords():
+        """
+        Turns listening for the played chord on or off and stores it in the config.
+        """
+        config_data["listen_chords"] = root.listen_chords_var.get()
+        config.LISTEN_CHORDS = config_data["listen_chords"]
+        utils.save_config(config_data)
+        app.logic.set_listening(config.LISTEN_CHORDS)
+
+    def toggle_recording():
+        """
+        Starts or stops recording the practice session; the recording is not remembered across restarts.
+        """
+        root.recording_var.set(app.logic.toggle_recording())
+
+    def toggle_trace():
+        """
+        Starts recording a performance trace, or stops it and writes it to config.TRACE_DIR.
+        """
+        if root.trace_var.get():
+            tracer.start()
+            return
+        tracer.stop()
+        path = os.path.join(config.TRACE_DIR, time.strftime("trace_%Y%m%d_%H%M%S.json"))
+        events = tracer.dump(path)
+        messagebox.showinfo(lang["submenu_trace"], lang["trace_saved"].format(path=os.path.abspath(path), events=events))
+
     def switch_theme(mode):
         """
         Switches the application's theme between Light and Dark.
@@ -77,7 +176,6 @@ def create_menubar(root, app, lang, config_data):
 
         def on_editor_close():
             if chord_editor_ref.saved:
-                app.logic.clear_history()
                 app.logic.reload_chords(lang)
 
         if chord_editor_ref is None or not chord_editor_ref.winfo_exists():
@@ -90,6 +188,17 @@ def create_menubar(root, app, lang, config_data):
         else:
             chord_editor_ref.focus()
 
+    def open_tuner():
+        """
+        Opens the tuner window, or brings it to focus if it's already open.
+        """
+        nonlocal tuner_ref
+        if tuner_ref is None or not tuner_ref.winfo_exists():
+            tuner_ref = TunerWindow(lang=lang, logic=app.logic, master=root)
+            tuner_ref.after(25, tuner_ref.focus)
+        else:
+            tuner_ref.focus()
+
 
     menubar = tk.Menu(root)
 
@@ -97,6 +206,10 @@ def create_menubar(root, app, lang, config_data):
     filemenu = tk.Menu(menubar, tearoff=0)
     menubar.add_cascade(label=lang["menu_file"], menu=filemenu)
     filemenu.add_command(label=lang["submenu_reload_chords"], command=lambda: app.logic.reload_chords(lang))
+    root.watch_chords_var = tk.BooleanVar(value=config.WATCH_CHORDS)
+    filemenu.add_checkbutton(label=lang["submenu_watch_chords"], variable=root.watch_chords_var, command=set_watch_chords)
+    root.recording_var = tk.BooleanVar(value=False)
+    filemenu.add_checkbutton(label=lang["submenu_record_practice"], variable=root.recording_var, command=toggle_recording)
     filemenu.add_command(label=lang["submenu_exit"], command=root.quit)
 
     # Options menu
@@ -129,6 +242,59 @@ def create_menubar(root, app, lang, config_data):
     theme_submenu.add_radiobutton(label=lang["theme_light"], variable=root.theme_var, value="Light", command=lambda: switch_theme("light"))
     theme_submenu.add_radiobutton(label=lang["theme_dark"], variable=root.theme_var, value="Dark", command=lambda: switch_theme("dark"))
 
+    # tuning submenu
+    tuning_submenu = tk.Menu(optionmenu, tearoff=0)
+    optionmenu.add_cascade(label=lang["submenu_tuning"], menu=tuning_submenu)
+    root.tuning_var = tk.StringVar(value=config.TUNING)
+    for tuning_key in utils.TUNINGS:
+        tuning_submenu.add_radiobutton(
+            label=lang[f"tuning_{tuning_key}"],
+            variable=root.tuning_var,
+            value=tuning_key,
+            command=lambda key=tuning_key: set_tuning(key))
+
+    # capo submenu
+    capo_submenu = tk.Menu(optionmenu, tearoff=0)
+    optionmenu.add_cascade(label=lang["submenu_capo"], menu=capo_submenu)
+    root.capo_var = tk.IntVar(value=0)
+    for fret in range(0, 8):
+        capo_submenu.add_radiobutton(
+            label=lang["capo_none"] if fret == 0 else lang["capo_fret"].format(fret=fret),
+            variable=root.capo_var,
+            value=fret,
+            command=lambda f=fret: set_capo(f))
+
+    # transpose submenu
+    transpose_submenu = tk.Menu(optionmenu, tearoff=0)
+    optionmenu.add_cascade(label=lang["submenu_transpose"], menu=transpose_submenu)
+    root.transpose_var = tk.IntVar(value=0)
+    for semitones in range(-5, 7):
+        transpose_submenu.add_radiobutton(
+            label=f"{semitones:+d}" if semitones else "0",
+            variable=root.transpose_var,
+            value=semitones,
+            command=lambda s=semitones: set_transpose(s))
+
+    # chord pack submenu
+    pack_submenu = tk.Menu(optionmenu, tearoff=0)
+    optionmenu.add_cascade(label=lang["submenu_chord_packs"], menu=pack_submenu)
+    root.pack_vars = {}
+    packs = utils.get_pack_library(config.CHORD_PACK_DIR, config.DISABLED_PACKS).packs if os.path.isdir(config.CHORD_PACK_DIR) else {}
+    for namespace, pack in packs.items():
+        root.pack_vars[namespace] = tk.BooleanVar(value=namespace not in config.DISABLED_PACKS)
+        pack_submenu.add_checkbutton(
+            label=f"{pack.name} ({namespace})",
+            variable=root.pack_vars[namespace],
+            command=lambda ns=namespace: set_pack_enabled(ns, root.pack_vars[ns].get()))
+    if not packs:
+        pack_submenu.add_command(label=lang["chord_packs_none"], state="disabled")
+
+    root.play_chords_var = tk.BooleanVar(value=config.PLAY_CHORDS)
+    optionmenu.add_checkbutton(label=lang["submenu_play_chords"], variable=root.play_chords_var, command=set_play_chords)
+    root.listen_chords_var = tk.BooleanVar(value=config.LISTEN_CHORDS)
+    optionmenu.add_checkbutton(label=lang["submenu_listen_chords"], variable=root.listen_chords_var, command=set_listen_chords)
+    optionmenu.add_command(label=lang["tuner_title"], command=open_tuner)
+
     # Difficulty submenu
     difficulty_submenu = tk.Menu(optionmenu, tearoff=0)
     optionmenu.add_cascade(label=lang["difficulty"], menu=difficulty_submenu)
@@ -142,6 +308,8 @@ def create_menubar(root, app, lang, config_data):
     # load difficulty from file or set easy as default
     current_difficulty = config_data.get("difficulty", "easy")
     update_difficulty_menu()
+    # the control socket changes the difficulty the same way as the menu
+    root.set_difficulty = set_difficulty
 
     # chord editor entry
     optionmenu.add_command(label=f"{lang['editor_title']}", command=open_chord_editor)
@@ -151,6 +319,10 @@ def create_menubar(root, app, lang, config_data):
     menubar.add_cascade(label=lang["menu_help"], menu=helpmenu)
     helpmenu.add_command(label=lang["submenu_info"], command=lambda: utils.show_info(lang))
     helpmenu.add_command(label=lang["submenu_short_manual"], command=lambda: utils.show_tutorial(lang))
+    helpmenu.add_command(label=lang["practice_stats_title"], command=lambda: utils.show_practice_stats(lang, app.logic.practice_log))
     helpmenu.add_command(label=lang["submenu_github"], command=utils.open_github)
+    helpmenu.add_separator()
+    root.trace_var = tk.BooleanVar(value=tracer.enabled)
+    helpmenu.add_checkbutton(label=lang["submenu_trace"], variable=root.trace_var, command=toggle_trace)
 
     return menubar
@@ -0,0 +1,143 @@
+import threading
+import time
+from single_instance import REPLY_TIMEOUT, parse_command
+from utils.difficulty import LEVELS
+from utils.tk_queue import TkCallQueue
+from utils.tracing import span
+
+
+# the control queue is drained more often than the one of the speech thread, so a
+# pedal press reaches the screen within ~10 ms instead of up to 50 ms
+CONTROL_POLL_MS = 10
+
+
+class RemoteControl:
+    """
+    Runs commands from the control socket on the Tk main loop.
+
+    handle() is called from the socket threads; it queues the command for the
+    main loop and waits until it has run, so the reply tells the sender what
+    is on screen now and round trips measure the whole way to the widgets.
+    """
+
+    def __init__(self, root, app, lang):
+        """
+        Args:
+            root (tk.Tk): The main window; the menu bar puts set_difficulty() on it.
+            app (DefaultChordTrainerGUI): The trainer.
+            lang (dict): Language strings.
+        """
+        self.root = root
+        self.app = app
+        self.lang = lang
+        self.queue = TkCallQueue(root, CONTROL_POLL_MS)
+
+    def handle(self, line):
+        """
+        Run one command line on the main loop and wait for it; safe to call from any thread.
+
+        Args:
+            line (str): Command line, e.g. 'show Am'.
+
+        Returns:
+            str: Reply line, 'ok <chord on screen>' or 'error <reason>'.
+        """
+        try:
+            command, argument = parse_command(line)
+        except ValueError as e:
+            return f"error {e}"
+        done = threading.Event()
+        reply = []
+
+        def run():
+            try:
+                reply.append(self.run_command(command, argument))
+            except Exception as e:
+                reply.append(f"error {e}")
+            finally:
+                done.set()
+
+        self.queue.put(run)
+        if not done.wait(REPLY_TIMEOUT):
+            return "error timeout"
+        return reply[0]
+
+    def run_startup(self, line):
+        """
+        Run the command line the trainer was launched with, once the first chord is on screen.
+
+        Errors are shown on the status line, there is nobody waiting for a reply.
+
+        Args:
+            line (str): Command line, e.g. 'show Am'.
+        """
+        deadline = time.monotonic() + REPLY_TIMEOUT
+
+        def run():
+            # the first chord is shown shortly after start; showing it would replace what the command put on screen
+            if self.app.logic.shown_chord is None and time.monotonic() < deadline:
+                self.root.after(CONTROL_POLL_MS, self.queue.put, run)
+                return
+            try:
+                reply = self.run_command(*parse_command(line))
+            except Exception as e:
+                reply = f"error {e}"
+            if reply.startswith("error "):
+                self.app.update_status_display_label(reply[len("error "):])
+
+        self.queue.put(run)
+
+    def run_command(self, command, argument):
+        """
+        Execute a parsed command; must run on the Tk main thread.
+
+        Args:
+            command (str): One of single_instance.COMMANDS.
+            argument (str): Its argument, '' if none.
+
+        Returns:
+            str: Reply line.
+        """
+        with span("remote.command", command=command):
+            return self._run_command(command, argument)
+
+    def _run_command(self, command, argument):
+        """Carry out run_command(); see there."""
+        logic = self.app.logic
+        if command == "next":
+            if logic.mode == "quiz":
+                self.app.skip_quiz_question(time.perf_counter_ns())
+            elif logic.timer_active or logic.metronome is not None:
+                # the next button is locked while they change the chords
+                return "error timer or metronome running"
+            else:
+                logic.next_chord(self.lang, "remote")
+        elif command == "previous":
+            logic.previous_chord()
+        elif command == "forward":
+            logic.forward_chord()
+        elif command == "show":
+            chord = logic.chord_keys.get(argument)
+            if chord is None:
+                return f"error unknown chord {argument}"
+            logic.show_chord_by_name(chord, "remote")
+        elif command == "timer":
+            if argument.isdigit():
+                self.app.set_timer_interval(int(argument))
+            elif argument in ("", "on", "off"):
+                wanted = not logic.timer_active if argument == "" else argument == "on"
+                if wanted != logic.timer_active:
+                    if wanted and logic.metronome is not None:
+                        return "error metronome running"
+                    logic.toggle_timer(self.lang)
+            else:
+                return "error timer takes on, off or seconds"
+        elif command == "difficulty":
+            if argument not in LEVELS:
+                return f"error unknown difficulty {argument}"
+            self.root.set_difficulty(argument)
+        elif command == "focus":
+            self.root.deiconify()
+            self.root.lift()
+            self.root.focus_force()
+        return f"ok {logic.shown_chord or ''}".rstrip()
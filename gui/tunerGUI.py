@@ -0,0 +1,124 @@
+import customtkinter as ctk
+import tkinter as tk
+import config
+from utils.pitch import PitchDetector, tuner_reading
+
+
+REFRESH_MS = 33         # ~30 updates per second, the rate the needle is redrawn at
+IN_TUNE_CENTS = 5       # deviation shown as in tune
+SCALE_CENTS = 50        # deviation at the ends of the scale
+SMOOTHING = 0.35        # share of a new reading in the needle position
+
+
+class TunerWindow(ctk.CTkToplevel):
+    """
+    A small tuner window showing the played string and its deviation in cents.
+
+    Pitch detection reads the newest window of the shared microphone capture
+    of the logic manager through its own subscription, so the tuner never
+    opens a second input stream. It only runs when new samples arrived since
+    the last update and nothing is redrawn while the microphone is silent.
+
+    Attributes:
+        lang (dict): Dictionary with localized strings.
+        logic (GuiLogicManager): Logic manager owning the capture and the active tuning.
+        subscription (Subscription): The tuner's cursor on the shared capture.
+        detector (PitchDetector): YIN pitch detector for the capture's sample rate.
+    """
+
+    def __init__(self, lang, logic, master=None):
+        super().__init__(master)
+        self.lang = lang
+        self.logic = logic
+        self.title(lang["tuner_title"])
+        self.geometry("360x260")
+        self.resizable(False, False)
+        capture = logic.use_capture("tuner", True)
+        self.subscription = capture.subscribe("tuner")
+        self.detector = PitchDetector(capture.sample_rate)
+        self._cents = None
+        self._string = None
+
+        self.string_frame = ctk.CTkFrame(self, fg_color="transparent")
+        self.string_frame.pack(pady=(15, 5))
+        self.string_labels = []
+        for name in logic.tuning.string_names:
+            label = ctk.CTkLabel(self.string_frame, text=name, width=50, font=(config.BASE_FONT, 20, "bold"),
+                                 corner_radius=8)
+            label.pack(side="left", padx=5)
+            self.string_labels.append(label)
+
+        self.canvas = tk.Canvas(self, width=300, height=80, highlightthickness=0, bg=self._canvas_color())
+        self.canvas.pack(pady=5)
+        self._draw_scale()
+        self.needle = self.canvas.create_line(150, 10, 150, 70, width=3, fill="gray", state="hidden")
+
+        self.cents_label = ctk.CTkLabel(self, text=lang["tuner_waiting"], font=(config.BASE_FONT, 18))
+        self.cents_label.pack(pady=5)
+        self.frequency_label = ctk.CTkLabel(self, text="", font=(config.BASE_FONT, 14))
+        self.frequency_label.pack()
+
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        self.after(REFRESH_MS, self.update_reading)
+
+    def _canvas_color(self):
+        """Background of the scale matching the current theme."""
+        return "#2b2b2b" if ctk.get_appearance_mode() == "Dark" else "#dbdbdb"
+
+    def _draw_scale(self):
+        """Draw the cents scale from -SCALE_CENTS to +SCALE_CENTS."""
+        color = "white" if ctk.get_appearance_mode() == "Dark" else "black"
+        self._needle_color = color
+        low, high = self._cents_to_x(-IN_TUNE_CENTS), self._cents_to_x(IN_TUNE_CENTS)
+        self.canvas.create_rectangle(low, 10, high, 70, outline="", fill="#2e7d32")
+        for cents in range(-SCALE_CENTS, SCALE_CENTS + 1, 10):
+            x = self._cents_to_x(cents)
+            self.canvas.create_line(x, 55 if cents else 45, x, 70, fill=color)
+
+    def _cents_to_x(self, cents):
+        """Canvas x position of a deviation, clamped to the scale."""
+        cents = max(-SCALE_CENTS, min(SCALE_CENTS, cents))
+        return 150 + cents / SCALE_CENTS * 130
+
+    def update_reading(self):
+        """
+        Detect the pitch of the newest samples and move the needle.
+        Reschedules itself until the window is closed.
+        """
+        if not self.winfo_exists():
+            return
+        if self.subscription.lag:
+            reading = tuner_reading(self.detector, self.subscription.window(self.detector.window),
+                                    self.logic.tuning.open_pitches)
+            if reading is not None:
+                self.show_reading(reading)
+        self.after(REFRESH_MS, self.update_reading)
+
+    def show_reading(self, reading):
+        """
+        Display one reading, smoothing the needle while the same string rings.
+
+        Args:
+            reading (TunerReading): The detected pitch.
+        """
+        if reading.string == self._string and self._cents is not None:
+            self._cents += SMOOTHING * (reading.cents - self._cents)
+        else:
+            self._cents = reading.cents
+        self._string = reading.string
+
+        in_tune = abs(self._cents) <= IN_TUNE_CENTS
+        for index, label in enumerate(self.string_labels):
+            label.configure(fg_color=("#2e7d32" if in_tune else "#c62828") if index == reading.string else "transparent")
+        x = self._cents_to_x(self._cents)
+        self.canvas.coords(self.needle, x, 10, x, 70)
+        self.canvas.itemconfigure(self.needle, state="normal", fill=self._needle_color if in_tune else "#c62828")
+        self.cents_label.configure(text=self.lang["tuner_cents"].format(
+            string=self.logic.tuning.string_names[reading.string], cents=self._cents))
+        self.frequency_label.configure(text=f"{reading.frequency:.1f} Hz")
+
+    def _on_close(self):
+        """ Release the microphone and close the window. """
+        self.subscription.service.unsubscribe(self.subscription)
+        self.logic.use_capture("tuner", False)
+        self.destroy()
@@ -1,16 +1,37 @@
-import customtkinter as ctk
-import tkinter as tk
+import sys
 import config
-import utils
-from gui import LegacyChordTrainerGUI 
-from gui import DefaultChordTrainerGUI
-from gui import create_menubar
-from version import __VERSION__
+from single_instance import ControlServer, forward, parse_arguments
 
 # TODO Check error handling in the whole project, its currently a bit sloppy
 
 
 def main():
+    args = parse_arguments(sys.argv[1:])
+    single = config.SINGLE_INSTANCE and not args.new_instance
+    # a second launch hands its command over and exits before the GUI and audio libraries are loaded
+    if single and forward(args.command):
+        return
+    run_trainer(args.command, single)
+
+
+def run_trainer(command, single):
+    """
+    Start the trainer window.
+
+    Args:
+        command (str): Command line to run once the first chord is shown, '' for none.
+        single (bool): Listen on the control socket for later launches and controllers.
+    """
+    import customtkinter as ctk
+    import utils
+    from gui import LegacyChordTrainerGUI
+    from gui import DefaultChordTrainerGUI
+    from gui import RemoteControl
+    from gui import create_menubar
+    from version import __VERSION__
+
+    utils.start_from_environment()
+
     # list of valid layouts in case a user edits the config file manually
     valid_layouts = ["default"]
 
@@ -35,6 +56,13 @@ def main():
     ctk.set_default_color_theme("dark-blue")  # "blue" (standard), "green", "dark-blue"
 
     config.DIFFICULTY = config_data.get("difficulty", "easy")
+    config.TUNING = config_data.get("tuning", "standard")
+    config.CHORD_STORAGE = config_data.get("chord_storage", "json")
+    config.DISABLED_PACKS = config_data.get("disabled_packs", [])
+    config.WATCH_CHORDS = config_data.get("watch_chords", False)
+    config.PLAY_CHORDS = config_data.get("play_chords", False)
+    config.LISTEN_CHORDS = config_data.get("listen_chords", False)
+    config.RECORDING_FORMAT = config_data.get("recording_format", "wav")
     chords = utils.load_chords(lang)
 
     # windowsize by layout
@@ -53,11 +81,20 @@ def main():
 
     root.config(menu=create_menubar(root, app, lang, config_data))
 
+    remote = RemoteControl(root, app, lang)
+    control = ControlServer(remote.handle)
+    if single:
+        control.start()
+    if command:
+        remote.run_startup(command)
+
     # debug
     # root.update()  # Layout erzwingen
     # print(f"Fenstergröße nach update(): {root.winfo_width()}x{root.winfo_height()}")
 
     root.mainloop()
+    control.stop()
+    app.logic.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,332 @@
+# a second launch only imports this module before handing over its command, so it
+# must not pull in the GUI or audio libraries: standard library and config only
+import argparse
+import os
+import secrets
+import socket
+import tempfile
+import threading
+import config
+
+
+COMMANDS = {
+    # command: whether it takes an argument (None: optional)
+    "next": False,
+    "previous": False,
+    "forward": False,
+    "show": True,
+    "timer": None,
+    "difficulty": True,
+    "focus": False,
+    "ping": False,
+}
+CONNECT_TIMEOUT = 0.5     # seconds a second launch waits for the running instance
+REPLY_TIMEOUT = 5.0       # seconds a client waits for a command to finish
+MAX_LINE = 1024
+# Windows has no Unix domain sockets in Python; there the trainer listens on a loopback
+# TCP port and writes the port and a random key to a file only the user can read
+UNIX_SOCKETS = hasattr(socket, "AF_UNIX") and hasattr(os, "getuid")
+
+
+def socket_path():
+    """
+    Return the path of the control socket of the current user.
+
+    Without Unix domain sockets (Windows) this is the file holding port and key of the loopback connection.
+
+    Returns:
+        str: config.CONTROL_SOCKET_PATH, or a file in the user's runtime or local application data directory.
+    """
+    if config.CONTROL_SOCKET_PATH:
+        return config.CONTROL_SOCKET_PATH
+    if not UNIX_SOCKETS:
+        directory = os.environ.get("LOCALAPPDATA") or tempfile.gettempdir()
+        return os.path.join(directory, "ukulele-chord-trainer-control.txt")
+    directory = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(directory, f"ukulele-chord-trainer-{os.getuid()}.sock")
+
+
+def read_address(path):
+    """
+    Read port and key of the loopback control connection from the file written by ControlServer.
+
+    Args:
+        path (str): The file.
+
+    Returns:
+        tuple: (port, key).
+
+    Raises:
+        OSError: If the file is missing or damaged.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        port, _, key = f.read().strip().partition(" ")
+    if not port.isdigit() or not key:
+        raise OSError(f"damaged control file {path}")
+    return int(port), key
+
+
+def parse_command(line):
+    """
+    Split a command line into command and argument.
+
+    Args:
+        line (str): e.g. 'show Am7'.
+
+    Returns:
+        tuple: (command, argument); the argument is '' if there is none.
+
+    Raises:
+        ValueError: For unknown commands or a missing or unexpected argument.
+    """
+    command, _, argument = line.strip().partition(" ")
+    command, argument = command.lower(), argument.strip()
+    if command not in COMMANDS:
+        raise ValueError(f"unknown command {command!r}")
+    takes = COMMANDS[command]
+    if takes is True and not argument:
+        raise ValueError(f"{command} needs an argument")
+    if takes is False and argument:
+        raise ValueError(f"{command} takes no argument")
+    return command, argument
+
+
+def parse_arguments(argv):
+    """
+    Parse the command line of main.py.
+
+    Args:
+        argv (list): Arguments without the program name.
+
+    Returns:
+        argparse.Namespace: 'new_instance' and 'command' (a command line, '' for none).
+    """
+    parser = argparse.ArgumentParser(description="Ukulele Chord Trainer. With a command, a running trainer "
+                                                 "executes it; otherwise the trainer starts and executes it.")
+    parser.add_argument("--new-instance", action="store_true",
+                        help="start another trainer even if one is running")
+    parser.add_argument("command", nargs="*", help=" | ".join(COMMANDS))
+    args = parser.parse_args(argv)
+    args.command = " ".join(args.command)
+    if args.command:
+        try:
+            parse_command(args.command)
+        except ValueError as e:
+            parser.error(str(e))
+    return args
+
+
+class ControlClient:
+    """ A connection to the control socket of the running trainer. """
+
+    def __init__(self, path=None, timeout=CONNECT_TIMEOUT):
+        """
+        Args:
+            path (str, optional): Socket path; socket_path() if omitted.
+            timeout (float): Seconds to wait for the connection.
+
+        Raises:
+            OSError: If no trainer is listening.
+        """
+        path = path or socket_path()
+        if UNIX_SOCKETS:
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            address, key = path, None
+        else:
+            port, key = read_address(path)
+            self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            address = ("127.0.0.1", port)
+        self._socket.settimeout(timeout)
+        try:
+            self._socket.connect(address)
+        except OSError:
+            self._socket.close()
+            raise
+        self._file = self._socket.makefile("rw", encoding="utf-8", newline="\n")
+        if key is not None:
+            # a port left over from a crashed trainer may belong to another program by now
+            try:
+                reply = self.send(key)
+            except (OSError, UnicodeDecodeError):
+                reply = ""
+            if reply != "ok":
+                self.close()
+                raise ConnectionRefusedError(f"no trainer listening on port {port}")
+        self._socket.settimeout(REPLY_TIMEOUT)
+
+    def send(self, line):
+        """
+        Send one command and wait for its reply.
+
+        Args:
+            line (str): Command line, e.g. 'next'.
+
+        Returns:
+            str: The reply line without the newline.
+        """
+        self._file.write(line.strip() + "\n")
+        self._file.flush()
+        reply = self._file.readline()
+        if not reply:
+            raise ConnectionError("the trainer closed the connection")
+        return reply.rstrip("\n")
+
+    def close(self):
+        self._file.close()
+        self._socket.close()
+
+
+def forward(command):
+    """
+    Hand a command to an already running trainer.
+
+    Args:
+        command (str): Command line; '' brings the running window to the front.
+
+    Returns:
+        bool: True if a trainer is running and got the command, False if this launch should start one.
+    """
+    try:
+        client = ControlClient()
+    except OSError:
+        return False
+    try:
+        reply = client.send(command or "focus")
+    except OSError as e:
+        reply = f"error {e}"
+    finally:
+        client.close()
+    if reply.startswith("error"):
+        print(reply)
+    return True
+
+
+class ControlServer:
+    """
+    Listens on the control socket of the running trainer.
+
+    A second launch of main.py and external controllers such as foot pedals
+    or scripts send it command lines, e.g. `echo next | nc -U <socket>`:
+
+        next | previous | forward | show <chord> | timer [on|off|<seconds>]
+        difficulty <level> | focus | ping
+
+    Every line is answered with one line, 'ok <chord on screen>' or
+    'error <reason>'. Each connection is served by its own thread and may
+    send any number of lines, so a pedal can keep its connection open. The
+    handler is called from these threads and has to pass the command to the
+    Tk main loop itself.
+
+    Where there are no Unix domain sockets (Windows) it listens on a loopback
+    TCP port instead and writes the port and a random key to the socket path;
+    a connection has to send the key as its first line, which is answered
+    with 'ok'.
+    """
+
+    def __init__(self, handler, path=None):
+        """
+        Args:
+            handler (callable): Called with a command line; returns the reply line.
+            path (str, optional): Socket path; socket_path() if omitted.
+        """
+        self.handler = handler
+        self.path = path or socket_path()
+        self._socket = None
+        self._thread = None
+        self._key = None
+
+    def start(self):
+        """
+        Bind the socket and start accepting connections.
+
+        Returns:
+            bool: False if another trainer already listens on the socket.
+        """
+        try:
+            ControlClient(self.path).close()
+            return False
+        except OSError:
+            pass
+        # nobody answers, so a socket file left by a crashed instance can go
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        if UNIX_SOCKETS:
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                self._socket.bind(self.path)
+            except OSError:
+                # another launch bound it in the meantime
+                self._socket.close()
+                self._socket = None
+                return False
+            os.chmod(self.path, 0o600)
+        else:
+            self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self._socket.bind(("127.0.0.1", 0))
+            self._key = secrets.token_urlsafe(16)
+            try:
+                # O_EXCL: only one of two launches racing for the file wins, like bind() above
+                fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            except OSError:
+                self._socket.close()
+                self._socket = None
+                return False
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(f"{self._socket.getsockname()[1]} {self._key}\n")
+        self._socket.listen()
+        self._thread = threading.Thread(target=self._accept, daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        """ Stop listening and remove the socket file. """
+        if self._socket is not None:
+            # shutdown() wakes the accept() of the listening thread
+            try:
+                self._socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._socket.close()
+            self._socket = None
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+    def _accept(self):
+        """Accept connections until the socket is closed."""
+        listening = self._socket
+        while True:
+            try:
+                connection, _ = listening.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._serve, args=(connection,), daemon=True).start()
+
+    def _serve(self, connection):
+        """Answer the command lines of one connection."""
+        if self._key is not None:
+            connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with connection, connection.makefile("rw", encoding="utf-8", newline="\n") as stream:
+            if self._key is not None:
+                # only processes that can read the control file may send commands
+                try:
+                    if stream.readline(MAX_LINE).strip() != self._key:
+                        return
+                    stream.write("ok\n")
+                    stream.flush()
+                except (OSError, UnicodeDecodeError):
+                    return
+            while True:
+                try:
+                    line = stream.readline(MAX_LINE)
+                except (OSError, UnicodeDecodeError):
+                    return
+                if not line:
+                    return
+                if not line.strip():
+                    continue
+                try:
+                    stream.write(self.handler(line) + "\n")
+                    stream.flush()
+                except OSError:
+                    return
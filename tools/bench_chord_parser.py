@@ -0,0 +1,66 @@
+import argparse
+import itertools
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.chord_parser import parse_chord_symbol
+
+# the validation regex the chord editor used before the chord symbol parser
+LEGACY_PATTERN = re.compile(
+    r"^[A-G](?:#|b|♯|♭)?(?:m|maj|min|dim|aug|sus|add|M)?\d{0,2}(?:sus\d?)?(?:[+#-]?\d*)?"
+    r"(?:b5|#5|b9|#9|b11|#11|b13|#13)?"
+    r"(?:/[A-G](?:#|b|♯|♭)?(?:m|maj|min|dim|aug|sus|add|M)?\d{0,2}(?:sus\d?)?(?:[+#-]?\d*)?"
+    r"(?:b5|#5|b9|#9|b11|#11|b13|#13)?)?$",
+    re.IGNORECASE
+)
+
+ROOTS = ["C", "C#", "Db", "D", "Eb", "E", "F", "F#", "Gb", "G", "Ab", "A", "Bb", "B"]
+SUFFIXES = ["", "m", "7", "m7", "maj7", "6", "m6", "dim", "dim7", "m7b5", "aug", "sus2", "sus4", "7sus4",
+            "add9", "9", "13", "7#9", "7(b9,#11)", "mmaj7", "5", "6/9", "Xyz"]
+
+
+def make_names(count, distinct, seed=1):
+    """Build a list of chord names drawn from a pool of distinct names."""
+    pool = [r + s for r, s in itertools.product(ROOTS, SUFFIXES)]
+    pool += [f"{name}/{bass}" for name, bass in itertools.product(pool[:100], ROOTS[:5])]
+    rng = random.Random(seed)
+    pool = rng.sample(pool, min(distinct, len(pool)))
+    return [rng.choice(pool) for _ in range(count)]
+
+
+def timed(func, names):
+    start = time.perf_counter()
+    for name in names:
+        func(name)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the chord symbol parser with the old validation regex.")
+    parser.add_argument("--count", type=int, default=200000, help="number of names to check")
+    parser.add_argument("--distinct", type=int, default=500, help="number of distinct names among them")
+    args = parser.parse_args()
+
+    names = make_names(args.count, args.distinct)
+    regex_time = timed(LEGACY_PATTERN.fullmatch, names)
+
+    parse_chord_symbol.cache_clear()
+    cold_time = timed(parse_chord_symbol.__wrapped__, names)
+    warm_time = timed(parse_chord_symbol, names)
+
+    disagree = sorted({n for n in names if bool(LEGACY_PATTERN.fullmatch(n)) != (parse_chord_symbol(n) is not None)})
+
+    print(f"{len(names)} Namen ({args.distinct} verschiedene)")
+    print(f"Regex:            {regex_time * 1000:8.1f} ms")
+    print(f"Parser ohne Cache:{cold_time * 1000:8.1f} ms")
+    print(f"Parser mit Cache: {warm_time * 1000:8.1f} ms  {parse_chord_symbol.cache_info()}")
+    print(f"Unterschiedlich bewertet: {', '.join(disagree[:20])}{' ...' if len(disagree) > 20 else ''}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.chord_store import ChordStore
+from utils.gui_helpers import json_dumps_compact_lists
+
+LEVELS = ["easy", "medium", "hard"]
+
+
+def make_data(count, template, seed=1):
+    """Build a chord pack with the given number of voicings from the chords of a template pack."""
+    rng = random.Random(seed)
+    chords = [c for level in template.values() for c in level]
+    data = {level: [] for level in LEVELS}
+    for i in range(count):
+        chord = dict(rng.choice(chords))
+        chord["name"] = f"{chord['name']}_{i}"
+        chord["fingering"] = [str(rng.randint(0, 12)) for _ in range(4)]
+        data[LEVELS[i % len(LEVELS)]].append(chord)
+    return data
+
+
+def timed(label, func, results):
+    start = time.perf_counter()
+    value = func()
+    results.append((label, time.perf_counter() - start))
+    return value
+
+
+def bench(count, template, workdir):
+    """Time the JSON file and the SQLite library on the usual operations."""
+    data = make_data(count, template)
+    json_path = os.path.join(workdir, f"bench_{count}.json")
+    db_path = os.path.join(workdir, f"bench_{count}.sqlite")
+    results = []
+
+    def write_json():
+        with open(json_path, "w", encoding="utf-8") as f:
+            f.write(json_dumps_compact_lists(data))
+
+    def load_json_level():
+        with open(json_path, "r", encoding="utf-8") as f:
+            return json.load(f)["medium"]
+
+    timed("JSON: ganze Datei schreiben", write_json, results)
+    timed("JSON: Schwierigkeit laden", load_json_level, results)
+    timed("JSON: Name suchen", lambda: [c for lvl in data.values() for c in lvl if c["name"] == "C_7"], results)
+
+    store = ChordStore(db_path)
+    timed("SQLite: importieren", lambda: store.import_data(data), results)
+    timed("SQLite: Schwierigkeit laden", lambda: store.load_level("medium"), results)
+    timed("SQLite: erste Seite (100) laden", lambda: store.load_level("medium", 0, 100), results)
+    timed("SQLite: Name suchen", lambda: store.find_by_name("C_7"), results)
+    timed("SQLite: Griff suchen", lambda: store.find_by_fingering(["0", "0", "0", "3"]), results)
+    timed("SQLite: Volltextsuche", lambda: store.search("C#m"), results)
+
+    data["easy"][0] = dict(data["easy"][0], fingers=["1", "2", "3", "4"])
+    timed("SQLite: einen Akkord speichern", lambda: store.save_chord("easy", 0, data["easy"][0]), results)
+    timed("SQLite: Editor-Speichern (Diff)", lambda: store.save_data(data), results)
+    store.close()
+
+    size_json = os.path.getsize(json_path) / 1e6
+    size_db = os.path.getsize(db_path) / 1e6
+    for path in (json_path, db_path, db_path + "-wal", db_path + "-shm"):
+        if os.path.exists(path):
+            os.remove(path)
+    return results, size_json, size_db
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the JSON chord file with the SQLite chord library.")
+    parser.add_argument("--sizes", default="1000,100000,1000000", help="comma-separated numbers of voicings")
+    parser.add_argument("--template", default="chords/chord_db.json", help="chord pack the test data is built from")
+    args = parser.parse_args()
+
+    with open(args.template, "r", encoding="utf-8") as f:
+        template = json.load(f)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for count in (int(s) for s in args.sizes.split(",")):
+            results, size_json, size_db = bench(count, template, workdir)
+            print(f"--- {count} Griffe (JSON {size_json:.1f} MB, SQLite {size_db:.1f} MB)")
+            for label, seconds in results:
+                print(f"{label:36s} {seconds * 1000:10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
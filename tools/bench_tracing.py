@@ -0,0 +1,150 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.tracing import traced, tracer
+
+
+# the events one chord change records in GuiLogicManager.next_chord(): 13 spans and one counter
+CHORD_CHANGE_SPANS = ("logic.pick_next_chord", "logic.write_last_chords", "logic.chord_lookup", "gui.chord_label",
+                      "fretboard.redraw", "fretboard.draw_chord", "gui.theory_labels", "logic.alternatives",
+                      "gui.alternatives", "gui.history_labels", "gui.navigation_buttons")
+
+
+def per_call(func, count, enabled=False):
+    """Nanoseconds per call of func(), best of five runs to hide scheduler noise."""
+    best = float("inf")
+    for _ in range(5):
+        # every run starts with an empty event list, so none of them hits MAX_EVENTS
+        if enabled:
+            tracer.start()
+        start = time.perf_counter_ns()
+        func(count)
+        best = min(best, time.perf_counter_ns() - start)
+    return best / count
+
+
+def empty_loop(count):
+    for _ in range(count):
+        pass
+
+
+def span_loop(count):
+    span = tracer.span
+    for _ in range(count):
+        with span("bench.span"):
+            pass
+
+
+def span_args_loop(count):
+    span = tracer.span
+    for _ in range(count):
+        with span("bench.span", chord="Am7"):
+            pass
+
+
+def count_loop(count):
+    for _ in range(count):
+        tracer.count("bench.counter")
+
+
+@traced("bench.traced")
+def traced_function():
+    pass
+
+
+def traced_loop(count):
+    for _ in range(count):
+        traced_function()
+
+
+def chord_change_loop(count):
+    """The span structure of one chord change without the work inside it."""
+    span = tracer.span
+    for _ in range(count):
+        with span("logic.next_chord", reason="button"):
+            with span(CHORD_CHANGE_SPANS[0]):
+                pass
+            with span(CHORD_CHANGE_SPANS[1]):
+                pass
+            with span("logic.show_chord", chord="Am7"):
+                for name in CHORD_CHANGE_SPANS[2:9]:
+                    with span(name):
+                        pass
+                tracer.count("chords_shown")
+            for name in CHORD_CHANGE_SPANS[9:]:
+                with span(name):
+                    pass
+
+
+def overhead(count):
+    """Cost of every instrumentation call with tracing off and on, minus the bare loop."""
+    cases = [("span", span_loop), ("span with args", span_args_loop), ("count", count_loop),
+             ("@traced call", traced_loop), ("chord change (13 spans)", chord_change_loop)]
+    base = per_call(empty_loop, count)
+    print(f"{'':26}{'aus':>10}{'an':>10}")
+    for label, loop in cases:
+        n = count // 10 if loop is chord_change_loop else count
+        off = per_call(loop, n) - base
+        on = per_call(loop, n, enabled=True) - base
+        tracer.stop()
+        print(f"{label:26}{off:8.0f}ns{on:8.0f}ns")
+    path = os.path.join(tempfile.gettempdir(), "bench_tracing.json")
+    tracer.start()
+    chord_change_loop(10_000)
+    tracer.stop()
+    start = time.perf_counter()
+    written = tracer.dump(path)
+    size = os.path.getsize(path)
+    os.remove(path)
+    print(f"Schreiben von {written} Ereignissen: {time.perf_counter() - start:.2f} s, "
+          f"{size / written:.0f} Bytes pro Ereignis")
+
+
+def summarize(path, top):
+    """Per-span statistics of a trace file written by the trainer."""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    durations = defaultdict(list)
+    counters = {}
+    for event in data["traceEvents"]:
+        if event["ph"] == "X":
+            durations[event["name"]].append(event["dur"])
+        elif event["ph"] == "C":
+            counters[event["name"]] = event["args"][event["name"]]
+    rows = sorted(durations.items(), key=lambda item: -sum(item[1]))[:top]
+    print(f"{'Span':34}{'Anzahl':>8}{'Summe ms':>10}{'p50 µs':>9}{'p99 µs':>9}{'max µs':>9}")
+    for name, values in rows:
+        values = np.asarray(values)
+        print(f"{name:34}{len(values):8}{values.sum() / 1000:10.1f}{np.percentile(values, 50):9.0f}"
+              f"{np.percentile(values, 99):9.0f}{values.max():9.0f}")
+    for name, total in sorted(counters.items()):
+        print(f"Zähler {name}: {total}")
+    dropped = data.get("otherData", {}).get("dropped_events", 0)
+    if dropped:
+        print(f"{dropped} Ereignisse wurden wegen des Limits nicht aufgezeichnet")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the cost of the tracing instrumentation or summarize "
+                                                 "a trace recorded with Help > Record performance trace or UKULELE_TRACE.")
+    parser.add_argument("trace", nargs="?", help="trace file to summarize; without it the overhead is measured")
+    parser.add_argument("--count", type=int, default=200_000, help="calls per overhead measurement")
+    parser.add_argument("--top", type=int, default=25, help="spans shown in the summary, by total time")
+    args = parser.parse_args()
+    if args.trace:
+        summarize(args.trace, args.top)
+    else:
+        overhead(args.count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.pitch import PitchDetector, tuner_reading, frequency_to_midi
+from utils.synth import SAMPLE_RATE, midi_to_frequency, read_wav
+from utils.tunings import TUNINGS, get_tuning
+
+
+DETUNINGS = (-40, -15, -5, 0, 3, 12, 30)   # cents
+OFFSETS = (0.05, 0.3, 0.8)                 # seconds after the pluck the tuner looks at
+
+
+def synthetic_tone(frequency, seconds, noise, rng, sample_rate=SAMPLE_RATE):
+    """
+    A decaying string-like tone with an exactly known fundamental: eight
+    harmonics with falling amplitudes, a slightly faster decay of the upper
+    ones and added noise. (The Karplus-Strong synth rounds its period to whole
+    samples, so its pitch is not exact enough to measure a tuner against.)
+    """
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    tone = np.zeros_like(t)
+    for harmonic in range(1, 9):
+        if harmonic * frequency >= sample_rate / 2:
+            break
+        phase = rng.uniform(0, 2 * np.pi)
+        tone += np.sin(2 * np.pi * harmonic * frequency * t + phase) / harmonic * np.exp(-t * (1.5 + harmonic * 0.5))
+    tone *= 0.5 / np.abs(tone).max()
+    return (tone + rng.normal(0, noise, len(t))).astype(np.float32)
+
+
+def evaluate(detector, cases, open_pitches):
+    """
+    Detect every (samples, expected frequency, expected string) case the way the
+    tuner window does; returns errors in cents, misses and wrong strings.
+    """
+    errors = []
+    misses = 0
+    wrong_strings = 0
+    for samples, expected, string in cases:
+        reading = tuner_reading(detector, samples, open_pitches)
+        if reading is None:
+            misses += 1
+            continue
+        errors.append(1200 * np.log2(reading.frequency / expected))
+        if string is not None and reading.string != string:
+            wrong_strings += 1
+    return np.array(errors), misses, wrong_strings
+
+
+def print_result(title, errors, misses, wrong_strings, total):
+    print(f"{title}: {total} Töne, {misses} ohne Ergebnis (zu leise oder unklar), {wrong_strings} falsche Saite")
+    if len(errors):
+        errors = np.abs(errors)
+        print(f"  Fehler: Mittel {errors.mean():.2f} Cent, 95% {np.percentile(errors, 95):.2f} Cent, "
+              f"max {errors.max():.2f} Cent")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure accuracy and speed of the tuner's YIN pitch detection.")
+    parser.add_argument("--tuning", choices=list(TUNINGS), default="standard")
+    parser.add_argument("--noise", type=float, default=0.01, help="standard deviation of added noise")
+    parser.add_argument("--recordings", help="directory with WAV recordings and a tones.json manifest "
+                                             "(entries: file, frequency, optional string index and onset in seconds)")
+    parser.add_argument("--runs", type=int, default=2000, help="detections timed for the speed test")
+    args = parser.parse_args()
+
+    tuning = get_tuning(args.tuning)
+    detector = PitchDetector(SAMPLE_RATE)
+    rng = np.random.default_rng(0)
+
+    cases = []
+    for string, pitch in enumerate(tuning.open_pitches):
+        for cents in DETUNINGS:
+            frequency = midi_to_frequency(pitch + cents / 100)
+            tone = synthetic_tone(frequency, 1.0, args.noise, rng)
+            for offset in OFFSETS:
+                start = int(offset * SAMPLE_RATE)
+                cases.append((tone[start:start + detector.window], frequency, string))
+    print_result("Synthetische Töne", *evaluate(detector, cases, tuning.open_pitches), len(cases))
+
+    if args.recordings:
+        with open(os.path.join(args.recordings, "tones.json"), "r", encoding="utf-8") as f:
+            entries = json.load(f)
+        cases = []
+        for entry in entries:
+            samples, sample_rate = read_wav(os.path.join(args.recordings, entry["file"]))
+            if sample_rate != detector.sample_rate:
+                detector = PitchDetector(sample_rate)
+            start = int(entry.get("onset", 0.0) * sample_rate)
+            for offset in OFFSETS:
+                begin = start + int(offset * sample_rate)
+                cases.append((samples[begin:begin + detector.window], entry["frequency"], entry.get("string")))
+        print_result("Aufnahmen", *evaluate(detector, cases, tuning.open_pitches), len(cases))
+
+    # speed: a sounding string, the case the tuner spends its time on
+    tone = synthetic_tone(midi_to_frequency(tuning.open_pitches[0]), 0.3, args.noise, rng)[:detector.window]
+    start = time.perf_counter()
+    for _ in range(args.runs):
+        detector.detect(tone)
+    per_detection = (time.perf_counter() - start) / args.runs
+    print(f"{per_detection * 1e3:.3f} ms pro Messung ({1 / per_detection:.0f} pro Sekunde möglich; "
+          f"das Stimmgerät misst höchstens 30 mal pro Sekunde, "
+          f"{per_detection * 30 * 100:.2f}% eines Kerns)")
+    print(f"Erkannter Ton der Testsaite: MIDI {frequency_to_midi(detector.detect(tone)[0]):.2f}, "
+          f"erwartet {tuning.open_pitches[0]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import argparse
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.audio_capture import CaptureService, FileDevice
+from utils.chroma import ChromaAnalyzer
+from utils.synth import SAMPLE_RATE
+
+
+def reader(subscription, chunk, delay, received, stop):
+    """Streaming consumer: reads chunk by chunk and sleeps `delay` seconds per chunk, like a slow recognizer."""
+    while not stop.is_set() or subscription.lag:
+        if not subscription.wait(chunk, timeout=0.1):
+            # the end of the input is shorter than a chunk
+            data = subscription.read()
+        else:
+            data = subscription.read(chunk)
+        if len(data):
+            received.append(np.array(data))
+        if delay:
+            time.sleep(delay)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the shared capture service on a file-backed fake device "
+                                                 "and show its overrun and lag counters.")
+    parser.add_argument("wav", nargs="?", help="WAV file to play as microphone input (default: a test signal)")
+    parser.add_argument("--seconds", type=float, default=8.0, help="length of the generated test signal")
+    parser.add_argument("--ring", type=float, default=2.0, help="ring length in seconds")
+    parser.add_argument("--fast", action="store_true", help="deliver blocks as fast as possible instead of in real time")
+    parser.add_argument("--slow-delay", type=float, default=0.03,
+                        help="seconds the slow reader needs per 1024 samples (real time is ~0.023)")
+    args = parser.parse_args()
+
+    if args.wav:
+        device = FileDevice(args.wav, realtime=not args.fast)
+    else:
+        # a ramp makes every lost or repeated sample visible in the comparison below
+        count = int(args.seconds * SAMPLE_RATE)
+        device = FileDevice((np.arange(count) % 65536 / 65536).astype(np.float32), realtime=not args.fast)
+    service = CaptureService(device, seconds=args.ring)
+
+    stop = threading.Event()
+    streams = {"speech": ([], 0.0), "slow": ([], args.slow_delay)}
+    threads = []
+    for name, (received, delay) in streams.items():
+        thread = threading.Thread(target=reader, args=(service.subscribe(name), 1024, delay, received, stop), daemon=True)
+        threads.append(thread)
+
+    analyzer = ChromaAnalyzer(device.sample_rate)
+    window_subscription = service.subscribe("listen")
+    analysis_times = []
+
+    service.start()
+    for thread in threads:
+        thread.start()
+    total = len(device.samples)
+    while service.ring.written < total:
+        begin = time.perf_counter()
+        analyzer.analyze(window_subscription.window(analyzer.window))
+        analysis_times.append(time.perf_counter() - begin)
+        time.sleep(0.04 if not args.fast else 0.001)
+    # the input has ended; the readers finish their backlog before stopping
+    stop.set()
+    for thread in threads:
+        thread.join()
+    service.stop()
+
+    stats = service.stats()
+    print(f"{stats['blocks']} Blöcke, {stats['device_overflows']} Geräte-Überläufe")
+    for subscription in service.subscriptions:
+        value = stats[subscription.name]
+        print(f"  {subscription.name:>7}: max. Rückstand {value['max_lag'] / device.sample_rate * 1000:.0f} ms, "
+              f"{value['dropped']} Samples verloren bei {value['overruns']} Überläufen")
+    for name, (received, _) in streams.items():
+        data = np.concatenate(received) if received else np.zeros(0, dtype=np.float32)
+        # without overruns the reader must have seen the input exactly, sample for sample
+        intact = len(data) == total and np.array_equal(data, device.samples)
+        print(f"  {name:>7}: {len(data)}/{total} Samples gelesen, {'unverändert' if intact else 'mit Lücken'}")
+    if analysis_times:
+        print(f"  Fenster + Chroma: {np.median(analysis_times) * 1000:.3f} ms im Median")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.chord_packs import read_pack_file
+from utils.chord_store import ChordStore
+from utils.gui_helpers import json_dumps_compact_lists
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert between the JSON chord file and the SQLite chord library.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="read a JSON chord file into a database")
+    import_parser.add_argument("json_file", help="e.g. chords/chord_db.json")
+    import_parser.add_argument("database", help="e.g. chords/chord_db.sqlite")
+
+    export_parser = commands.add_parser("export", help="write a database back to a JSON chord file")
+    export_parser.add_argument("database")
+    export_parser.add_argument("json_file")
+
+    search_parser = commands.add_parser("search", help="full-text search over chord names and notes")
+    search_parser.add_argument("database")
+    search_parser.add_argument("text")
+    args = parser.parse_args()
+
+    if args.command == "import":
+        data = read_pack_file(args.json_file)[1]
+        store = ChordStore(args.database)
+        count = store.import_data(data)
+        print(f"{count} Akkorde nach {args.database} importiert")
+    elif args.command == "export":
+        if not os.path.exists(args.database):
+            print(f"Datenbank '{args.database}' nicht gefunden")
+            sys.exit(1)
+        store = ChordStore(args.database)
+        with open(args.json_file, "w", encoding="utf-8") as f:
+            f.write(json_dumps_compact_lists(store.export_data()))
+        print(f"{store.count()} Akkorde nach {args.json_file} exportiert")
+    else:
+        store = ChordStore(args.database)
+        for difficulty, chord in store.search(args.text):
+            print(f"[{difficulty}] {chord['name']}: {'-'.join(chord['fingering'])}")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
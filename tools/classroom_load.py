@@ -0,0 +1,172 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.classroom_server import raise_file_limit
+from utils.websocket import OP_TEXT, connect, encode_frame, read_frame
+
+
+class SimulatedStudent:
+    """ One student connection: sends requests and notes when replies and broadcasts arrive. """
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.pending = {}       # request id -> future of the reply
+        self.broadcasts = {}    # broadcast seq -> perf_counter when it arrived
+        self.next_id = 0
+        self.task = asyncio.ensure_future(self.receive())
+
+    async def receive(self):
+        """Dispatch incoming messages until the connection closes."""
+        while True:
+            opcode, payload = await read_frame(self.reader)
+            if opcode != OP_TEXT:
+                continue
+            arrived = time.perf_counter()
+            message = json.loads(payload)
+            if message.get("type") == "broadcast" and "seq" in message and message.get("id") is None:
+                self.broadcasts[message["seq"]] = arrived
+            elif message.get("id") in self.pending:
+                self.pending.pop(message["id"]).set_result((arrived, message))
+
+    async def request(self, action, **fields):
+        """Send one request and return (round trip seconds, reply)."""
+        self.next_id += 1
+        future = asyncio.get_running_loop().create_future()
+        self.pending[self.next_id] = future
+        sent = time.perf_counter()
+        self.writer.write(encode_frame(json.dumps(dict(fields, action=action, id=self.next_id)), mask=True))
+        arrived, reply = await future
+        return arrived - sent, reply
+
+    def close(self):
+        self.task.cancel()
+        self.writer.close()
+
+
+async def practice(student, count, think, rng, round_trips, errors):
+    """A student clicking through chords on their own: 'next' and sometimes 'previous'."""
+    for _ in range(count):
+        await asyncio.sleep(rng.uniform(0, think))
+        action = "previous" if rng.random() < 0.2 else "next"
+        seconds, reply = await student.request(action)
+        round_trips.append(seconds)
+        if reply["type"] == "error" and reply["error"] != "no_more_back":
+            errors.append(reply["error"])
+
+
+def percentiles(values):
+    values = np.asarray(values) * 1000
+    return (f"p50 {np.percentile(values, 50):.2f} ms, p90 {np.percentile(values, 90):.2f} ms, "
+            f"p99 {np.percentile(values, 99):.2f} ms, max {values.max():.2f} ms")
+
+
+def start_server(port, difficulty):
+    """Run tools/classroom_server.py in its own process and wait until it listens."""
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "classroom_server.py")
+    process = subprocess.Popen([sys.executable, script, "--port", str(port), "--difficulty", difficulty,
+                                "--teacher-key", "", "--seed", "0"], stdout=subprocess.PIPE, text=True)
+    for line in process.stdout:
+        if "Klassenraum" in line:
+            return process
+    raise RuntimeError("Server ist nicht gestartet")
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def run(args):
+    rng = random.Random(args.seed)
+    connect_semaphore = asyncio.Semaphore(args.connect_batch)
+
+    async def join(index):
+        async with connect_semaphore:
+            reader, writer = await connect(args.host, args.port, f"/ws?name=student{index}")
+            await read_frame(reader)    # the chord shown on joining
+            return SimulatedStudent(reader, writer)
+
+    begin = time.perf_counter()
+    students = await asyncio.gather(*(join(i) for i in range(args.students)))
+    print(f"{len(students)} Schüler verbunden in {time.perf_counter() - begin:.2f} s")
+
+    # every student practices on their own at the same time
+    round_trips, errors = [], []
+    begin = time.perf_counter()
+    await asyncio.gather(*(practice(s, args.requests, args.think, random.Random(rng.random()), round_trips, errors)
+                           for s in students))
+    elapsed = time.perf_counter() - begin
+    print(f"Einzelanfragen: {len(round_trips)} in {elapsed:.2f} s ({len(round_trips) / elapsed:.0f}/s), "
+          f"{len(errors)} Fehler")
+    print(f"  Antwortzeit {percentiles(round_trips)}")
+
+    # the teacher changes the chord for the whole class
+    reader, writer = await connect(args.host, args.port, f"/ws/teacher?key={args.teacher_key}")
+    await read_frame(reader)    # status on joining
+    teacher = SimulatedStudent(reader, writer)
+    sent_at = {}
+    for _ in range(args.broadcasts):
+        seconds, reply = await teacher.request("next")
+        sent_at[reply["seq"]] = time.perf_counter() - seconds
+        await asyncio.sleep(args.broadcast_gap)
+    await asyncio.sleep(0.5)
+    fan_out, complete, missing = [], [], 0
+    for seq, sent in sent_at.items():
+        arrivals = [s.broadcasts[seq] - sent for s in students if seq in s.broadcasts]
+        missing += len(students) - len(arrivals)
+        fan_out.extend(arrivals)
+        if arrivals:
+            complete.append(max(arrivals))
+    print(f"Lehrer-Broadcasts: {len(sent_at)} an je {len(students)} Schüler, {missing} nicht angekommen")
+    if fan_out:
+        print(f"  Zustellzeit je Schüler {percentiles(fan_out)}")
+        print(f"  bis alle Schüler ihn haben {percentiles(complete)}")
+
+    teacher.close()
+    for student in students:
+        student.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test of the classroom server with simulated students.")
+    parser.add_argument("--students", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=20, help="requests per student")
+    parser.add_argument("--think", type=float, default=0.5, help="max. seconds between two requests of a student")
+    parser.add_argument("--broadcasts", type=int, default=20, help="chord changes sent by the teacher")
+    parser.add_argument("--broadcast-gap", type=float, default=0.25, help="seconds between two broadcasts")
+    parser.add_argument("--connect-batch", type=int, default=100, help="connections opened at the same time")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, help="test a running server instead of starting one")
+    parser.add_argument("--teacher-key", default="", help="teacher key of a running server")
+    parser.add_argument("--difficulty", default="easy")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"Bis zu {raise_file_limit()} offene Verbindungen möglich")
+    server = None
+    if args.port is None:
+        args.port = free_port()
+        server = start_server(args.port, args.difficulty)
+    try:
+        asyncio.run(run(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
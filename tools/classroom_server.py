@@ -0,0 +1,79 @@
+import argparse
+import asyncio
+import json
+import os
+import resource
+import secrets
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from utils.chord_packs import get_pack_library
+from utils.chord_store import get_chord_store
+from utils.classroom import ClassroomServer
+from utils.tunings import TUNINGS, get_tuning
+
+
+def load_library(path, pack_dir):
+    """Load all difficulties from a JSON chord file or SQLite library, with the chord packs merged on top."""
+    if path.endswith(".sqlite"):
+        data = get_chord_store(path).export_data()
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    if pack_dir and os.path.isdir(pack_dir):
+        library = get_pack_library(pack_dir, config.DISABLED_PACKS)
+        for pack, error in library.errors.items():
+            print(f"Akkordpaket {pack} übersprungen: {error}")
+        data = library.merge(data)
+    return data
+
+
+def raise_file_limit():
+    """Every student is an open socket; lift the soft limit on open files as far as allowed."""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if hard == resource.RLIM_INFINITY or soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard if hard != resource.RLIM_INFINITY else 65536, hard))
+    return resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+
+
+async def serve(args):
+    server = ClassroomServer(load_library(args.chords, args.packs), args.difficulty, get_tuning(args.tuning),
+                             timer_interval_ms=args.timer * 1000, teacher_key=args.teacher_key or None,
+                             seed=args.seed)
+    await server.start(args.host, args.port)
+    key = f"?key={args.teacher_key}" if args.teacher_key else ""
+    print(f"Klassenraum läuft: Schüler http://{args.host}:{server.port}/  "
+          f"Lehrer http://{args.host}:{server.port}/teacher{key}", flush=True)
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the classroom server: one trainer session per connected "
+                                                 "student, chord changes pushed by the teacher.")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (0.0.0.0 for the whole network)")
+    parser.add_argument("--port", type=int, default=8765, help="port, 0 for any free one")
+    parser.add_argument("--chords", default=config.CHORD_PATH, help="chord file (.json) or library (.sqlite)")
+    parser.add_argument("--packs", default=config.CHORD_PACK_DIR, help="chord pack directory")
+    parser.add_argument("--difficulty", default=config.DIFFICULTY)
+    parser.add_argument("--tuning", choices=list(TUNINGS), default="standard")
+    parser.add_argument("--timer", type=int, default=config.TIMER_INTERVAL_MS // 1000,
+                        help="default seconds per chord of the timers")
+    parser.add_argument("--teacher-key", default=secrets.token_urlsafe(8),
+                        help="key the teacher page needs (default: random); empty for none")
+    parser.add_argument("--seed", type=int, help="seed of the chord order")
+    args = parser.parse_args()
+
+    print(f"Bis zu {raise_file_limit()} offene Verbindungen möglich")
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
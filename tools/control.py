@@ -0,0 +1,74 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from single_instance import ControlClient, socket_path
+
+
+def percentiles(values):
+    values = np.asarray(values) * 1000
+    return (f"p50 {np.percentile(values, 50):.2f} ms, p90 {np.percentile(values, 90):.2f} ms, "
+            f"p99 {np.percentile(values, 99):.2f} ms, max {values.max():.2f} ms")
+
+
+def bench(client, count, command):
+    """Round trips over one open connection, as a foot pedal would send them."""
+    times = []
+    for _ in range(count):
+        start = time.perf_counter()
+        reply = client.send(command)
+        times.append(time.perf_counter() - start)
+        if reply.startswith("error"):
+            print(f"Antwort: {reply}")
+            break
+    return times
+
+
+def bench_launch(count):
+    """Wall time of `python main.py ping` while a trainer runs: start, hand over, exit."""
+    main = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+    times = []
+    for _ in range(count):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, main, "ping"], check=True)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Send commands to the running trainer through its control socket "
+                                                 "or measure how fast they are carried out.")
+    parser.add_argument("command", nargs="*", help="e.g. next, previous, show Am, timer on, difficulty hard")
+    parser.add_argument("--socket", default=None, help=f"socket path (default: {socket_path()})")
+    parser.add_argument("--bench", type=int, metavar="N",
+                        help="send the command (default: ping) N times and show the round trip times")
+    parser.add_argument("--launches", type=int, metavar="N",
+                        help="time N launches of main.py that hand a command to the running trainer")
+    args = parser.parse_args()
+
+    try:
+        client = ControlClient(args.socket)
+    except OSError:
+        print(f"Kein laufender Trainer an {args.socket or socket_path()}")
+        sys.exit(1)
+    command = " ".join(args.command)
+    try:
+        if args.bench:
+            times = bench(client, args.bench, command or "ping")
+            print(f"{len(times)} Befehle '{command or 'ping'}' über eine Verbindung: {percentiles(times)}")
+        elif command:
+            print(client.send(command))
+    finally:
+        client.close()
+    if args.launches:
+        print(f"{args.launches} Starts von main.py mit Übergabe: {percentiles(bench_launch(args.launches))}")
+
+
+if __name__ == "__main__":
+    main()
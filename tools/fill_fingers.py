@@ -0,0 +1,60 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.chord_packs import pack_file_data, read_pack_file
+from utils.finger_solver import solve_many, verify_many
+from utils.gui_helpers import json_dumps_compact_lists
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fill in or verify the finger numbers of a chord pack.")
+    parser.add_argument("input", help="chord pack to read, e.g. chords/chord_db.json")
+    parser.add_argument("-o", "--output", help="file to write the completed pack to (default: only report)")
+    parser.add_argument("--check", action="store_true", help="only verify existing finger numbers against the solver")
+    parser.add_argument("--overwrite", action="store_true", help="replace existing finger numbers with the solver result")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes for large packs")
+    args = parser.parse_args()
+
+    meta, data = read_pack_file(args.input)
+
+    chords = [(level, chord) for level, level_chords in data.items() for chord in level_chords]
+
+    if args.check:
+        results = verify_many([(chord.get("fingering", []), chord.get("fingers", [])) for _, chord in chords],
+                              workers=args.workers)
+        problems = 0
+        for (level, chord), (found, suggestion) in zip(chords, results):
+            for problem, string in found:
+                where = "" if string is None else f" auf Saite {string + 1}"
+                print(f"[{level}] {chord['name']}: {problem}{where}")
+                problems += 1
+            if suggestion:
+                print(f"[{level}] {chord['name']}: Vorschlag {' '.join(suggestion)}")
+        print(f"{problems} Probleme in {len(chords)} Akkorden gefunden")
+        sys.exit(1 if problems else 0)
+
+    missing = [(level, chord) for level, chord in chords
+               if args.overwrite or not chord.get("fingers") or all(f.strip() in {"0", "?", "???"} for f in chord["fingers"])]
+    solutions = solve_many([chord.get("fingering", []) for _, chord in missing], workers=args.workers)
+
+    filled = 0
+    for (level, chord), fingers in zip(missing, solutions):
+        if fingers is None:
+            print(f"[{level}] {chord['name']}: nicht spielbar, Fingersatz bleibt unveraendert")
+            continue
+        if chord.get("fingers") != fingers:
+            chord["fingers"] = fingers
+            filled += 1
+    print(f"{filled} von {len(chords)} Akkorden ergaenzt")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(json_dumps_compact_lists(pack_file_data(meta, data)))
+        print(f"Gespeichert in {args.output}")
+
+
+if __name__ == "__main__":
+    main()
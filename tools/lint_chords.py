@@ -0,0 +1,50 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.chord_lint import lint_packs, load_cache, save_cache
+from utils.chord_packs import read_pack_file
+from utils.tunings import TUNINGS
+
+CACHE_FILE = ".chord_lint_cache.json"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check chord packs for music theory mistakes and duplicate voicings.")
+    parser.add_argument("inputs", nargs="+", help="chord packs to check, e.g. chords/chord_db.json")
+    parser.add_argument("--report", help="file to write the JSON report to (default: stdout)")
+    parser.add_argument("--cache", default=CACHE_FILE, help="cache file with results of earlier runs")
+    parser.add_argument("--no-cache", action="store_true", help="check every chord again")
+    parser.add_argument("--tuning", default="standard", choices=sorted(TUNINGS))
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    args = parser.parse_args()
+
+    packs = {}
+    for path in args.inputs:
+        packs[path] = read_pack_file(path)[1]
+
+    cache = {} if args.no_cache else load_cache(args.cache)
+    start = time.perf_counter()
+    report, checked = lint_packs(packs, TUNINGS[args.tuning], cache, args.workers)
+    elapsed = time.perf_counter() - start
+    if not args.no_cache:
+        save_cache(args.cache, cache)
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    errors = sum(1 for issue in report if issue["severity"] == "error")
+    print(f"{len(report)} Probleme ({errors} Fehler), {checked} Akkorde neu geprueft in {elapsed:.2f}s", file=sys.stderr)
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.chord_diff import diff_chord_data, field_changes, merge_chord_data
+from utils.chord_packs import pack_file_data, read_pack_file
+from utils.gui_helpers import json_dumps_compact_lists
+
+
+def load_pack(path):
+    # the _pack metadata entry is not a difficulty level
+    return read_pack_file(path)
+
+
+def format_value(value):
+    if isinstance(value, list):
+        return "-".join(str(v) for v in value)
+    return json.dumps(value, ensure_ascii=False)
+
+
+def print_diff(diffs):
+    for level, diff in diffs.items():
+        print(f"[{level}]")
+        for chord in diff.removed:
+            print(f"  - {chord.get('name', '')}")
+        for chord in diff.added:
+            print(f"  + {chord.get('name', '')}")
+        for old, new in diff.changed:
+            name = new.get("name", "")
+            if old.get("name") != name:
+                name = f"{old.get('name', '')} -> {name}"
+            print(f"  ~ {name}")
+            for field, (before, after) in field_changes(old, new).items():
+                if field != "name":
+                    print(f"      {field}: {format_value(before)} -> {format_value(after)}")
+
+
+def print_conflicts(conflicts):
+    for conflict in conflicts:
+        if conflict.ours is None or conflict.theirs is None:
+            side = "bei uns" if conflict.ours is None else "bei ihnen"
+            print(f"KONFLIKT [{conflict.level}] {conflict.name}: {side} gelöscht, auf der anderen Seite geändert")
+            continue
+        print(f"KONFLIKT [{conflict.level}] {conflict.name}")
+        base = conflict.base or {}
+        for field in conflict.fields:
+            print(f"      {field}: Basis {format_value(base.get(field))}, "
+                  f"unsere {format_value(conflict.ours.get(field))}, "
+                  f"ihre {format_value(conflict.theirs.get(field))}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare and merge chord packs by chord identity instead of text lines.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    diff_parser = commands.add_parser("diff", help="show added, removed and changed chords")
+    diff_parser.add_argument("old", help="e.g. chords/chord_db.json")
+    diff_parser.add_argument("new")
+
+    merge_parser = commands.add_parser("merge", help="three-way merge of two edited copies of a pack")
+    merge_parser.add_argument("base", help="the version both copies started from")
+    merge_parser.add_argument("ours")
+    merge_parser.add_argument("theirs")
+    merge_parser.add_argument("-o", "--output", required=True, help="file to write the merged pack to")
+    merge_parser.add_argument("--prefer", choices=["ours", "theirs"], default="ours",
+                              help="whose values conflicting fields keep and whose chord order is used")
+    merge_parser.add_argument("--conflicts", help="write the conflicts as JSON to this file")
+    args = parser.parse_args()
+
+    if args.command == "diff":
+        (old_meta, old), (new_meta, new) = load_pack(args.old), load_pack(args.new)
+        diffs = diff_chord_data(old, new)
+        print_diff(diffs)
+        if old_meta != new_meta:
+            print(f"Paket-Metadaten: {format_value(old_meta)} -> {format_value(new_meta)}")
+        added = sum(len(d.added) for d in diffs.values())
+        changed = sum(len(d.changed) for d in diffs.values())
+        removed = sum(len(d.removed) for d in diffs.values())
+        print(f"{added} hinzugefügt, {changed} geändert, {removed} entfernt")
+        sys.exit(1 if diffs or old_meta != new_meta else 0)
+
+    (base_meta, base), (our_meta, ours), (their_meta, theirs) = (load_pack(args.base), load_pack(args.ours),
+                                                                 load_pack(args.theirs))
+    # metadata is merged like a single value: a side that changed it wins, with both changed the preferred one
+    preferred, other = (their_meta, our_meta) if args.prefer == "theirs" else (our_meta, their_meta)
+    meta = other if preferred == base_meta else preferred
+    if args.prefer == "theirs":
+        merged, conflicts = merge_chord_data(base, theirs, ours)
+        conflicts = [c._replace(ours=c.theirs, theirs=c.ours) for c in conflicts]
+    else:
+        merged, conflicts = merge_chord_data(base, ours, theirs)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.write(json_dumps_compact_lists(pack_file_data(meta, merged)))
+    if args.conflicts:
+        with open(args.conflicts, "w", encoding="utf-8") as f:
+            json.dump([c._asdict() for c in conflicts], f, ensure_ascii=False, indent=4)
+
+    print_conflicts(conflicts)
+    total = sum(len(chords) for chords in merged.values())
+    print(f"{total} Akkorde nach {args.output} geschrieben, {len(conflicts)} Konflikte")
+    sys.exit(1 if conflicts else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.metronome import STRUM_PATTERNS, RhythmEngine
+from utils.synth import SAMPLE_RATE, write_wav
+from utils.tunings import TUNINGS, get_tuning
+
+
+def click_onsets(samples, threshold=0.05):
+    """Sample positions where a click starts after silence."""
+    loud = np.abs(samples) > threshold
+    starts = np.flatnonzero(loud[1:] & ~loud[:-1]) + 1
+    if len(loud) and loud[0]:
+        starts = np.concatenate([[0], starts])
+    # a click rings for a few ms; only the first crossing of each click counts
+    gap = int(0.05 * SAMPLE_RATE)
+    keep = np.concatenate([[True], np.diff(starts) > gap]) if len(starts) else starts.astype(bool)
+    return starts[keep]
+
+
+def measure_engine(bpm, seconds):
+    """Click jitter of the audio engine, rendered in randomly sized blocks like a real driver."""
+    engine = RhythmEngine(bpm, pattern="clicks")
+    rng = random.Random(0)
+    total = int(seconds * SAMPLE_RATE)
+    blocks = []
+    rendered = 0
+    while rendered < total:
+        size = min(rng.choice([64, 128, 256, 441, 512, 1024]), total - rendered)
+        blocks.append(engine.render(size))
+        rendered += size
+    onsets = click_onsets(np.concatenate(blocks))
+    beat = SAMPLE_RATE * 60.0 / bpm
+    expected = onsets[0] + np.round(np.arange(len(onsets)) * beat)
+    return (onsets - expected) / SAMPLE_RATE * 1000
+
+
+def measure_tk_after(bpm, seconds):
+    """Beat jitter of a Tk after() loop, the way the chord timer is scheduled."""
+    interval = 60.0 / bpm
+    stamps = []
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+        root.withdraw()
+    except Exception:
+        root = None
+
+    if root is not None:
+        def tick():
+            stamps.append(time.perf_counter())
+            if len(stamps) * interval < seconds:
+                root.after(int(interval * 1000), tick)
+            else:
+                root.quit()
+        root.after(0, tick)
+        root.mainloop()
+        root.destroy()
+        source = "Tk after()"
+    else:
+        # no display: a timer thread has the same problem of waking up late
+        done = threading.Event()
+        while len(stamps) * interval < seconds:
+            stamps.append(time.perf_counter())
+            done.wait(interval)
+        source = "Timer-Thread (kein Display für Tk)"
+    stamps = np.array(stamps)
+    expected = stamps[0] + np.arange(len(stamps)) * interval
+    return (stamps - expected) * 1000, source
+
+
+def print_stats(title, deviations_ms):
+    deviations = np.abs(deviations_ms)
+    print(f"{title}: {len(deviations)} Schläge, mittlere Abweichung {deviations.mean():.3f} ms, "
+          f"95% {np.percentile(deviations, 95):.3f} ms, max {deviations.max():.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render the metronome track or measure its timing.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    render_parser = commands.add_parser("render", help="write a metronome and strum track to a WAV file")
+    render_parser.add_argument("output", help="WAV file")
+    render_parser.add_argument("--bpm", type=float, default=80)
+    render_parser.add_argument("--seconds", type=float, default=16)
+    render_parser.add_argument("--pattern", choices=list(STRUM_PATTERNS), default="folk")
+    render_parser.add_argument("--fingerings", default="0-0-0-3,0-0-0-0,2-0-1-0,0-2-3-2",
+                               help="comma-separated fingerings changed every bar")
+    render_parser.add_argument("--tuning", choices=list(TUNINGS), default="standard")
+
+    jitter_parser = commands.add_parser("jitter", help="compare the audio clock with a Tk after() timer")
+    jitter_parser.add_argument("--bpm", type=float, default=120)
+    jitter_parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+
+    if args.command == "render":
+        tuning = get_tuning(args.tuning)
+        voicings = [tuning.pitches(f.split("-")) for f in args.fingerings.split(",")]
+        engine = RhythmEngine(args.bpm, bars_per_chord=1, pattern=args.pattern, pitches=voicings[0])
+        blocks = []
+        index = 0
+        for start in range(0, int(args.seconds * SAMPLE_RATE), 256):
+            engine.queue_chord(index + 1, voicings[(index + 1) % len(voicings)])
+            blocks.append(engine.render(256))
+            while not engine.events.empty():
+                change = engine.events.get_nowait()
+                index = change.payload
+                print(f"Akkordwechsel bei Sample {change.sample} ({change.sample / SAMPLE_RATE:.3f} s)")
+        write_wav(args.output, np.concatenate(blocks))
+        print(f"{args.seconds:g} s nach {args.output} gerendert")
+    else:
+        print_stats("Audio-Takt", measure_engine(args.bpm, args.seconds))
+        deviations, source = measure_tk_after(args.bpm, args.seconds)
+        print_stats(source, deviations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from utils.practice_log import PracticeLog
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show statistics from the practice log.")
+    parser.add_argument("--log", default=config.PRACTICE_LOG_PATH, help="practice log database")
+    parser.add_argument("--days", type=int, help="only count the last N days")
+    parser.add_argument("--weakest", type=int, default=10, help="number of slowest chords to list")
+    parser.add_argument("--min-shown", type=int, default=3, help="ignore chords practiced fewer times")
+    parser.add_argument("--chord", help="show the weekly progress of one chord only")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.log):
+        print(f"Übungsprotokoll '{args.log}' nicht gefunden")
+        sys.exit(1)
+    log = PracticeLog(args.log)
+    since = time.time() - args.days * 86400 if args.days else None
+
+    stats = log.chord_stats(since)
+    print(f"{sum(row[1] for row in stats)} Akkorde geübt, {len(stats)} verschiedene")
+
+    print("\nLangsamste Akkorde:")
+    for chord, shown, mean in log.weakest_chords(args.weakest, args.min_shown, since):
+        print(f"  {chord:<12} {mean:6.1f} s  ({shown}x)")
+
+    print(f"\nFortschritt pro Woche{f' ({args.chord})' if args.chord else ''}:")
+    for week, shown, mean in log.weekly_progress(args.chord):
+        print(f"  {week}  {shown:5}x  {mean:6.1f} s")
+    log.close()
+
+
+if __name__ == "__main__":
+    main()
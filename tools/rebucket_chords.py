@@ -0,0 +1,35 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.chord_packs import pack_file_data, read_pack_file
+from utils.difficulty import DEFAULT_THRESHOLDS, rebucket
+from utils.gui_helpers import json_dumps_compact_lists
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sort chords into easy/medium/hard by their computed difficulty score.")
+    parser.add_argument("input", help="chord pack to read, e.g. chords/chord_db.json")
+    parser.add_argument("-o", "--output", help="file to write the re-bucketed pack to (default: only report)")
+    parser.add_argument("--easy-below", type=float, default=DEFAULT_THRESHOLDS[0])
+    parser.add_argument("--medium-below", type=float, default=DEFAULT_THRESHOLDS[1])
+    args = parser.parse_args()
+
+    meta, data = read_pack_file(args.input)
+
+    new_data, moves = rebucket(data, (args.easy_below, args.medium_below))
+
+    for name, old_level, new_level, score in moves:
+        print(f"{name}: {old_level} -> {new_level} (Score {score:.2f})")
+    print(f"{len(moves)} Akkorde wuerden verschoben")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(json_dumps_compact_lists(pack_file_data(meta, new_data)))
+        print(f"Gespeichert in {args.output}")
+
+
+if __name__ == "__main__":
+    main()
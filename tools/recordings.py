@@ -0,0 +1,106 @@
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from utils.audio_capture import CaptureService, FileDevice
+from utils.recorder import RECORDING_FORMATS, PracticeRecorder, find_chord, load_recording, read_recording
+from utils.synth import SAMPLE_RATE, write_wav
+
+
+def format_time(seconds):
+    return f"{int(seconds // 60):02d}:{seconds % 60:06.3f}"
+
+
+def soak(directory, audio_format, minutes, speed):
+    """Record a looped test signal at `speed` times real time and watch the memory of the recorder."""
+    signal = (np.sin(2 * np.pi * 220 * np.arange(SAMPLE_RATE) / SAMPLE_RATE) * 0.3).astype(np.float32)
+    service = CaptureService(FileDevice(signal, loop=True, speed=speed))
+    tracemalloc.start()
+    service.start()
+    recorder = PracticeRecorder(service, directory, audio_format, chunk_seconds=config.RECORDING_CHUNK_SECONDS)
+    recorder.start()
+    total = minutes * 60 * SAMPLE_RATE
+    peaks = []
+    chords = ["C", "F", "G7", "Am"]
+    index = 0
+    while recorder.recorded < total:
+        recorder.mark(chords[index % len(chords)], "timer")
+        index += 1
+        time.sleep(5 / speed)
+        peaks.append(tracemalloc.get_traced_memory()[0])
+        print(f"\r{format_time(recorder.recorded / SAMPLE_RATE)} aufgenommen, "
+              f"{peaks[-1] / 1e6:.2f} MB belegt", end="", flush=True)
+    recorder.stop()
+    service.stop()
+    stats = service.stats()
+    print()
+    print(f"Speicher: Anfang {peaks[0] / 1e6:.2f} MB, Ende {peaks[-1] / 1e6:.2f} MB, "
+          f"Spitze {tracemalloc.get_traced_memory()[1] / 1e6:.2f} MB")
+    print(f"Verlorene Samples: {sum(v['dropped'] for v in stats.values() if isinstance(v, dict))}, "
+          f"{index} Akkordwechsel, Aufnahme in {recorder.directory}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List, search and cut practice recordings by the chords shown.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = commands.add_parser("list", help="show the chord changes of a recording")
+    list_parser.add_argument("recording", help="session folder of the recording")
+
+    find_parser = commands.add_parser("find", help="show where a chord was practiced")
+    find_parser.add_argument("recording")
+    find_parser.add_argument("chord")
+
+    extract_parser = commands.add_parser("extract", help="write the audio of one chord to a WAV file")
+    extract_parser.add_argument("recording")
+    extract_parser.add_argument("chord")
+    extract_parser.add_argument("-o", "--output", required=True)
+    extract_parser.add_argument("--occurrence", type=int, default=1, help="which time the chord was shown, from 1")
+
+    soak_parser = commands.add_parser("soak", help="record a long simulated session and watch memory use")
+    soak_parser.add_argument("--directory", default=config.RECORDING_DIR)
+    soak_parser.add_argument("--format", choices=RECORDING_FORMATS, default="wav")
+    soak_parser.add_argument("--minutes", type=float, default=60)
+    soak_parser.add_argument("--speed", type=float, default=60, help="times faster than real time")
+    args = parser.parse_args()
+
+    if args.command == "soak":
+        soak(args.directory, args.format, args.minutes, args.speed)
+        return
+
+    header, changes, gaps = load_recording(args.recording)
+    if args.command == "list":
+        print(f"{header['format'].upper()}, {header['sample_rate']} Hz, {len(changes)} Akkordwechsel, {len(gaps)} Lücken")
+        for change in changes:
+            print(f"{format_time(change['time'])}  {change['chord']:<10} ({change['advanced_by']})")
+        for gap in gaps:
+            print(f"Lücke bei {format_time(gap['gap'])}: {gap['lost_seconds']} s verloren")
+        return
+
+    matches = find_chord(changes, args.chord)
+    if not matches:
+        print(f"Akkord '{args.chord}' kommt in der Aufnahme nicht vor")
+        sys.exit(1)
+    if args.command == "find":
+        for match in matches:
+            end = format_time(match["end"]) if match["end"] is not None else "Ende"
+            print(f"{format_time(match['time'])} - {end}  Teil {match['part']}")
+        return
+
+    if not 1 <= args.occurrence <= len(matches):
+        parser.error(f"--occurrence muss zwischen 1 und {len(matches)} liegen")
+    match = matches[args.occurrence - 1]
+    samples, sample_rate = read_recording(args.recording, match["time"], match["end"])
+    write_wav(args.output, samples, sample_rate)
+    print(f"{len(samples) / sample_rate:.1f} s von {args.chord} nach {args.output} geschrieben")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from utils.chord_keys import ChordKeyIndex
+from utils.chord_packs import read_pack_file
+from utils.synth import STRUM_PATTERNS, render_chord, write_wav
+from utils.tunings import TUNINGS, chord_fingering, get_tuning
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render a chord with the plucked-string synthesizer to a WAV file.")
+    parser.add_argument("chord", nargs="?", help="chord name from the chord file, e.g. Am7")
+    parser.add_argument("-o", "--output", required=True, help="WAV file to write")
+    parser.add_argument("--fingering", help="render this fingering instead, e.g. 0-0-0-3")
+    parser.add_argument("--chords", default=config.CHORD_PATH, help="chord file to look the name up in")
+    parser.add_argument("--pattern", choices=list(STRUM_PATTERNS), default="down")
+    parser.add_argument("--duration", type=float, default=2.0, help="seconds")
+    parser.add_argument("--tuning", choices=list(TUNINGS), default="standard")
+    args = parser.parse_args()
+
+    tuning = get_tuning(args.tuning)
+    if args.fingering:
+        fingering = args.fingering.split("-")
+    elif args.chord:
+        data = read_pack_file(args.chords)[1]
+        chord = ChordKeyIndex(c for level in data.values() for c in level).get(args.chord)
+        if chord is None:
+            print(f"Akkord '{args.chord}' nicht gefunden")
+            sys.exit(1)
+        fingering = chord_fingering(chord, tuning)[0]
+    else:
+        parser.error("Akkordname oder --fingering angeben")
+
+    start = time.perf_counter()
+    samples = render_chord(tuple(tuning.pitches(fingering)), args.pattern, args.duration)
+    elapsed = (time.perf_counter() - start) * 1000
+    write_wav(args.output, samples)
+    print(f"{'-'.join(fingering)} nach {args.output} gerendert ({elapsed:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.chord_packs import pack_file_data, read_pack_file
+from utils.gui_helpers import json_dumps_compact_lists
+from utils.transpose import transpose_chords
+from utils.tunings import TUNINGS, get_tuning
+
+
+def transpose_pack(data, semitones, capo=False, tuning=None, spelling="auto"):
+    # every difficulty level is transposed on its own so the grouping stays the same
+    return {
+        level: transpose_chords(chords, semitones, capo=capo, tuning=tuning, spelling=spelling)
+        for level, chords in data.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transpose every chord of a chord pack.")
+    parser.add_argument("input", help="chord pack to read, e.g. chords/chord_db.json")
+    parser.add_argument("output", help="file to write the transposed pack to")
+    parser.add_argument("semitones", type=int, help="semitones to transpose by (capo fret with --capo)")
+    parser.add_argument("--capo", action="store_true", help="keep the shapes and only rename them")
+    parser.add_argument("--spelling", choices=["auto", "sharps", "flats"], default="auto")
+    parser.add_argument("--tuning", choices=list(TUNINGS), default="standard")
+    args = parser.parse_args()
+
+    meta, data = read_pack_file(args.input)
+
+    result = transpose_pack(data, args.semitones, args.capo, get_tuning(args.tuning), args.spelling)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.write(json_dumps_compact_lists(pack_file_data(meta, result)))
+
+    before = sum(len(chords) for chords in data.values())
+    after = sum(len(chords) for chords in result.values())
+    print(f"{after} von {before} Akkorden transponiert, {before - after} passen nicht aufs Griffbrett")
+
+
+if __name__ == "__main__":
+    main()
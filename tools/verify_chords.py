@@ -0,0 +1,143 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from utils.audio_capture import AudioRing
+from utils.chord_keys import name_key
+from utils.chroma import ChordVerifier, ChromaAnalyzer, chord_tones
+from utils.synth import SAMPLE_RATE, read_wav, render_chord, write_wav
+from utils.tunings import TUNINGS, chord_fingering, get_tuning
+
+
+MANIFEST = "fixtures.json"
+BLOCK = 1024   # samples per simulated capture callback
+
+
+def load_chords(path):
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    unique = {}
+    for chord in (c for level in data.values() for c in level):
+        unique.setdefault(name_key(chord["name"]), chord)
+    return list(unique.values())
+
+
+def make_fixtures(chords, directory, tuning, lead, noise):
+    """Render one WAV per chord: `lead` seconds of noise, then the strummed chord over the noise."""
+    os.makedirs(directory, exist_ok=True)
+    rng = np.random.default_rng(0)
+    entries = []
+    for index, chord in enumerate(chords):
+        strum = render_chord(tuple(tuning.pitches(chord_fingering(chord, tuning)[0])))
+        samples = np.concatenate([np.zeros(int(lead * SAMPLE_RATE), dtype=np.float32), strum])
+        samples += rng.normal(0, noise, len(samples)).astype(np.float32)
+        name = f"{index:03d}_{''.join(c if c.isalnum() else '_' for c in chord['name'])}.wav"
+        write_wav(os.path.join(directory, name), samples)
+        entries.append({"file": name, "name": chord["name"], "chord_notes": chord.get("chord_notes", []), "onset": lead})
+    with open(os.path.join(directory, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(entries, f, indent=2, ensure_ascii=False)
+    return entries
+
+
+def stream_fixture(samples, sample_rate, verifiers, hop):
+    """
+    Feed a recording through the same path as the app: capture blocks into a
+    ring, analyze the newest window every `hop` samples.
+
+    Returns the sample position each verifier first fired at (or None) and the
+    seconds spent on what the app does per interval: one analysis and the
+    check of the first verifier.
+    """
+    analyzer = ChromaAnalyzer(sample_rate)
+    ring = AudioRing(int(sample_rate * 2))
+    fired = [None] * len(verifiers)
+    next_analysis = hop
+    spent = 0.0
+    analyses = 0
+    for start in range(0, len(samples), BLOCK):
+        ring.write(samples[start:start + BLOCK])
+        while next_analysis <= ring.written:
+            begin = time.perf_counter()
+            chroma, rms = analyzer.analyze(ring.latest(analyzer.window))
+            results = [verifiers[0].feed(chroma, rms)]
+            spent += time.perf_counter() - begin
+            results += [verifier.feed(chroma, rms) for verifier in verifiers[1:]]
+            for index, result in enumerate(results):
+                if result and fired[index] is None:
+                    fired[index] = next_analysis
+            analyses += 1
+            next_analysis += hop
+    return fired, spent, analyses
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure accuracy and latency of the microphone chord check on WAV fixtures.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    render_parser = commands.add_parser("render", help="render synthetic WAV fixtures and their manifest")
+    render_parser.add_argument("directory")
+    render_parser.add_argument("--chords", default=config.CHORD_PATH, help="chord file to render")
+    render_parser.add_argument("--tuning", choices=list(TUNINGS), default="standard")
+    render_parser.add_argument("--lead", type=float, default=0.5, help="seconds before the strum")
+    render_parser.add_argument("--noise", type=float, default=0.003, help="standard deviation of added noise")
+
+    evaluate_parser = commands.add_parser("evaluate", help="stream the fixtures of a manifest through the chord check")
+    evaluate_parser.add_argument("directory", help=f"directory with WAV files and {MANIFEST} "
+                                                   "(entries: file, name, chord_notes, onset in seconds)")
+    evaluate_parser.add_argument("--interval-ms", type=int, default=config.LISTEN_INTERVAL_MS,
+                                 help="time between two analyses")
+    args = parser.parse_args()
+
+    if args.command == "render":
+        entries = make_fixtures(load_chords(args.chords), args.directory, get_tuning(args.tuning), args.lead, args.noise)
+        print(f"{len(entries)} Fixtures nach {args.directory} geschrieben")
+        return
+
+    with open(os.path.join(args.directory, MANIFEST), "r", encoding="utf-8") as f:
+        entries = json.load(f)
+    # every fixture is also checked against the other chords, except those whose notes it contains anyway
+    candidates = {tuple(chord_tones(e["chord_notes"])): e["chord_notes"] for e in entries}
+
+    detected = 0
+    false_positives = 0
+    checks = 0
+    latencies = []
+    spent = 0.0
+    analyses = 0
+    for entry in entries:
+        samples, sample_rate = read_wav(os.path.join(args.directory, entry["file"]))
+        tones = set(chord_tones(entry["chord_notes"]))
+        others = [notes for key, notes in candidates.items() if not set(key) <= tones]
+        verifiers = [ChordVerifier(entry["chord_notes"])] + [ChordVerifier(notes) for notes in others]
+        hop = int(sample_rate * args.interval_ms / 1000)
+        fired, seconds, count = stream_fixture(samples, sample_rate, verifiers, hop)
+        spent += seconds
+        analyses += count
+        if fired[0] is not None:
+            detected += 1
+            latencies.append((fired[0] / sample_rate - entry.get("onset", 0.0)) * 1000)
+        else:
+            print(f"nicht erkannt: {entry['name']} ({entry['file']})")
+        false_positives += sum(f is not None for f in fired[1:])
+        checks += len(fired) - 1
+
+    print(f"Erkannt: {detected}/{len(entries)}")
+    print(f"Falsch erkannt: {false_positives}/{checks} Prüfungen gegen andere Akkorde")
+    if latencies:
+        latencies = np.array(latencies)
+        print(f"Latenz ab Anschlag: Median {np.median(latencies):.0f} ms, 95% {np.percentile(latencies, 95):.0f} ms")
+    if analyses:
+        per_analysis = spent / analyses
+        print(f"{analyses} Analysen, ca. {per_analysis * 1e3:.3f} ms pro Analyse "
+              f"(~{1 / per_analysis:.0f} pro Sekunde möglich, App: {1000 // args.interval_ms} pro Sekunde)")
+
+
+if __name__ == "__main__":
+    main()
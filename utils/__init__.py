@@ -1,6 +1,28 @@
 from .font_utils import set_font
-from .gui_helpers import load_chords, show_info, show_tutorial, open_github, load_config, save_config
+from .gui_helpers import load_chords, show_info, show_tutorial, show_practice_stats, open_github, load_config, save_config
 from .lang_utils import get_system_language, load_language
 from .discord_presence import DiscordRichPresence
+from .chord_theory import ChordIndex
+from .voicing_generator import generate_voicings
+from .tunings import TUNINGS, get_tuning, chord_fingering
+from .finger_solver import solve_fingers, check_fingers
+from .chord_lint import lint_packs
+from .chord_keys import ChordKeyIndex, chord_key, name_key
+from .chord_parser import parse_chord_symbol
+from .chord_store import ChordStore
+from .chord_packs import get_pack_library, read_pack_file
+from .chord_diff import diff_chords, diff_chord_data, merge_chord_data
+from .file_watcher import FileWatcher
+from .tk_queue import TkCallQueue
+from .practice_log import PracticeLog
+from .quiz import ChordQuiz, ReactionHistogram
+from .synth import render_chord, write_wav
+from .metronome import RhythmEngine
+from .chroma import ChromaAnalyzer, ChordVerifier
+from .pitch import PitchDetector, tuner_reading
+from .audio_capture import CaptureService, FileDevice
+from .session_engine import TrainerSession
+from .classroom import ClassroomServer
+from .tracing import Tracer, tracer, span, count, traced, start_from_environment
 
-__all__ = ["set_font", "load_chords", "show_info", "show_tutorial", "open_github", "get_system_language", "load_language", "load_config", "save_config", "DiscordRichPresence"]
+__all__ = ["set_font", "load_chords", "show_info", "show_tutorial", "show_practice_stats", "open_github", "get_system_language", "load_language", "load_config", "save_config", "DiscordRichPresence", "ChordIndex", "generate_voicings", "TUNINGS", "get_tuning", "chord_fingering", "solve_fingers", "check_fingers", "lint_packs", "ChordKeyIndex", "chord_key", "name_key", "parse_chord_symbol", "ChordStore", "get_pack_library", "read_pack_file", "diff_chords", "diff_chord_data", "merge_chord_data", "FileWatcher", "TkCallQueue", "PracticeLog", "ChordQuiz", "ReactionHistogram", "render_chord", "write_wav", "RhythmEngine", "ChromaAnalyzer", "ChordVerifier", "PitchDetector", "tuner_reading", "CaptureService", "FileDevice", "TrainerSession", "ClassroomServer", "Tracer", "tracer", "span", "count", "traced", "start_from_environment"]
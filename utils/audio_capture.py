@@ -0,0 +1,419 @@
+import threading
+import time
+import numpy as np
+import pyaudio
+from utils.synth import SAMPLE_RATE, read_wav
+
+
+FRAMES_PER_BUFFER = 1024   # ~23 ms at 44.1 kHz per callback
+RING_SECONDS = 5.0         # covers a speech request to the recognition API without dropping audio
+
+
+class AudioRing:
+    """
+    Fixed-size ring of the most recent float32 samples.
+
+    The buffer is allocated once, twice as long as the ring, and every sample
+    is stored at its position and again one ring length further. Any stretch
+    of up to `size` samples is therefore contiguous in memory and can be
+    handed out as a view without copying, even across the wrap-around.
+    write() is called from the audio thread and only copies into the buffer.
+    """
+
+    def __init__(self, size):
+        """
+        Args:
+            size (int): Samples kept.
+        """
+        self.size = size
+        self._buffer = np.zeros(2 * size, dtype=np.float32)
+        self.written = 0    # samples written since the start; the write position is written % size
+
+    def write(self, samples):
+        """
+        Append samples, overwriting the oldest ones.
+
+        Args:
+            samples (np.ndarray): float32 samples.
+        """
+        size = self.size
+        skipped = max(0, len(samples) - size)
+        samples = samples[skipped:]
+        self.written += skipped
+        start = self.written % size
+        first = min(len(samples), size - start)
+        rest = len(samples) - first
+        self._buffer[start:start + first] = samples[:first]
+        self._buffer[start + size:start + size + first] = samples[:first]
+        self._buffer[:rest] = samples[first:]
+        self._buffer[size:size + rest] = samples[first:]
+        self.written += len(samples)
+
+    def view(self, position, count):
+        """
+        Return samples as a read-only view into the ring, without copying.
+
+        The view stays valid until the writer gets around the ring, i.e. for
+        size - (written - position) more samples; see intact().
+
+        Args:
+            position (int): Absolute sample position of the first sample.
+            count (int): Number of samples; at most the ring size.
+
+        Returns:
+            memoryview: float32 samples.
+        """
+        start = position % self.size
+        view = memoryview(self._buffer[start:start + count])
+        return view.toreadonly()
+
+    def intact(self, position):
+        """
+        Check whether samples from an absolute position on are still in the ring.
+
+        Args:
+            position (int): Absolute sample position.
+
+        Returns:
+            bool: False once they have been overwritten.
+        """
+        return self.written - position <= self.size
+
+    def latest(self, count):
+        """
+        Return a copy of the newest samples, oldest first.
+
+        Args:
+            count (int): Number of samples; at most the ring size.
+
+        Returns:
+            np.ndarray: float32 samples, zero-padded at the front while fewer have
+                been written.
+        """
+        count = min(count, self.size)
+        out = np.array(self.view(self.written - count, count), dtype=np.float32)
+        if self.written < count:
+            out[:count - self.written] = 0
+        return out
+
+
+class Subscription:
+    """
+    One consumer of a CaptureService with its own read cursor.
+
+    Streaming consumers (speech, recording) call read() and get every sample
+    once; when they fall more than a ring length behind, the lost samples are
+    counted as an overrun and the cursor jumps ahead. Analyzers that only need
+    the newest audio (chord check, tuner) call window() instead.
+
+    Attributes:
+        name (str): Name shown in the statistics.
+        cursor (int): Absolute position of the next sample to read.
+        max_lag (int): Largest backlog seen by read() or window(), in samples.
+        dropped (int): Samples lost to overruns.
+        overruns (int): Times the consumer fell behind the whole ring.
+    """
+
+    def __init__(self, service, name):
+        """
+        Args:
+            service (CaptureService): The service read from.
+            name (str): Name of the consumer.
+        """
+        self.service = service
+        self.name = name
+        self.cursor = service.ring.written
+        self.max_lag = 0
+        self.dropped = 0
+        self.overruns = 0
+
+    @property
+    def lag(self):
+        """int: Samples written since the cursor."""
+        return self.service.ring.written - self.cursor
+
+    def _catch_up(self):
+        """Track the backlog and skip samples the writer already overwrote."""
+        lag = self.lag
+        self.max_lag = max(self.max_lag, lag)
+        if lag > self.service.ring.size:
+            lost = lag - self.service.ring.size
+            self.dropped += lost
+            self.overruns += 1
+            self.cursor += lost
+
+    def read(self, max_count=None):
+        """
+        Take the samples written since the last read.
+
+        Args:
+            max_count (int, optional): Take at most this many samples.
+
+        Returns:
+            memoryview: float32 samples, possibly empty; a view into the ring, so
+                it should be consumed (or copied) before the writer comes around.
+        """
+        self._catch_up()
+        # the writer may have added more since, but never more than the ring holds
+        count = min(self.lag, self.service.ring.size)
+        if max_count is not None:
+            count = min(count, max_count)
+        view = self.service.ring.view(self.cursor, count)
+        self.cursor += count
+        return view
+
+    def wait(self, count, timeout=None):
+        """
+        Block until at least count unread samples are available.
+
+        Args:
+            count (int): Samples needed.
+            timeout (float, optional): Seconds to wait at most.
+
+        Returns:
+            bool: True if the samples are there, False on timeout or when the service stopped.
+        """
+        with self.service.condition:
+            return self.service.condition.wait_for(
+                lambda: self.lag >= count or not self.service.running, timeout) and self.lag >= count
+
+    def window(self, count):
+        """
+        Return the newest samples and move the cursor to the end.
+
+        Args:
+            count (int): Number of samples; at most the ring size.
+
+        Returns:
+            np.ndarray: float32 samples as a view into the ring (zero-padded copy
+                only before count samples have been captured).
+        """
+        self.max_lag = max(self.max_lag, self.lag)
+        ring = self.service.ring
+        self.cursor = ring.written
+        if ring.written < count:
+            return ring.latest(count)
+        return np.frombuffer(ring.view(self.cursor - count, count), dtype=np.float32)
+
+    def skip(self):
+        """ Move the cursor to the newest sample without counting the skipped ones as lost. """
+        self.cursor = self.service.ring.written
+
+
+class PyAudioDevice:
+    """ The default input device, read through a PyAudio callback stream. """
+
+    def __init__(self, sample_rate=SAMPLE_RATE, frames_per_buffer=FRAMES_PER_BUFFER):
+        """
+        Args:
+            sample_rate (int): Samples per second.
+            frames_per_buffer (int): Samples per callback.
+        """
+        self.sample_rate = sample_rate
+        self.frames_per_buffer = frames_per_buffer
+        self._audio = None
+        self._stream = None
+
+    def start(self, on_block):
+        """
+        Open the input stream.
+
+        Args:
+            on_block (callable): Called from the audio thread with (samples, overflowed).
+        """
+        def callback(in_data, frame_count, time_info, status):
+            on_block(np.frombuffer(in_data, dtype=np.float32), bool(status & pyaudio.paInputOverflow))
+            return None, pyaudio.paContinue
+
+        self._audio = pyaudio.PyAudio()
+        self._stream = self._audio.open(format=pyaudio.paFloat32, channels=1, rate=self.sample_rate,
+                                        input=True, frames_per_buffer=self.frames_per_buffer,
+                                        stream_callback=callback)
+
+    def stop(self):
+        """ Close the stream and release the microphone. """
+        if self._stream is not None:
+            self._stream.stop_stream()
+            self._stream.close()
+            self._audio.terminate()
+            self._stream = None
+            self._audio = None
+
+
+class FileDevice:
+    """
+    A fake input device playing a WAV file or a sample array, for tests and tools.
+
+    In real time mode a thread delivers one block per block duration like a
+    sound card; otherwise run() pushes all blocks at once.
+    """
+
+    def __init__(self, source, sample_rate=SAMPLE_RATE, frames_per_buffer=FRAMES_PER_BUFFER,
+                 realtime=True, loop=False, speed=1.0):
+        """
+        Args:
+            source (str or np.ndarray): WAV file or float32 samples.
+            sample_rate (int): Samples per second of a sample array; WAV files bring their own.
+            frames_per_buffer (int): Samples per block.
+            realtime (bool): Pace the blocks like a sound card.
+            loop (bool): Start over at the end instead of stopping.
+            speed (float): Pace this many times faster than real time, e.g. to simulate long sessions.
+        """
+        if isinstance(source, str):
+            self.samples, self.sample_rate = read_wav(source)
+        else:
+            self.samples, self.sample_rate = np.asarray(source, dtype=np.float32), sample_rate
+        self.frames_per_buffer = frames_per_buffer
+        self.realtime = realtime
+        self.loop = loop
+        self.speed = speed
+        self._stop = threading.Event()
+        self._thread = None
+
+    def run(self, on_block):
+        """
+        Deliver the blocks from the calling thread.
+
+        Args:
+            on_block (callable): Called with (samples, overflowed) per block.
+        """
+        block = self.frames_per_buffer
+        interval = block / self.sample_rate / self.speed
+        due = time.perf_counter()
+        while not self._stop.is_set():
+            for start in range(0, len(self.samples), block):
+                if self._stop.is_set():
+                    return
+                if self.realtime:
+                    due += interval
+                    self._stop.wait(max(0.0, due - time.perf_counter()))
+                on_block(self.samples[start:start + block], False)
+            if not self.loop:
+                return
+
+    def start(self, on_block):
+        """
+        Start delivering blocks from a background thread.
+
+        Args:
+            on_block (callable): Called with (samples, overflowed) per block.
+        """
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, args=(on_block,), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """ Stop delivering blocks. """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+class CaptureService:
+    """
+    One input stream shared by every audio feature.
+
+    The device writes each block once into a preallocated AudioRing; speech
+    recognition, the chord check, the tuner and the recorder each read from it
+    through their own Subscription. Overruns of the device (reported by
+    PortAudio) and of every subscriber are counted, so dropped audio shows up
+    in stats() instead of going unnoticed.
+
+    Attributes:
+        device (object): PyAudioDevice, FileDevice or anything with start(on_block) and stop().
+        sample_rate (int): Samples per second.
+        ring (AudioRing): The shared buffer.
+        condition (threading.Condition): Notified after every block, for blocking readers.
+        device_overflows (int): Blocks the device reported as overflowed.
+        blocks (int): Blocks received.
+        running (bool): Whether the device is started.
+    """
+
+    def __init__(self, device=None, seconds=RING_SECONDS):
+        """
+        Args:
+            device (object, optional): Input device; the default microphone if omitted.
+            seconds (float): Length of audio kept in the ring.
+        """
+        self.device = device or PyAudioDevice()
+        self.sample_rate = self.device.sample_rate
+        self.ring = AudioRing(int(self.sample_rate * seconds))
+        self.condition = threading.Condition()
+        self.subscriptions = []
+        self.device_overflows = 0
+        self.blocks = 0
+        self.running = False
+
+    def _on_block(self, samples, overflowed):
+        """Device thread: store one block and wake blocking readers."""
+        self.ring.write(samples)
+        self.blocks += 1
+        if overflowed:
+            self.device_overflows += 1
+        with self.condition:
+            self.condition.notify_all()
+
+    def start(self):
+        """ Start the device. """
+        if not self.running:
+            self.running = True
+            self.device.start(self._on_block)
+
+    def stop(self):
+        """ Stop the device and release blocked readers. """
+        if self.running:
+            self.running = False
+            self.device.stop()
+            with self.condition:
+                self.condition.notify_all()
+
+    def subscribe(self, name):
+        """
+        Add a consumer reading from the newest sample on.
+
+        Args:
+            name (str): Name shown in the statistics.
+
+        Returns:
+            Subscription: The consumer's cursor.
+        """
+        subscription = Subscription(self, name)
+        self.subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """
+        Remove a consumer.
+
+        Args:
+            subscription (Subscription): The consumer to remove.
+        """
+        if subscription in self.subscriptions:
+            self.subscriptions.remove(subscription)
+
+    def latest(self, count):
+        """
+        Return a copy of the newest samples, for one-off reads without a subscription.
+
+        Args:
+            count (int): Number of samples.
+
+        Returns:
+            np.ndarray: float32 samples, oldest first.
+        """
+        return self.ring.latest(count)
+
+    def stats(self):
+        """
+        Return the counters of the device and every subscriber.
+
+        Returns:
+            dict: 'blocks', 'device_overflows' and per subscriber name a dict with
+                'lag', 'max_lag', 'dropped' and 'overruns' (sample counts).
+        """
+        result = {"blocks": self.blocks, "device_overflows": self.device_overflows}
+        for subscription in self.subscriptions:
+            result[subscription.name] = {"lag": subscription.lag, "max_lag": subscription.max_lag,
+                                         "dropped": subscription.dropped, "overruns": subscription.overruns}
+        return result
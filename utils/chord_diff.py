@@ -0,0 +1,229 @@
+from typing import NamedTuple
+from utils.chord_keys import chord_hash, name_key
+
+
+class ChordDiff(NamedTuple):
+    """
+    Difference between two chord lists.
+
+    Attributes:
+        added (list): Chords only in the new list.
+        changed (list): (old, new) pairs of chords whose content changed.
+        removed (list): Chords only in the old list.
+    """
+    added: list
+    changed: list
+    removed: list
+
+    def __bool__(self):
+        return bool(self.added or self.changed or self.removed)
+
+
+class MergeConflict(NamedTuple):
+    """
+    A chord both sides changed in different ways.
+
+    Attributes:
+        level (str): Difficulty level.
+        name (str): Chord name in the merged data.
+        fields (tuple): Fields with conflicting values; empty if one side deleted the chord
+            the other side changed.
+        base (dict or None): The chord in the common ancestor.
+        ours (dict or None): Our version, None if we deleted it.
+        theirs (dict or None): Their version, None if they deleted it.
+    """
+    level: str
+    name: str
+    fields: tuple
+    base: object
+    ours: object
+    theirs: object
+
+
+_MISSING = object()
+
+
+def _keyed(chords, name_keys=None):
+    """Map every chord to its canonical name key; repeated names get a running number."""
+    name_keys = {} if name_keys is None else name_keys
+    keyed = {}
+    occurrences = {}
+    for chord in chords:
+        name = chord.get("name", "")
+        key = name_keys.get(name)
+        if key is None:
+            key = name_keys[name] = name_key(name)
+        occurrence = occurrences.get(key, 0)
+        occurrences[key] = occurrence + 1
+        keyed[(key, occurrence)] = chord
+    return keyed
+
+
+def field_changes(old, new):
+    """
+    List the fields that differ between two versions of a chord.
+
+    Args:
+        old (dict): The chord before.
+        new (dict): The chord after.
+
+    Returns:
+        dict: Field -> (old value, new value); a missing field is None.
+    """
+    return {field: (old.get(field), new.get(field))
+            for field in dict.fromkeys([*old, *new])
+            if old.get(field, _MISSING) != new.get(field, _MISSING)}
+
+
+def diff_chords(old, new):
+    """
+    Compare two chord lists by canonical name and content hash.
+
+    A renamed spelling of the same chord ('C#' -> 'Db') counts as a change, not
+    as a removal plus an addition.
+
+    Args:
+        old (list): Chord dictionaries before.
+        new (list): Chord dictionaries after.
+
+    Returns:
+        ChordDiff: Added, changed and removed chords.
+    """
+    name_keys = {}
+    old_keyed = _keyed(old, name_keys)
+    new_keyed = _keyed(new, name_keys)
+    added = [chord for key, chord in new_keyed.items() if key not in old_keyed]
+    removed = [chord for key, chord in old_keyed.items() if key not in new_keyed]
+    changed = [(old_keyed[key], chord) for key, chord in new_keyed.items()
+               if key in old_keyed and chord_hash(old_keyed[key]) != chord_hash(chord)]
+    return ChordDiff(added, changed, removed)
+
+
+def diff_chord_data(old, new):
+    """
+    Compare two chord files level by level.
+
+    Args:
+        old (dict): Chords grouped by difficulty level, before.
+        new (dict): Chords grouped by difficulty level, after.
+
+    Returns:
+        dict: Level -> ChordDiff, only for levels that differ.
+    """
+    diffs = {}
+    for level in dict.fromkeys([*old, *new]):
+        diff = diff_chords(old.get(level, []), new.get(level, []))
+        if diff:
+            diffs[level] = diff
+    return diffs
+
+
+def _merge_fields(base, ours, theirs):
+    """
+    Merge two versions of a chord field by field.
+
+    Returns:
+        tuple: (merged chord, fields changed differently on both sides); conflicting
+            fields keep our value.
+    """
+    base = base or {}
+    merged = {}
+    conflicts = []
+    for field in dict.fromkeys([*ours, *theirs]):
+        our_value = ours.get(field, _MISSING)
+        their_value = theirs.get(field, _MISSING)
+        base_value = base.get(field, _MISSING)
+        if our_value == their_value or their_value == base_value:
+            value = our_value
+        elif our_value == base_value:
+            value = their_value
+        else:
+            value = our_value
+            conflicts.append(field)
+        if value is not _MISSING:
+            merged[field] = value
+    return merged, tuple(conflicts)
+
+
+def merge_chords(base, ours, theirs, level=""):
+    """
+    Three-way merge of one chord list.
+
+    Chords are matched by canonical name and compared by content hash, so the
+    merge is linear in the number of chords; only chords both sides changed are
+    merged field by field. Our order is kept and chords only they added are
+    appended in their order.
+
+    Args:
+        base (list): Chords of the common ancestor.
+        ours (list): Our chords.
+        theirs (list): Their chords.
+        level (str): Difficulty level, used in the conflicts.
+
+    Returns:
+        tuple: (merged chords, list of MergeConflict). Conflicting fields keep our
+            value; a chord deleted on one side and changed on the other is kept.
+    """
+    # the three versions mostly share their names, so each name is parsed once
+    name_keys = {}
+    base_keyed = _keyed(base, name_keys)
+    our_keyed = _keyed(ours, name_keys)
+    their_keyed = _keyed(theirs, name_keys)
+    hashes = {}
+
+    def content(chord):
+        if chord is None:
+            return None
+        if id(chord) not in hashes:
+            hashes[id(chord)] = chord_hash(chord)
+        return hashes[id(chord)]
+
+    merged = []
+    conflicts = []
+    for key in dict.fromkeys([*our_keyed, *their_keyed]):
+        old, our, their = base_keyed.get(key), our_keyed.get(key), their_keyed.get(key)
+        fields = ()
+        if our == their:
+            # unchanged on both sides, the common case, needs no hashing
+            chord = our
+        elif content(our) == content(their) or content(their) == content(old):
+            chord = our
+        elif content(our) == content(old):
+            chord = their
+        elif our is None or their is None:
+            # deleted on one side, changed on the other
+            chord = our or their
+            conflicts.append(MergeConflict(level, chord.get("name", ""), (), old, our, their))
+        else:
+            chord, fields = _merge_fields(old, our, their)
+            if fields:
+                conflicts.append(MergeConflict(level, chord.get("name", ""), fields, old, our, their))
+        if chord is not None:
+            merged.append(chord)
+    return merged, conflicts
+
+
+def merge_chord_data(base, ours, theirs):
+    """
+    Three-way merge of chord files level by level.
+
+    Args:
+        base (dict): Chords of the common ancestor grouped by difficulty level.
+        ours (dict): Our chords grouped by difficulty level.
+        theirs (dict): Their chords grouped by difficulty level.
+
+    Returns:
+        tuple: (merged data, list of MergeConflict).
+    """
+    merged = {}
+    conflicts = []
+    for level in dict.fromkeys([*ours, *theirs]):
+        if level not in ours and theirs[level] == base.get(level):
+            continue
+        if level not in theirs and ours[level] == base.get(level):
+            continue
+        chords, level_conflicts = merge_chords(base.get(level, []), ours.get(level, []),
+                                               theirs.get(level, []), level)
+        merged[level] = chords
+        conflicts.extend(level_conflicts)
+    return merged, conflicts
@@ -0,0 +1,246 @@
+import hashlib
+import json
+from functools import lru_cache
+from typing import NamedTuple
+from utils.chord_theory import chord_root, mask_from_notes, mask_from_pitch_classes, note_to_pitch_class, rotate_mask
+from utils.chord_parser import parse_chord_symbol
+
+
+class ChordKey(NamedTuple):
+    """
+    Canonical identity of a chord entry.
+
+    Attributes:
+        root (int): Root pitch class, -1 if the name can't be read.
+        quality (int or str): Interval mask relative to the root (bit 0 = root, higher
+            bits for a slash bass), or the normalized suffix if the name can't be parsed.
+        voicing (tuple): Fret per string, -1 for muted or unreadable strings.
+    """
+    root: int
+    quality: object
+    voicing: tuple
+
+    @property
+    def name_key(self):
+        """The part of the key that identifies the chord regardless of its voicing."""
+        return self.root, self.quality
+
+
+def normalize_chord_name(name):
+    """
+    Normalize spelling details that don't change a chord name ('C♯ m7 ' -> 'C#m7').
+
+    Args:
+        name (str): The chord name.
+
+    Returns:
+        str: The normalized name.
+    """
+    return name.replace("♯", "#").replace("♭", "b").replace(" ", "").strip()
+
+
+def _fallback_key(name, notes=()):
+    """Return (root, quality) for a name the chord symbol parser rejects."""
+    part = name.split("/")[0]
+    root = chord_root(part)
+    if root is None:
+        return -1, name.lower()
+    if notes:
+        return root, rotate_mask(mask_from_notes(notes), -root)
+    suffix = part[2:] if len(part) > 1 and part[1] in "#b" else part[1:]
+    return root, suffix
+
+
+@lru_cache(maxsize=4096)
+def name_keys(name, notes=()):
+    """
+    Return the canonical name keys of a chord name, most specific first.
+
+    Enharmonic roots ('C#' / 'Db') and suffix aliases ('maj7' / 'M7') give the same
+    key. Names listing alternatives for the same pitch class set ('C6/Am7') get
+    one key per alternative; a slash bass note keeps 'C/E' apart from 'C'.
+
+    Args:
+        name (str): The chord name.
+        notes (tuple): Chord notes, used for names the chord symbol parser rejects.
+
+    Returns:
+        tuple: (root, quality) keys.
+    """
+    name = normalize_chord_name(name)
+    symbol = parse_chord_symbol(name)
+    if symbol is None:
+        return (_fallback_key(name, notes),)
+    keys = []
+    while symbol is not None:
+        mask = mask_from_pitch_classes(symbol.intervals())
+        if symbol.bass is not None:
+            # bits above the 12 pitch classes hold the bass relative to the root
+            mask |= (((note_to_pitch_class(symbol.bass) - symbol.root_pitch_class) % 12) + 1) << 12
+        keys.append((symbol.root_pitch_class, mask))
+        symbol = symbol.alternative
+    return tuple(keys)
+
+
+def name_key(name):
+    """
+    Return the main canonical name key of a chord name.
+
+    Args:
+        name (str): The chord name.
+
+    Returns:
+        tuple: (root, quality).
+    """
+    return name_keys(name)[0]
+
+
+def stored_name_key(name):
+    """
+    Return the main canonical name key of a chord name as text for databases.
+
+    The format is spelled out instead of relying on a Python repr, so stored
+    keys stay valid however the key tuples change in the code:
+    'root:quality:bass' with the root pitch class, the 12-bit interval mask
+    relative to the root and the bass interval of a slash chord ('' without
+    one), e.g. '0:145:' for C and '0:145:4' for C/E. Names the chord symbol
+    parser rejects store their normalized suffix as quality.
+
+    Args:
+        name (str): The chord name.
+
+    Returns:
+        str: The key text.
+    """
+    root, quality = name_key(name)
+    if isinstance(quality, int):
+        bass = (quality >> 12) - 1
+        return f"{root}:{quality & 0xFFF}:{bass if bass >= 0 else ''}"
+    return f"{root}:{quality}:"
+
+
+@lru_cache(maxsize=4096)
+def voicing_key(fingering):
+    """
+    Convert a fingering into a tuple of ints.
+
+    Args:
+        fingering (tuple): Fret per string.
+
+    Returns:
+        tuple: Fret per string, -1 for muted or unreadable strings.
+    """
+    return tuple(int(f) if str(f).strip().isdigit() else -1 for f in fingering)
+
+
+def chord_key(chord):
+    """
+    Intern a chord entry into its canonical key.
+
+    Args:
+        chord (dict): The chord entry.
+
+    Returns:
+        ChordKey: The canonical key.
+    """
+    root, quality = name_keys(chord.get("name", ""), tuple(chord.get("chord_notes", ())))[0]
+    return ChordKey(root, quality, voicing_key(tuple(chord.get("fingering", ()))))
+
+
+class ChordKeyIndex:
+    """
+    Hash lookup of chords by canonical name and voicing.
+
+    Every chord is normalized once when it is added; lookups and duplicate
+    checks are dictionary lookups afterwards.
+    """
+
+    def __init__(self, chords=()):
+        """
+        Index a list of chords.
+
+        Args:
+            chords (iterable): Chord dictionaries. Later duplicates don't replace earlier chords.
+        """
+        self._names = {}
+        self._voicings = {}
+        for chord in chords:
+            self.add(chord)
+
+    def add(self, chord, location=None):
+        """
+        Add a chord and report which earlier entries it duplicates.
+
+        Args:
+            chord (dict): The chord entry.
+            location (optional): Anything identifying the entry, returned in later conflicts.
+                Defaults to the chord itself.
+
+        Returns:
+            list: ('name' or 'voicing', earlier location) tuples; empty if the chord is new.
+        """
+        location = chord if location is None else location
+        conflicts = []
+        keys = name_keys(chord.get("name", ""), tuple(chord.get("chord_notes", ())))
+        earlier = next((self._names[key] for key in keys if key in self._names), None)
+        if earlier is not None:
+            conflicts.append(("name", earlier))
+        for key in keys:
+            self._names.setdefault(key, location)
+
+        voicing = voicing_key(tuple(chord.get("fingering", ())))
+        if voicing and all(f < 0 for f in voicing):
+            return conflicts
+        if voicing in self._voicings:
+            conflicts.append(("voicing", self._voicings[voicing]))
+        else:
+            self._voicings[voicing] = location
+        return conflicts
+
+    def get(self, name):
+        """
+        Find the chord stored under a name or any equivalent spelling of it.
+
+        Args:
+            name (str): The chord name.
+
+        Returns:
+            The stored location (the chord dict by default), or None.
+        """
+        return next((self._names[key] for key in name_keys(name) if key in self._names), None)
+
+    def remove(self, chord, location=None):
+        """
+        Remove a chord added with add(), e.g. after it was edited or deleted.
+
+        Only entries that still point to this chord are removed, so a duplicate
+        that was reported by add() keeps the earlier chord's entries.
+
+        Args:
+            chord (dict): The chord entry as it was added.
+            location (optional): The location it was added with. Defaults to the chord itself.
+        """
+        location = chord if location is None else location
+        for key in name_keys(chord.get("name", ""), tuple(chord.get("chord_notes", ()))):
+            if self._names.get(key) is location:
+                del self._names[key]
+        voicing = voicing_key(tuple(chord.get("fingering", ())))
+        if self._voicings.get(voicing) is location:
+            del self._voicings[voicing]
+
+
+def chord_hash(chord):
+    """
+    Return a stable content hash of a chord entry.
+
+    The hash only changes when a value of the chord changes, not when keys are
+    reordered, so it can be used to cache per-chord results between runs.
+
+    Args:
+        chord (dict): The chord entry.
+
+    Returns:
+        str: Hex digest.
+    """
+    payload = json.dumps(chord, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
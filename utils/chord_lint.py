@@ -0,0 +1,189 @@
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from utils.chord_theory import mask_from_notes, mask_from_pitch_classes, note_to_pitch_class, fingering_to_pitches
+from utils.chord_keys import ChordKeyIndex, chord_hash
+from utils.tunings import get_tuning
+from utils.chord_parser import parse_chord_symbol
+
+
+LINT_VERSION = 2            # bump when checks change, invalidates all caches
+PARALLEL_THRESHOLD = 500    # chords to check before a process pool pays off
+
+# interval degree -> semitones above the root
+DEGREE_SEMITONES = {1: 0, 2: 2, 3: 4, 4: 5, 5: 7, 6: 9, 7: 11, 9: 2, 11: 5, 13: 9}
+
+_INTERVAL_PATTERN = re.compile(r"^(bb|b|#|♭|♯)?(\d+)$")
+
+SEVERITY = {
+    "fingering_unreadable": "error",
+    "notes_on_strings_mismatch": "error",
+    "note_not_in_chord": "error",
+    "intervals_mismatch": "error",
+    "root_missing": "error",
+    "name_quality_mismatch": "warning",
+    "unreadable_name": "warning",
+    "duplicate_name": "error",
+    "duplicate_voicing": "warning",
+}
+
+
+def interval_to_semitones(interval):
+    """
+    Convert an interval name like 'b3', '#5' or 'bb7' into semitones above the root.
+
+    Args:
+        interval (str): The interval name.
+
+    Returns:
+        int or None: Semitones 0-11, or None if the interval can't be read.
+    """
+    match = _INTERVAL_PATTERN.match(interval.strip())
+    if not match or int(match.group(2)) not in DEGREE_SEMITONES:
+        return None
+    accidental = match.group(1) or ""
+    shift = {"": 0, "b": -1, "♭": -1, "bb": -2, "#": 1, "♯": 1}[accidental]
+    return (DEGREE_SEMITONES[int(match.group(2))] + shift) % 12
+
+
+def lint_chord(chord, open_pitches):
+    """
+    Check one chord entry for music theory consistency.
+
+    Args:
+        chord (dict): The chord entry.
+        open_pitches (tuple): MIDI pitches of the open strings the fingering is meant for.
+
+    Returns:
+        list: (check, detail) tuples; empty if the chord is consistent.
+    """
+    issues = []
+    fingering = chord.get("fingering", [])
+    notes_on_strings = chord.get("notes_on_strings", [])
+    chord_notes = chord.get("chord_notes", [])
+    chord_mask = mask_from_notes(chord_notes)
+
+    if not all(str(f).strip().isdigit() or str(f).strip().lower() == "x" for f in fingering):
+        issues.append(("fingering_unreadable", ",".join(fingering)))
+    else:
+        sounding = fingering_to_pitches(fingering, open_pitches)
+        expected = [pitch % 12 for pitch in sounding]
+        written = [note_to_pitch_class(n) for n in notes_on_strings if n.strip().lower() != "x"]
+        if written != expected:
+            issues.append(("notes_on_strings_mismatch", ",".join(notes_on_strings)))
+        for pitch_class in sorted(set(expected)):
+            if not chord_mask & (1 << pitch_class):
+                issues.append(("note_not_in_chord", str(pitch_class)))
+
+    root = note_to_pitch_class(chord_notes[0]) if chord_notes else None
+    semitones = [interval_to_semitones(i) for i in chord.get("intervals", [])]
+    if root is not None and None not in semitones:
+        interval_mask = mask_from_pitch_classes(root + s for s in semitones)
+        if interval_mask != chord_mask:
+            issues.append(("intervals_mismatch", ",".join(chord.get("intervals", []))))
+
+    symbol = parse_chord_symbol(chord.get("name", ""))
+    if symbol is None:
+        issues.append(("unreadable_name", chord.get("name", "")))
+    elif not chord_mask & (1 << symbol.root_pitch_class):
+        issues.append(("root_missing", chord.get("name", "")))
+    elif chord_mask != mask_from_pitch_classes(symbol.pitch_classes()):
+        issues.append(("name_quality_mismatch", chord.get("name", "")))
+
+    return issues
+
+
+def _lint_batch(chords, open_pitches):
+    """Lint a batch of chords (used by worker processes)."""
+    return [lint_chord(chord, open_pitches) for chord in chords]
+
+
+def load_cache(path):
+    """
+    Load a lint cache file.
+
+    Args:
+        path (str): Cache file path.
+
+    Returns:
+        dict: Chord hash -> list of (check, detail); empty if missing, unreadable or outdated.
+    """
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if cache.get("version") != LINT_VERSION:
+        return {}
+    return cache.get("results", {})
+
+
+def save_cache(path, results):
+    """
+    Write a lint cache file.
+
+    Args:
+        path (str): Cache file path.
+        results (dict): Chord hash -> list of (check, detail).
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"version": LINT_VERSION, "results": results}, f, ensure_ascii=False)
+
+
+def lint_packs(packs, tuning=None, cache=None, workers=None):
+    """
+    Lint several chord packs and report every problem with its location.
+
+    Only chords whose content hash is not in the cache are checked; large
+    batches are sharded over a process pool. Duplicate names (by canonical key,
+    so 'C#' and 'Db' collide) and voicings are checked across all packs.
+
+    Args:
+        packs (dict): File path -> chord data grouped by difficulty level.
+        tuning (Tuning, optional): Tuning the fingerings are written for. Defaults to standard tuning.
+        cache (dict, optional): Chord hash -> results from earlier runs; updated in place.
+        workers (int, optional): Number of worker processes.
+
+    Returns:
+        tuple: (report, checked) where report is a list of issue dicts and checked
+            the number of chords that were not in the cache.
+    """
+    tuning = tuning or get_tuning("standard")
+    open_pitches = tuple(tuning.open_pitches)
+    cache = {} if cache is None else cache
+    key_prefix = f"{tuning.key}:"
+
+    locations = []
+    for path, data in packs.items():
+        for level, chords in data.items():
+            for row, chord in enumerate(chords, start=1):
+                locations.append((path, level, row, chord, key_prefix + chord_hash(chord)))
+
+    pending = list({key: chord for _, _, _, chord, key in locations if key not in cache}.items())
+    todo = [chord for _, chord in pending]
+    if len(todo) >= PARALLEL_THRESHOLD and workers != 1:
+        chunk = max(1, len(todo) // ((workers or 4) * 4))
+        batches = [todo[i:i + chunk] for i in range(0, len(todo), chunk)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = [r for batch in pool.map(_lint_batch, batches, [open_pitches] * len(batches)) for r in batch]
+    else:
+        results = _lint_batch(todo, open_pitches)
+    for (key, _), issues in zip(pending, results):
+        cache[key] = [list(issue) for issue in issues]
+
+    report = []
+    seen = ChordKeyIndex()
+    for path, level, row, chord, key in locations:
+        location = {"file": path, "level": level, "row": row, "name": chord.get("name", "")}
+        for check, detail in cache[key]:
+            report.append({**location, "check": check, "severity": SEVERITY[check], "detail": detail})
+
+        for kind, other in seen.add(chord, location):
+            check = f"duplicate_{kind}"
+            report.append({**location, "check": check, "severity": SEVERITY[check],
+                           "detail": f"{other['file']}:{other['level']}:{other['row']} ({other['name']})"})
+
+    return report, len(todo)
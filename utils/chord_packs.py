@@ -0,0 +1,245 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from utils.chord_keys import name_key
+from utils.tracing import traced
+
+
+PACK_META_KEY = "_pack"    # optional {"name": ..., "namespace": ..., "priority": ...} entry in a pack file
+BASE_PRIORITY = 0
+DEFAULT_PRIORITY = 10
+PROCESS_POOL_BYTES = 8_000_000  # parse in processes once this much pack data changed
+
+
+class ChordPack:
+    """
+    One chord pack file.
+
+    Attributes:
+        path (str): Pack file.
+        namespace (str): Identifies the pack in the menu, the config and the 'pack' entry of its chords.
+        name (str): Display name.
+        priority (int): Packs with a higher priority override chords of lower ones.
+        data (dict): Chords grouped by difficulty level.
+        stamp (tuple): (mtime_ns, size) of the file when it was parsed.
+    """
+
+    def __init__(self, path, meta, data, stamp):
+        self.path = path
+        self.namespace = str(meta.get("namespace") or os.path.splitext(os.path.basename(path))[0])
+        self.name = str(meta.get("name") or self.namespace)
+        self.priority = int(meta.get("priority", DEFAULT_PRIORITY))
+        self.data = data
+        self.stamp = stamp
+
+
+def _file_stamp(path):
+    """Return (mtime_ns, size) of a file, used to notice changed packs."""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def read_pack_file(path):
+    """
+    Read a chord file or pack and split off the optional pack metadata.
+
+    Every tool that works on difficulty levels reads files through here, so
+    the metadata entry is never mistaken for a level.
+
+    Args:
+        path (str): Chord file or pack file.
+
+    Returns:
+        tuple: (meta, data) with the metadata dict ({} if the file has none) and
+            the chords grouped by difficulty level.
+
+    Raises:
+        OSError, json.JSONDecodeError: If the file can't be read.
+        ValueError: If the file is not a chord file.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError("not a chord pack")
+    meta = data.pop(PACK_META_KEY, {})
+    return meta, data
+
+
+def pack_file_data(meta, data):
+    """
+    Put pack metadata back in front of chord data before it is written.
+
+    Args:
+        meta (dict): Metadata as returned by read_pack_file, may be empty.
+        data (dict): Chords grouped by difficulty level.
+
+    Returns:
+        dict: The file content.
+    """
+    return {PACK_META_KEY: meta, **data} if meta else data
+
+
+def _read_pack(path):
+    """
+    Parse one pack file (runs in a worker thread or process).
+
+    Args:
+        path (str): Pack file.
+
+    Returns:
+        tuple: (meta, data) or (None, error message) if the file can't be read.
+    """
+    try:
+        return read_pack_file(path)
+    except (OSError, ValueError) as e:
+        return None, str(e)
+
+
+class PackLibrary:
+    """
+    Chord packs from a directory, merged on top of the base chord file.
+
+    Pack files are parsed concurrently and cached per file; a refresh only
+    parses packs that were added or changed. Enabling or disabling a pack only
+    merges again.
+    """
+
+    def __init__(self, directory, disabled=(), workers=None):
+        """
+        Args:
+            directory (str): Directory with *.json pack files.
+            disabled (iterable): Namespaces of packs to leave out.
+            workers (int, optional): Number of parser threads/processes.
+        """
+        self.directory = directory
+        self.disabled = set(disabled)
+        self.workers = workers
+        self.packs = {}
+        self.errors = {}
+        self._loaded = {}   # path: ChordPack of every parsed file, also of ones whose namespace is taken
+        self._failed = {}
+
+    @traced("loader.packs_refresh")
+    def refresh(self):
+        """
+        Parse new or changed pack files and forget deleted ones.
+
+        Files that failed to parse are only tried again once they change; their
+        errors from this refresh are in self.errors. So are packs declaring a
+        namespace an earlier file (by name) already uses; they are left out
+        instead of replacing that pack.
+
+        Returns:
+            list: Paths of the packs that were parsed.
+        """
+        paths = sorted(os.path.join(self.directory, f) for f in os.listdir(self.directory) if f.endswith(".json"))
+        stamps = {path: _file_stamp(path) for path in paths}
+        cached = self._loaded
+        changed = [path for path in paths
+                   if (cached[path].stamp if path in cached else self._failed.get(path)) != stamps[path]]
+
+        parsed = {}
+        if changed:
+            large = sum(stamps[path][1] for path in changed) >= PROCESS_POOL_BYTES and len(changed) > 1
+            pool_class = ProcessPoolExecutor if large else ThreadPoolExecutor
+            with pool_class(max_workers=self.workers) as pool:
+                parsed = dict(zip(changed, pool.map(_read_pack, changed)))
+
+        packs = {}
+        loaded = {}
+        self.errors = {}
+        self._failed = {path: stamp for path, stamp in self._failed.items() if stamps.get(path) == stamp}
+        for path in paths:
+            if path in parsed:
+                meta, data = parsed[path]
+                if meta is None:
+                    self.errors[path] = data
+                    self._failed[path] = stamps[path]
+                    continue
+                pack = ChordPack(path, meta, data, stamps[path])
+            elif path in cached:
+                pack = cached[path]
+            else:
+                continue
+            loaded[path] = pack
+            if pack.namespace in packs:
+                self.errors[path] = (f"namespace '{pack.namespace}' is already used by "
+                                     f"{os.path.basename(packs[pack.namespace].path)}")
+                continue
+            packs[pack.namespace] = pack
+        self.packs = packs
+        self._loaded = loaded
+        return changed
+
+    def set_enabled(self, namespace, enabled):
+        """
+        Enable or disable a pack; takes effect with the next merge.
+
+        Args:
+            namespace (str): Pack namespace.
+            enabled (bool): Whether the pack's chords are used.
+        """
+        if enabled:
+            self.disabled.discard(namespace)
+        else:
+            self.disabled.add(namespace)
+
+    @traced("loader.packs_merge")
+    def merge(self, base):
+        """
+        Merge the enabled packs on top of base chord data.
+
+        Chords with the same canonical name in the same level are overridden by
+        the pack with the higher priority (ties by namespace) and keep their
+        position; new chords are appended. Pack chords get a 'pack' entry with
+        their namespace.
+
+        Args:
+            base (dict): Chords of the base file grouped by difficulty level.
+
+        Returns:
+            dict: Merged chords grouped by difficulty level.
+        """
+        merged = {level: list(chords) for level, chords in base.items()}
+        positions = {}
+        for level, chords in merged.items():
+            for index, chord in enumerate(chords):
+                positions.setdefault((level, name_key(chord["name"])), (index, BASE_PRIORITY))
+
+        enabled = [p for p in self.packs.values() if p.namespace not in self.disabled]
+        for pack in sorted(enabled, key=lambda p: (p.priority, p.namespace)):
+            for level, chords in pack.data.items():
+                level_chords = merged.setdefault(level, [])
+                for chord in chords:
+                    key = (level, name_key(chord["name"]))
+                    entry = {**chord, "pack": pack.namespace}
+                    if key in positions:
+                        index, priority = positions[key]
+                        if pack.priority >= priority:
+                            level_chords[index] = entry
+                            positions[key] = (index, pack.priority)
+                    else:
+                        positions[key] = (len(level_chords), pack.priority)
+                        level_chords.append(entry)
+        return merged
+
+
+_libraries = {}
+
+
+def get_pack_library(directory, disabled=()):
+    """
+    Return the shared PackLibrary of a directory, refreshed from disk.
+
+    Args:
+        directory (str): Pack directory.
+        disabled (iterable): Namespaces of disabled packs, applied on first use.
+
+    Returns:
+        PackLibrary: The library.
+    """
+    if directory not in _libraries:
+        _libraries[directory] = PackLibrary(directory, disabled)
+    library = _libraries[directory]
+    library.refresh()
+    return library
@@ -0,0 +1,318 @@
+from functools import lru_cache
+from typing import NamedTuple
+from utils.chord_theory import CHORD_QUALITIES, mask_from_pitch_classes, note_to_pitch_class
+
+
+# quality spellings, longest first so 'maj' wins over 'm'
+QUALITY_TOKENS = [
+    ("maj", "major"), ("min", "minor"), ("dim", "diminished"), ("aug", "augmented"),
+    ("mi", "minor"), ("M", "major"), ("m", "minor"), ("-", "minor"),
+    ("o", "diminished"), ("°", "diminished"), ("ø", "half-diminished"), ("+", "augmented"),
+]
+
+QUALITY_INTERVALS = {
+    "major": (0, 4, 7),
+    "minor": (0, 3, 7),
+    "diminished": (0, 3, 6),
+    "half-diminished": (0, 3, 6),
+    "augmented": (0, 4, 8),
+    "sus2": (0, 2, 7),
+    "sus4": (0, 5, 7),
+    "power": (0, 7),
+}
+
+# chord degrees above the seventh and added tones -> semitones above the root
+DEGREE_SEMITONES = {2: 2, 4: 5, 5: 7, 6: 9, 9: 2, 11: 5, 13: 9}
+ALTERABLE_DEGREES = {5, 9, 11, 13}
+ACCIDENTALS = {"#": 1, "♯": 1, "+": 1, "b": -1, "♭": -1, "-": -1}
+
+# words of spoken chord names -> symbol parts (English and German)
+SPOKEN_WORDS = {
+    "sharp": "#", "flat": "b", "major": "maj", "minor": "m", "diminished": "dim",
+    "augmented": "aug", "seven": "7", "seventh": "7", "six": "6", "sixth": "6", "nine": "9",
+    "kreuz": "#", "dur": "", "moll": "m", "vermindert": "dim", "übermäßig": "aug", "sieben": "7", "sechs": "6",
+}
+
+
+class ChordSymbol(NamedTuple):
+    """
+    Parsed chord symbol.
+
+    Attributes:
+        root (str): Root note as written, with ASCII accidentals ('C#', 'Bb').
+        root_pitch_class (int): Pitch class of the root.
+        quality (str): Key of QUALITY_INTERVALS.
+        seventh (str or None): '7', 'maj7', '6' or 'dim7'.
+        extensions (tuple): Degrees stacked above the seventh, e.g. (9, 11).
+        added (tuple): Added degrees ('add9' -> (9,)).
+        alterations (tuple): Altered degrees as written, e.g. ('b5', '#9').
+        bass (str or None): Bass note of a slash chord.
+        alternative (ChordSymbol or None): Equivalent name after '/', as in 'C6/Am7'.
+    """
+    root: str
+    root_pitch_class: int
+    quality: str
+    seventh: object = None
+    extensions: tuple = ()
+    added: tuple = ()
+    alterations: tuple = ()
+    bass: object = None
+    alternative: object = None
+
+    def intervals(self):
+        """
+        Return the semitones above the root of all chord tones.
+
+        Returns:
+            tuple: Sorted semitones 0-11.
+        """
+        tones = set(QUALITY_INTERVALS[self.quality])
+        if self.quality == "half-diminished":
+            tones.add(10)
+        if self.seventh == "7":
+            tones.add(10)
+        elif self.seventh == "maj7":
+            tones.add(11)
+        elif self.seventh == "6":
+            tones.add(9)
+        elif self.seventh == "dim7":
+            tones.add(9)
+        for degree in self.extensions + self.added:
+            tones.add(DEGREE_SEMITONES[degree])
+        for alteration in self.alterations:
+            degree = int(alteration[1:])
+            tones.discard(DEGREE_SEMITONES[degree])
+            tones.add((DEGREE_SEMITONES[degree] + ACCIDENTALS[alteration[0]]) % 12)
+        return tuple(sorted(tones))
+
+    def pitch_classes(self):
+        """
+        Return the absolute pitch classes of the chord, including a slash bass.
+
+        Returns:
+            tuple: Sorted pitch classes.
+        """
+        tones = {(self.root_pitch_class + i) % 12 for i in self.intervals()}
+        if self.bass is not None:
+            tones.add(note_to_pitch_class(self.bass))
+        return tuple(sorted(tones))
+
+    def quality_key(self):
+        """
+        Return the CHORD_QUALITIES suffix with the same intervals, if any.
+
+        Returns:
+            str or None: The suffix, e.g. 'm7'.
+        """
+        return _QUALITY_KEYS.get(mask_from_pitch_classes(self.intervals()))
+
+
+# interval mask -> CHORD_QUALITIES suffix
+_QUALITY_KEYS = {}
+for _suffix, _intervals in CHORD_QUALITIES.items():
+    _QUALITY_KEYS.setdefault(mask_from_pitch_classes(_intervals), _suffix)
+
+
+def _read_note(text, pos):
+    """Read a note letter with optional accidental; returns (note, new_pos) or (None, pos)."""
+    if pos >= len(text) or text[pos].upper() not in "ABCDEFG":
+        return None, pos
+    note = text[pos].upper()
+    pos += 1
+    if pos < len(text) and text[pos] in "#♯b♭":
+        note += "#" if text[pos] in "#♯" else "b"
+        pos += 1
+    return note, pos
+
+
+def _read_number(text, pos):
+    """Read an unsigned integer; returns (number, new_pos) or (None, pos)."""
+    end = pos
+    while end < len(text) and text[end].isdigit():
+        end += 1
+    if end == pos:
+        return None, pos
+    return int(text[pos:end]), end
+
+
+def _parse_chord(text):
+    """
+    Parse one chord symbol without '/' alternatives.
+
+    Args:
+        text (str): The symbol, whitespace removed.
+
+    Returns:
+        ChordSymbol or None: None if the text is not a chord symbol.
+    """
+    root, pos = _read_note(text, 0)
+    if root is None:
+        return None
+
+    quality, major_seventh = "major", False
+    for token, name in QUALITY_TOKENS:
+        if text.startswith(token, pos):
+            quality, major_seventh = name, token in ("maj", "M")
+            pos += len(token)
+            break
+    # 'mmaj7' / 'mM7' is a minor chord with a major seventh
+    if quality == "minor":
+        for token in ("maj", "M"):
+            if text.startswith(token, pos) and text[pos + len(token):pos + len(token) + 1].isdigit():
+                major_seventh = True
+                pos += len(token)
+                break
+
+    seventh, extensions = None, ()
+    number, pos = _read_number(text, pos)
+    if number is not None:
+        if number == 5 and quality == "major" and not major_seventh:
+            quality = "power"
+        elif number in (6, 69) and not major_seventh:
+            seventh = "6"
+            extensions = (9,) if number == 69 else ()
+        elif number in (7, 9, 11, 13):
+            if major_seventh:
+                seventh = "maj7"
+            elif quality == "diminished":
+                seventh = "dim7"
+            elif quality == "half-diminished":
+                # 'ø7' spells the seventh the symbol already implies
+                if number != 7:
+                    return None
+            else:
+                seventh = "7"
+            extensions = tuple(d for d in (9, 11, 13) if d <= number)
+        else:
+            return None
+    elif major_seventh and quality == "major" and pos < len(text) and text[pos] != "/":
+        # 'maj' without a number only makes sense on its own ('Cmaj')
+        return None
+    if quality in ("augmented",) and seventh == "6":
+        return None
+
+    if text.startswith("sus", pos):
+        if quality not in ("major",):
+            return None
+        pos += 3
+        number, pos = _read_number(text, pos)
+        if number not in (None, 2, 4):
+            return None
+        quality = "sus2" if number == 2 else "sus4"
+
+    added = []
+    alterations = []
+    while pos < len(text) and text[pos] != "/":
+        if text[pos] in "(),":
+            # parentheses and commas only group tensions: 'C7(b9,#11)'
+            pos += 1
+            continue
+        if quality == "minor" and seventh is None and text.startswith(("maj7", "M7"), pos):
+            seventh = "maj7"
+            pos += 4 if text.startswith("maj7", pos) else 2
+        elif text.startswith("add", pos):
+            number, pos = _read_number(text, pos + 3)
+            if number not in (2, 4, 6, 9, 11, 13):
+                return None
+            added.append(number)
+        elif text[pos] in ACCIDENTALS:
+            accidental = "#" if text[pos] in "#♯+" else "b"
+            number, pos = _read_number(text, pos + 1)
+            if number not in ALTERABLE_DEGREES:
+                return None
+            alterations.append(f"{accidental}{number}")
+        else:
+            return None
+
+    if pos != len(text):
+        return None
+    return ChordSymbol(root, note_to_pitch_class(root), quality, seventh, extensions,
+                       tuple(added), tuple(alterations))
+
+
+@lru_cache(maxsize=8192)
+def parse_chord_symbol(name):
+    """
+    Parse a chord name like 'C#m7b5', 'Fmaj7/A' or 'C6/Am7' into its parts.
+
+    The part after '/' must be either a bare bass note or an alternative name
+    for the same pitch class set; a quality on a bass note is rejected.
+
+    Args:
+        name (str): The chord name.
+
+    Returns:
+        ChordSymbol or None: The parsed symbol, or None if the name is not a valid chord symbol.
+    """
+    # '6/9' is a chord, not a slash
+    text = name.replace(" ", "").strip().replace("6/9", "69")
+    main, _, after = text.partition("/")
+    symbol = _parse_chord(main)
+    if symbol is None:
+        return None
+    if not after:
+        return symbol
+
+    bass, pos = _read_note(after, 0)
+    if bass is not None and pos == len(after):
+        return symbol._replace(bass=bass)
+
+    alternative = _parse_chord(after)
+    if alternative is None or set(alternative.pitch_classes()) != set(symbol.pitch_classes()):
+        return None
+    return symbol._replace(alternative=alternative)
+
+
+def _spoken_symbol(words):
+    """
+    Read a chord symbol from the first words of a command.
+
+    Args:
+        words (list): Lower-case words; the chord must start at the first one.
+
+    Returns:
+        tuple: (symbol, used) with the longest chord symbol and the number of
+            words it takes up, (None, 0) if the words don't start with a chord.
+    """
+    if not words or len(words[0]) > 3 or words[0][:1].upper() not in "ABCDEFG":
+        return None, 0
+    symbol = words[0][0].upper() + words[0][1:]
+    best, used = (symbol, 1) if parse_chord_symbol(symbol) else (None, 0)
+    for count, next_word in enumerate(words[1:], start=2):
+        part = SPOKEN_WORDS.get(next_word)
+        if part is None:
+            break
+        symbol += part
+        if parse_chord_symbol(symbol):
+            best, used = symbol, count
+    return best, used
+
+
+def symbol_from_speech(text, prefix=None):
+    """
+    Find a chord symbol in a recognized voice command ('show C sharp minor seven' -> 'C#m7').
+
+    Ordinary words that look like chords ('am', 'be', 'a') must not move the
+    trainer, so a chord is only accepted right after the command word, or,
+    without one, when the whole text is nothing but the chord, e.g. a spoken
+    quiz answer.
+
+    Args:
+        text (str): The recognized text.
+        prefix (str, optional): Command word the chord has to follow, e.g. 'show';
+            a word starting with it counts ('zeig' matches 'zeige').
+
+    Returns:
+        str or None: The chord symbol, or None if the text does not name a chord that way.
+    """
+    words = text.lower().split()
+    if prefix is None:
+        symbol, used = _spoken_symbol(words)
+        return symbol if used == len(words) else None
+    prefix = prefix.lower()
+    for position, word in enumerate(words):
+        if word.startswith(prefix):
+            symbol, _ = _spoken_symbol(words[position + 1:])
+            if symbol:
+                return symbol
+    return None
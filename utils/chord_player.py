@@ -0,0 +1,155 @@
+import queue
+import threading
+import numpy as np
+import pyaudio
+from utils.synth import SAMPLE_RATE, render_chord
+
+
+FRAMES_PER_BUFFER = 256   # ~6 ms at 44.1 kHz, the longest a new chord waits for the stream
+RENDERED_VOICINGS = 64    # rendered voicings kept ready to play
+
+
+class ChordPlayer:
+    """
+    Plays rendered chords and generated tracks through one PyAudio output stream that stays open.
+
+    The stream runs in callback mode: PyAudio's audio thread pulls samples
+    from the current buffer, so play() only swaps that buffer and returns at
+    once. The Tk loop never waits for the sound card. Voicings that are not
+    rendered yet are rendered on a worker thread, so the Tk loop never waits
+    for the synthesizer either.
+    """
+
+    def __init__(self, sample_rate=SAMPLE_RATE):
+        """
+        Args:
+            sample_rate (int): Samples per second of the rendered chords.
+        """
+        self.sample_rate = sample_rate
+        self._audio = None
+        self._stream = None
+        # (samples, position); replaced as a whole so the audio thread never sees half an update
+        self._playing = (None, 0)
+        self._source = None
+        self._rendered = {}     # (pitches, pattern): samples, oldest first
+        self._wanted = None     # voicing to play as soon as the worker has rendered it
+        self._renders = None
+
+    def _open(self):
+        """Open the output stream on first use."""
+        self._audio = pyaudio.PyAudio()
+        self._stream = self._audio.open(format=pyaudio.paFloat32, channels=1, rate=self.sample_rate,
+                                        output=True, frames_per_buffer=FRAMES_PER_BUFFER,
+                                        stream_callback=self._callback)
+
+    def _callback(self, in_data, frame_count, time_info, status):
+        """PyAudio audio thread: hand out the next frames of the current chord, silence after it."""
+        samples, position = self._playing
+        source = self._source
+        if source is not None:
+            # some host APIs report no DAC time (0); the source then can't time its events
+            out = source.render(frame_count, time_info.get("output_buffer_dac_time") or None)
+        else:
+            out = np.zeros(frame_count, dtype=np.float32)
+        if samples is not None:
+            chunk = samples[position:position + frame_count]
+            out[:len(chunk)] += chunk
+            if self._playing[0] is samples:
+                self._playing = (samples, position + frame_count)
+        return out.tobytes(), pyaudio.paContinue
+
+    def play(self, samples):
+        """
+        Start playing samples, cutting off whatever is playing.
+
+        Args:
+            samples (np.ndarray): float32 mono samples at the player's sample rate.
+        """
+        if self._stream is None:
+            self._open()
+        self._playing = (samples, 0)
+
+    def play_voicing(self, pitches, pattern="down"):
+        """
+        Play a voicing; one that is not rendered yet starts once the worker thread has rendered it.
+
+        Args:
+            pitches (list): MIDI pitch per sounding string, e.g. from Tuning.pitches().
+            pattern (str): Strum pattern, a key of utils.synth.STRUM_PATTERNS.
+        """
+        if not pitches:
+            return
+        key = (tuple(pitches), pattern)
+        samples = self._rendered.get(key)
+        if samples is not None:
+            self._wanted = None
+            self.play(samples)
+        else:
+            self._wanted = key
+            self.prepare_voicing(pitches, pattern)
+
+    def prepare_voicing(self, pitches, pattern="down"):
+        """
+        Render a voicing on the worker thread, so playing it later only swaps the buffer.
+
+        Args:
+            pitches (list): MIDI pitch per sounding string.
+            pattern (str): Strum pattern, a key of utils.synth.STRUM_PATTERNS.
+        """
+        key = (tuple(pitches), pattern)
+        if not pitches or key in self._rendered:
+            return
+        if self._renders is None:
+            self._renders = queue.SimpleQueue()
+            threading.Thread(target=self._render_voicings, args=(self._renders,), daemon=True).start()
+        self._renders.put(key)
+
+    def _render_voicings(self, renders):
+        """Worker thread: render queued voicings until close() sends None."""
+        while (key := renders.get()) is not None:
+            if key not in self._rendered:
+                self._rendered[key] = render_chord(*key, sample_rate=self.sample_rate)
+                if len(self._rendered) > RENDERED_VOICINGS:
+                    del self._rendered[next(iter(self._rendered))]
+            # a chord shown in the meantime replaced the wish, its own render comes later in the queue
+            if self._wanted == key and self._renders is renders:
+                self._wanted = None
+                self.play(self._rendered[key])
+
+    def set_source(self, source):
+        """
+        Mix a generated track into the stream, e.g. a RhythmEngine.
+
+        Args:
+            source (object or None): Object with render(frame_count, block_time) returning
+                float32 samples; None removes it.
+        """
+        if source is not None and self._stream is None:
+            self._open()
+        self._source = source
+
+    def stream_time(self):
+        """
+        Return the clock of the output stream, the time base of the source's events.
+
+        Returns:
+            float: Stream time in seconds, 0 before the stream is opened.
+        """
+        return self._stream.get_time() if self._stream is not None else 0.0
+
+    def stop(self):
+        """ Silence the current chord. """
+        self._wanted = None
+        self._playing = (None, 0)
+
+    def close(self):
+        """ Close the stream and release the audio device. """
+        if self._renders is not None:
+            self._renders.put(None)
+            self._renders = None
+        if self._stream is not None:
+            self._stream.stop_stream()
+            self._stream.close()
+            self._audio.terminate()
+            self._stream = None
+            self._audio = None
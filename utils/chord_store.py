@@ -0,0 +1,418 @@
+import json
+import sqlite3
+from utils.chord_keys import chord_hash, stored_name_key
+from utils.chord_parser import parse_chord_symbol
+from utils.chord_theory import mask_from_notes, mask_from_pitch_classes
+from utils.tracing import traced
+
+
+SCHEMA_VERSION = 2        # 2: name keys stored as 'root:quality:bass' text instead of a tuple repr
+MAIN_TUNING = "standard"   # tuning of the 'fingering' stored directly in a chord entry
+CHORD_FIELDS = {"name", "fingering", "fingers", "notes_on_strings", "chord_notes", "intervals", "tunings"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS chords (
+    id INTEGER PRIMARY KEY,
+    difficulty TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    pitch_key INTEGER NOT NULL,
+    chord_notes TEXT NOT NULL,
+    intervals TEXT NOT NULL,
+    extra TEXT,
+    content_hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS levels (
+    name TEXT PRIMARY KEY,
+    position INTEGER NOT NULL
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS chords_difficulty ON chords(difficulty, position);
+CREATE INDEX IF NOT EXISTS chords_name_key ON chords(name_key);
+CREATE INDEX IF NOT EXISTS chords_pitch_key ON chords(pitch_key);
+
+CREATE TABLE IF NOT EXISTS voicings (
+    id INTEGER PRIMARY KEY,
+    chord_id INTEGER NOT NULL REFERENCES chords(id) ON DELETE CASCADE,
+    tuning TEXT NOT NULL,
+    fingering TEXT NOT NULL,
+    fingers TEXT NOT NULL,
+    notes_on_strings TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS voicings_chord ON voicings(chord_id, tuning);
+CREATE INDEX IF NOT EXISTS voicings_fingering ON voicings(tuning, fingering);
+"""
+
+# '#' must stay part of a token so 'C#m' and 'Cm' are different words
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS chords_fts USING fts5(name, notes, tokenize="unicode61 tokenchars '#'");
+"""
+
+
+def _join(values):
+    """Store a string list as one comma-separated column."""
+    return ",".join(str(v).strip() for v in values)
+
+
+def _split(text):
+    """Turn a comma-separated column back into a list."""
+    return text.split(",") if text else []
+
+
+def _pitch_key(chord):
+    """Absolute pitch class mask of a chord, from its name or else its notes."""
+    symbol = parse_chord_symbol(chord.get("name", ""))
+    if symbol is not None:
+        return mask_from_pitch_classes(symbol.pitch_classes())
+    return mask_from_notes(chord.get("chord_notes", []))
+
+
+class ChordStore:
+    """
+    Chord library in an SQLite database.
+
+    Chords and their voicings live in separate tables with indexes on
+    difficulty, canonical name key, pitch class set and fingering, plus a
+    full-text index over names and notes. Chord entries go in and come out in
+    the same dict format as the JSON chord file.
+    """
+
+    def __init__(self, path):
+        """
+        Open (and if needed create) a chord database.
+
+        Args:
+            path (str): Database file, or ':memory:'.
+        """
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        self.conn.executescript(SCHEMA)
+        if version < 2:
+            self._migrate_name_keys()
+        try:
+            self.conn.executescript(FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5, search falls back to LIKE
+            self.has_fts = False
+        self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _migrate_name_keys(self):
+        """Rewrite name keys of version 1 databases, which stored repr() of the key tuple."""
+        names = [row[0] for row in self.conn.execute("SELECT DISTINCT name FROM chords")]
+        with self.conn:
+            self.conn.executemany("UPDATE chords SET name_key = ? WHERE name = ?",
+                                  [(stored_name_key(name), name) for name in names])
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
+
+    def _insert_chord(self, difficulty, position, chord, content_hash=None):
+        """Insert one chord entry with all its voicings; returns the new chord id."""
+        extra = {k: v for k, v in chord.items() if k not in CHORD_FIELDS}
+        cursor = self.conn.execute(
+            "INSERT INTO chords (difficulty, position, name, name_key, pitch_key, chord_notes, intervals, extra, content_hash)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (difficulty, position, chord.get("name", ""), stored_name_key(chord.get("name", "")), _pitch_key(chord),
+             _join(chord.get("chord_notes", [])), _join(chord.get("intervals", [])),
+             json.dumps(extra, ensure_ascii=False) if extra else None, content_hash or chord_hash(chord)))
+        chord_id = cursor.lastrowid
+        self._insert_voicings(chord_id, chord)
+        if self.has_fts:
+            self.conn.execute("INSERT INTO chords_fts (rowid, name, notes) VALUES (?, ?, ?)",
+                              (chord_id, chord.get("name", ""), " ".join(chord.get("chord_notes", []))))
+        return chord_id
+
+    def _insert_voicings(self, chord_id, chord):
+        """Insert the main voicing and the voicings for other tunings of a chord."""
+        rows = [(chord_id, MAIN_TUNING, _join(chord.get("fingering", [])), _join(chord.get("fingers", [])),
+                 _join(chord.get("notes_on_strings", [])))]
+        for tuning, voicing in chord.get("tunings", {}).items():
+            rows.append((chord_id, tuning, _join(voicing.get("fingering", [])), _join(voicing.get("fingers", [])),
+                         _join(voicing.get("notes_on_strings", []))))
+        self.conn.executemany(
+            "INSERT INTO voicings (chord_id, tuning, fingering, fingers, notes_on_strings) VALUES (?, ?, ?, ?, ?)", rows)
+
+    def _delete_chords(self, chord_ids):
+        """Delete chords (their voicings follow by cascade)."""
+        rows = [(chord_id,) for chord_id in chord_ids]
+        self.conn.executemany("DELETE FROM chords WHERE id = ?", rows)
+        if self.has_fts:
+            self.conn.executemany("DELETE FROM chords_fts WHERE rowid = ?", rows)
+
+    def _save_levels(self, data):
+        """Remember the order of the difficulty levels for the export."""
+        self.conn.execute("DELETE FROM levels")
+        self.conn.executemany("INSERT INTO levels (name, position) VALUES (?, ?)",
+                              [(level, position) for position, level in enumerate(data)])
+
+    def import_data(self, data):
+        """
+        Replace the whole library with chord data in the JSON file format.
+
+        Args:
+            data (dict): Chord data grouped by difficulty level.
+
+        Returns:
+            int: Number of imported chords.
+        """
+        count = 0
+        with self.conn:
+            self.conn.execute("DELETE FROM voicings")
+            self.conn.execute("DELETE FROM chords")
+            if self.has_fts:
+                self.conn.execute("DELETE FROM chords_fts")
+            self._save_levels(data)
+            for difficulty, chords in data.items():
+                for position, chord in enumerate(chords):
+                    self._insert_chord(difficulty, position, chord)
+                    count += 1
+        return count
+
+    @traced("loader.store_save")
+    def save_data(self, data):
+        """
+        Store chord data in the JSON file format, touching only changed rows.
+
+        Stored rows are matched to the chords by content hash, not by position,
+        so inserting, deleting or reordering chords only rewrites the position
+        of the rows that moved; only chords whose content is new are inserted
+        with their voicings, and rows without a match are deleted. All changes
+        are written in one transaction.
+
+        Args:
+            data (dict): Chord data grouped by difficulty level.
+
+        Returns:
+            int: Number of added, edited or deleted chords; chords that only moved are not counted.
+        """
+        stored = {}
+        for chord_id, difficulty, position, content_hash in self.conn.execute(
+                "SELECT id, difficulty, position, content_hash FROM chords ORDER BY difficulty, position"):
+            stored.setdefault(content_hash, []).append((chord_id, difficulty, position))
+
+        inserted = []
+        moved = []
+        for difficulty, chords in data.items():
+            for position, chord in enumerate(chords):
+                content_hash = chord_hash(chord)
+                rows = stored.get(content_hash)
+                if not rows:
+                    inserted.append((difficulty, position, chord, content_hash))
+                    continue
+                # identical copies: keep the one already in place, else the first one of the same level
+                row = next((r for r in rows if r[1:] == (difficulty, position)), None) \
+                    or next((r for r in rows if r[1] == difficulty), rows[0])
+                rows.remove(row)
+                if row[1:] != (difficulty, position):
+                    moved.append((row[0], difficulty, position))
+        deleted = [row[0] for rows in stored.values() for row in rows]
+
+        with self.conn:
+            self._save_levels(data)
+            self._delete_chords(deleted)
+            # park moved rows on free negative positions first, so the unique (difficulty, position) index never clashes
+            self.conn.executemany("UPDATE chords SET position = ? WHERE id = ?",
+                                  [(-chord_id, chord_id) for chord_id, _, _ in moved])
+            self.conn.executemany("UPDATE chords SET difficulty = ?, position = ? WHERE id = ?",
+                                  [(difficulty, position, chord_id) for chord_id, difficulty, position in moved])
+            for difficulty, position, chord, content_hash in inserted:
+                self._insert_chord(difficulty, position, chord, content_hash)
+        return max(len(inserted), len(deleted))
+
+    def save_chord(self, difficulty, position, chord):
+        """
+        Insert or replace a single chord entry.
+
+        Args:
+            difficulty (str): Difficulty level.
+            position (int): Index within the level.
+            chord (dict): The chord entry.
+        """
+        with self.conn:
+            row = self.conn.execute("SELECT id FROM chords WHERE difficulty = ? AND position = ?",
+                                    (difficulty, position)).fetchone()
+            if row:
+                self._delete_chords([row[0]])
+            self._insert_chord(difficulty, position, chord)
+
+    def _chords_from_rows(self, where, params=(), suffix=""):
+        """Load (id, difficulty, chord) for chords matching a WHERE clause, with their voicings."""
+        chords = self.conn.execute(
+            f"SELECT id, difficulty, name, chord_notes, intervals, extra FROM chords WHERE {where} {suffix}",
+            params).fetchall()
+        if not chords:
+            return []
+        ids = [row[0] for row in chords]
+        voicings = {}
+        for start in range(0, len(ids), 900):
+            batch = ids[start:start + 900]
+            for chord_id, tuning, fingering, fingers, notes in self.conn.execute(
+                    "SELECT chord_id, tuning, fingering, fingers, notes_on_strings FROM voicings"
+                    f" WHERE chord_id IN ({','.join('?' * len(batch))}) ORDER BY id", batch):
+                voicings.setdefault(chord_id, []).append((tuning, fingering, fingers, notes))
+
+        result = []
+        for chord_id, difficulty, name, chord_notes, intervals, extra in chords:
+            chord = {"name": name}
+            tunings = {}
+            for tuning, fingering, fingers, notes in voicings.get(chord_id, []):
+                if tuning == MAIN_TUNING and "fingering" not in chord:
+                    chord.update(fingering=_split(fingering), fingers=_split(fingers), notes_on_strings=_split(notes))
+                else:
+                    voicing = {"fingering": _split(fingering)}
+                    if fingers:
+                        voicing["fingers"] = _split(fingers)
+                    if notes:
+                        voicing["notes_on_strings"] = _split(notes)
+                    tunings[tuning] = voicing
+            chord["chord_notes"] = _split(chord_notes)
+            chord["intervals"] = _split(intervals)
+            if tunings:
+                chord["tunings"] = tunings
+            if extra:
+                chord.update(json.loads(extra))
+            result.append((chord_id, difficulty, chord))
+        return result
+
+    def levels(self):
+        """
+        Return the difficulty levels in the library.
+
+        Returns:
+            list: Level names.
+        """
+        return [row[0] for row in self.conn.execute("SELECT name FROM levels ORDER BY position")]
+
+    def count(self, difficulty=None):
+        """
+        Count chords, optionally of one difficulty.
+
+        Args:
+            difficulty (str, optional): Difficulty level.
+
+        Returns:
+            int: Number of chords.
+        """
+        if difficulty is None:
+            return self.conn.execute("SELECT COUNT(*) FROM chords").fetchone()[0]
+        return self.conn.execute("SELECT COUNT(*) FROM chords WHERE difficulty = ?", (difficulty,)).fetchone()[0]
+
+    @traced("loader.store_load_level")
+    def load_level(self, difficulty, offset=0, limit=None):
+        """
+        Load the chords of one difficulty, optionally one page of them.
+
+        Args:
+            difficulty (str): Difficulty level.
+            offset (int): Index of the first chord.
+            limit (int, optional): Maximum number of chords.
+
+        Returns:
+            list: Chord entries in their stored order.
+        """
+        rows = self._chords_from_rows("difficulty = ? AND position >= ?", (difficulty, offset),
+                                      "ORDER BY position" + (f" LIMIT {int(limit)}" if limit is not None else ""))
+        return [chord for _, _, chord in rows]
+
+    @traced("loader.store_export")
+    def export_data(self):
+        """
+        Return the whole library in the JSON file format.
+
+        Returns:
+            dict: Chord data grouped by difficulty level.
+        """
+        data = {level: [] for level in self.levels()}
+        for _, difficulty, chord in self._chords_from_rows("1", (), "ORDER BY position"):
+            data.setdefault(difficulty, []).append(chord)
+        return data
+
+    def find_by_name(self, name):
+        """
+        Find chords by name, matching enharmonic and alias spellings ('Db' finds 'C#').
+
+        Args:
+            name (str): The chord name.
+
+        Returns:
+            list: (difficulty, chord) tuples.
+        """
+        return [row[1:] for row in self._chords_from_rows("name_key = ?", (stored_name_key(name),))]
+
+    def find_by_fingering(self, fingering, tuning=MAIN_TUNING):
+        """
+        Find chords that have a voicing with the given fingering.
+
+        Args:
+            fingering (list): Fret per string.
+            tuning (str): Tuning key of the voicing.
+
+        Returns:
+            list: (difficulty, chord) tuples.
+        """
+        return [row[1:] for row in self._chords_from_rows(
+            "id IN (SELECT chord_id FROM voicings WHERE tuning = ? AND fingering = ?)", (tuning, _join(fingering)))]
+
+    def find_by_notes(self, notes):
+        """
+        Find chords made of exactly the given notes, in any spelling.
+
+        Args:
+            notes (list): Note names.
+
+        Returns:
+            list: (difficulty, chord) tuples.
+        """
+        return [row[1:] for row in self._chords_from_rows("pitch_key = ?", (mask_from_notes(notes),))]
+
+    def search(self, text, limit=50):
+        """
+        Full-text search over chord names and notes; words are matched as prefixes.
+
+        Args:
+            text (str): Search words, e.g. 'C# m7'.
+            limit (int): Maximum number of results.
+
+        Returns:
+            list: (difficulty, chord) tuples, best match first.
+        """
+        words = [w.replace('"', "") for w in text.split() if w.strip('"')]
+        if not words:
+            return []
+        if self.has_fts:
+            query = " ".join(f'"{w}"*' for w in words)
+            ids = [row[0] for row in self.conn.execute(
+                "SELECT rowid FROM chords_fts WHERE chords_fts MATCH ? ORDER BY rank LIMIT ?", (query, limit))]
+        else:
+            where = " AND ".join("(name LIKE ? OR chord_notes LIKE ?)" for _ in words)
+            params = [p for w in words for p in (f"%{w}%", f"%{w}%")]
+            ids = [row[0] for row in self.conn.execute(f"SELECT id FROM chords WHERE {where} LIMIT ?", (*params, limit))]
+        if not ids:
+            return []
+        order = {chord_id: i for i, chord_id in enumerate(ids)}
+        rows = self._chords_from_rows(f"id IN ({','.join('?' * len(ids))})", ids)
+        return [row[1:] for row in sorted(rows, key=lambda row: order[row[0]])]
+
+
+_stores = {}
+
+
+def get_chord_store(path):
+    """
+    Return a shared ChordStore for a database file, opening it on first use.
+
+    Args:
+        path (str): Database file.
+
+    Returns:
+        ChordStore: The open store.
+    """
+    if path not in _stores:
+        _stores[path] = ChordStore(path)
+    return _stores[path]
@@ -0,0 +1,386 @@
+import re
+
+
+NOTE_NAMES_SHARP = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
+NOTE_NAMES_FLAT = ["C", "Db", "D", "Eb", "E", "F", "Gb", "G", "Ab", "A", "Bb", "B"]
+NATURAL_PITCH_CLASSES = {"C": 0, "D": 2, "E": 4, "F": 5, "G": 7, "A": 9, "B": 11}
+
+# open string pitches (MIDI) of a standard re-entrant ukulele: G4 C4 E4 A4
+STANDARD_TUNING = [67, 60, 64, 69]
+
+# chord suffix -> semitones above the root, in chord tone order (root, third, fifth, ...)
+# only qualities that fit on four strings are listed
+CHORD_QUALITIES = {
+    "": (0, 4, 7),
+    "m": (0, 3, 7),
+    "7": (0, 4, 7, 10),
+    "m7": (0, 3, 7, 10),
+    "maj7": (0, 4, 7, 11),
+    "6": (0, 4, 7, 9),
+    "m6": (0, 3, 7, 9),
+    "dim": (0, 3, 6),
+    "dim7": (0, 3, 6, 9),
+    "m7b5": (0, 3, 6, 10),
+    "aug": (0, 4, 8),
+    "sus2": (0, 7, 2),
+    "sus4": (0, 5, 7),
+    "7sus4": (0, 5, 7, 10),
+    "add9": (0, 4, 7, 2),
+    "madd9": (0, 3, 7, 2),
+    "mmaj7": (0, 3, 7, 11),
+}
+
+_ROOT_PATTERN = re.compile(r"^\s*([A-Ga-g])([#b♯♭]?)")
+
+
+def note_to_pitch_class(note):
+    """
+    Convert a note name like 'C#', 'Bb', 'F♯' or 'E#' into a pitch class (0-11).
+
+    Args:
+        note (str): The note name.
+
+    Returns:
+        int or None: The pitch class, or None if the note can't be read.
+    """
+    match = _ROOT_PATTERN.match(note or "")
+    if not match:
+        return None
+    letter, accidental = match.groups()
+    pitch_class = NATURAL_PITCH_CLASSES[letter.upper()]
+    if accidental in ("#", "♯"):
+        pitch_class += 1
+    elif accidental in ("b", "♭"):
+        pitch_class -= 1
+    return pitch_class % 12
+
+
+def pitch_class_to_note(pitch_class, prefer_flats=False):
+    """
+    Convert a pitch class into a note name.
+
+    Args:
+        pitch_class (int): Pitch class 0-11.
+        prefer_flats (bool): Spell black keys with flats instead of sharps.
+
+    Returns:
+        str: The note name.
+    """
+    names = NOTE_NAMES_FLAT if prefer_flats else NOTE_NAMES_SHARP
+    return names[pitch_class % 12]
+
+
+def chord_root(name):
+    """
+    Return the pitch class of the root of a chord name ('C#m7' -> 1).
+
+    Args:
+        name (str): The chord name.
+
+    Returns:
+        int or None: Root pitch class, or None for an unreadable name.
+    """
+    return note_to_pitch_class(name)
+
+
+def mask_from_pitch_classes(pitch_classes):
+    """
+    Build a 12-bit mask with one bit per pitch class.
+
+    Args:
+        pitch_classes (iterable): Pitch classes 0-11.
+
+    Returns:
+        int: The pitch class mask.
+    """
+    mask = 0
+    for pitch_class in pitch_classes:
+        mask |= 1 << (pitch_class % 12)
+    return mask
+
+
+def mask_from_notes(notes):
+    """
+    Build a pitch class mask from note names, ignoring unreadable ones.
+
+    Args:
+        notes (iterable): Note names like ['C', 'E', 'G'].
+
+    Returns:
+        int: The pitch class mask.
+    """
+    pitch_classes = (note_to_pitch_class(n) for n in notes)
+    return mask_from_pitch_classes(pc for pc in pitch_classes if pc is not None)
+
+
+def rotate_mask(mask, semitones):
+    """
+    Transpose a pitch class mask by the given number of semitones.
+
+    Args:
+        mask (int): The 12-bit pitch class mask.
+        semitones (int): Number of semitones (may be negative).
+
+    Returns:
+        int: The rotated mask.
+    """
+    semitones %= 12
+    return ((mask << semitones) | (mask >> (12 - semitones))) & 0xFFF
+
+
+def _build_normal_forms():
+    """Precompute (normal form, rotation) for all 4096 masks."""
+    table = []
+    for mask in range(4096):
+        best_mask, best_rotation = mask, 0
+        for rotation in range(1, 12):
+            rotated = rotate_mask(mask, -rotation)
+            if rotated < best_mask:
+                best_mask, best_rotation = rotated, rotation
+        table.append((best_mask, best_rotation))
+    return table
+
+
+# NORMAL_FORMS[mask] == (normal, rotation) with rotate_mask(normal, rotation) == mask
+NORMAL_FORMS = _build_normal_forms()
+
+
+def fingering_to_pitches(fingering, open_pitches=STANDARD_TUNING):
+    """
+    Turn a fingering into sounding MIDI pitches, skipping muted strings ('x').
+
+    Args:
+        fingering (list): Fret per string as strings or ints.
+        open_pitches (list): MIDI pitch of every open string.
+
+    Returns:
+        list: MIDI pitches of all sounding strings.
+    """
+    pitches = []
+    for open_pitch, fret in zip(open_pitches, fingering):
+        try:
+            pitches.append(open_pitch + int(fret))
+        except (TypeError, ValueError):
+            continue
+    return pitches
+
+
+class ChordIndex:
+    """
+    Reverse lookup from a fingering to the chords it could be.
+
+    Every voicing is reduced to the 12-bit mask of its pitch classes. Chords from
+    the database are stored by the exact mask their fingering sounds in the
+    tuning, so a wrong 'chord_notes' entry can't make a shape look like
+    another chord; theory-generated chords
+    (every root for every quality in CHORD_QUALITIES) are stored once per quality
+    under the rotation-normalized mask, so a lookup is two dict accesses no matter
+    how many roots or names exist.
+
+    Attributes:
+        open_pitches (list): MIDI pitches of the open strings used for lookups.
+        tuning (Tuning or None): The instrument profile whose pitch_table is used, if given.
+        prefer_flats (bool): Spell generated root names with flats.
+    """
+
+    def __init__(self, chords=(), open_pitches=STANDARD_TUNING, include_theory=True, prefer_flats=False, tuning=None):
+        """
+        Build the index.
+
+        Args:
+            chords (iterable): Chord dictionaries from the database.
+            open_pitches (list): MIDI pitches of the open strings; ignored if a tuning is given.
+            include_theory (bool): Also index names generated from CHORD_QUALITIES.
+            prefer_flats (bool): Spell generated root names with flats.
+            tuning (Tuning, optional): Instrument profile; database fingerings are
+                read for its fingering_key and turned into pitches with its pitch_table.
+        """
+        self.tuning = tuning
+        self.open_pitches = list(tuning.open_pitches if tuning is not None else open_pitches)
+        self.fingering_key = tuning.fingering_key if tuning is not None else "standard"
+        self.prefer_flats = prefer_flats
+        self._by_mask = {}
+        self._by_shape = {}
+        self._refs = {}
+        self._cache = {}
+
+        if include_theory:
+            for suffix, intervals in CHORD_QUALITIES.items():
+                self.add_quality(suffix, intervals)
+        for chord in chords:
+            self.add_chord(chord)
+
+    def add_quality(self, suffix, intervals):
+        """
+        Index a chord quality for all twelve roots at once.
+
+        Args:
+            suffix (str): The chord suffix, e.g. 'm7'.
+            intervals (tuple): Semitones above the root in chord tone order.
+        """
+        mask = mask_from_pitch_classes(intervals)
+        normal, _ = NORMAL_FORMS[mask]
+        # symmetric chords (dim7, aug) map onto their normal form more than once
+        for rotation in range(12):
+            if rotate_mask(mask, -rotation) == normal:
+                entry = ((-rotation) % 12, suffix, tuple(intervals))
+                self._by_shape.setdefault(normal, []).append(entry)
+        self._cache.clear()
+
+    def _pitches(self, fingering):
+        """Sounding MIDI pitches of a fingering, from the tuning's pitch_table if there is one."""
+        if self.tuning is not None:
+            return self.tuning.pitches(fingering)
+        return fingering_to_pitches(fingering, self.open_pitches)
+
+    def _chord_fingering(self, chord):
+        """The fingering stored for the index's tuning, None if the chord has none for it."""
+        if self.fingering_key == "standard":
+            return chord.get("fingering")
+        return chord.get("tunings", {}).get(self.fingering_key, {}).get("fingering")
+
+    def _chord_entry(self, chord):
+        """Return (mask, entry) under which a database chord is indexed, or None."""
+        name = chord.get("name", "").strip()
+        root = chord_root(name)
+        if root is None:
+            return None
+        noted = [note_to_pitch_class(n) for n in chord.get("chord_notes", [])]
+        noted = [pc for pc in noted if pc is not None]
+        fingering = self._chord_fingering(chord)
+        sounding = {p % 12 for p in self._pitches(fingering)} if fingering else set()
+        if sounding:
+            # chord tone order from 'chord_notes' where it agrees with the fingering, for the inversion number
+            tones = [pc for pc in dict.fromkeys(noted) if pc in sounding]
+            tones += sorted(sounding.difference(tones), key=lambda pc: (pc - root) % 12)
+        else:
+            # no fingering for this tuning: its voicing is generated from the name, which the notes describe
+            tones = noted
+        if not tones:
+            return None
+        intervals = tuple((pc - root) % 12 for pc in tones)
+        return mask_from_pitch_classes(tones), (name, root, intervals)
+
+    def add_chord(self, chord):
+        """
+        Index a single chord from the database by the pitch class mask its fingering sounds.
+
+        Args:
+            chord (dict): Chord entry with at least 'name' and 'fingering'; 'chord_notes'
+                is only used for the order of the chord tones.
+        """
+        indexed = self._chord_entry(chord)
+        if indexed is None:
+            return
+        mask, entry = indexed
+        # the same chord may be listed in several difficulties, it is only removed with its last copy
+        self._refs[indexed] = self._refs.get(indexed, 0) + 1
+        if self._refs[indexed] == 1:
+            self._by_mask.setdefault(mask, []).append(entry)
+        self._cache.clear()
+
+    def remove_chord(self, chord):
+        """
+        Remove a chord added with add_chord, e.g. after it was edited or deleted.
+
+        Args:
+            chord (dict): The chord entry as it was added.
+        """
+        indexed = self._chord_entry(chord)
+        if indexed not in self._refs:
+            return
+        mask, entry = indexed
+        self._refs[indexed] -= 1
+        if self._refs[indexed] == 0:
+            del self._refs[indexed]
+            self._by_mask[mask].remove(entry)
+            if not self._by_mask[mask]:
+                del self._by_mask[mask]
+        self._cache.clear()
+
+    def identify(self, fingering):
+        """
+        Find all chord names matching a fingering.
+
+        Database names come first, then generated names; root position
+        candidates are listed before inversions.
+
+        Args:
+            fingering (list): Fret per string.
+
+        Returns:
+            list: Dicts with 'name', 'slash_name', 'root', 'bass', 'inversion' and 'source'.
+        """
+        key = tuple(str(f).strip() for f in fingering)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        pitches = self._pitches(key)
+        if not pitches:
+            self._cache[key] = []
+            return []
+        bass = min(pitches) % 12
+        mask = mask_from_pitch_classes(pitches)
+
+        results = []
+        seen = set()
+        for name, root, intervals in self._by_mask.get(mask, []):
+            results.append(self._candidate(name, root, bass, intervals, "db"))
+            seen.add(name.lower())
+
+        normal, rotation = NORMAL_FORMS[mask]
+        for relative_root, suffix, intervals in self._by_shape.get(normal, []):
+            root = (relative_root + rotation) % 12
+            name = pitch_class_to_note(root, self.prefer_flats) + suffix
+            if name.lower() in seen:
+                continue
+            seen.add(name.lower())
+            results.append(self._candidate(name, root, bass, intervals, "theory"))
+
+        results.sort(key=lambda c: (c["source"] != "db", c["inversion"] != 0))
+        self._cache[key] = results
+        return results
+
+    def identify_many(self, fingerings):
+        """
+        Identify a whole list of fingerings, e.g. every chord of a song or pack.
+
+        Repeated shapes are only resolved once.
+
+        Args:
+            fingerings (iterable): Fingerings to look up.
+
+        Returns:
+            list: One candidate list per fingering.
+        """
+        return [self.identify(f) for f in fingerings]
+
+    def best_name(self, fingering):
+        """
+        Return the most likely name for a fingering.
+
+        Args:
+            fingering (list): Fret per string.
+
+        Returns:
+            str or None: The suggested chord name, or None if nothing matches.
+        """
+        candidates = self.identify(fingering)
+        return candidates[0]["name"] if candidates else None
+
+    def _candidate(self, name, root, bass, intervals, source):
+        """Build a result dict including the inversion of the voicing."""
+        bass_interval = (bass - root) % 12
+        inversion = intervals.index(bass_interval) if bass_interval in intervals else 0
+        slash_name = name
+        if inversion and "/" not in name:
+            slash_name = f"{name}/{pitch_class_to_note(bass, self.prefer_flats)}"
+        return {
+            "name": name,
+            "slash_name": slash_name,
+            "root": root,
+            "bass": bass,
+            "inversion": inversion,
+            "source": source,
+        }
@@ -0,0 +1,204 @@
+import numpy as np
+from utils.chord_theory import note_to_pitch_class
+
+
+WINDOW = 4096               # samples per analysis, ~93 ms at 44.1 kHz
+MIN_FREQUENCY = 200.0       # below the lowest ukulele string, so hum and rumble are ignored
+MAX_FREQUENCY = 1500.0      # above the highest fretted fundamental; higher partials mostly blur the chroma
+NOISE_FLOOR = 1e-3          # RMS below this counts as silence
+MATCH_THRESHOLD = 0.85
+NOTE_PRESENCE = 0.3         # every chord tone needs at least this share of the strongest pitch class
+# (interval in semitones, weight) of the partials a plucked note adds to the chroma:
+# fundamental, octave, twelfth, double octave, major third above it, fifth above that
+HARMONICS = ((0, 1.0), (0, 0.5), (7, 0.35), (0, 0.25), (4, 0.2), (7, 0.15))
+
+
+def chroma_filterbank(window, sample_rate, fmin=MIN_FREQUENCY, fmax=MAX_FREQUENCY):
+    """
+    Build the matrix folding FFT bins onto the 12 pitch classes.
+
+    Every bin between fmin and fmax is split between its two nearest pitch
+    classes by distance in cents, so energy of slightly out of tune strings is
+    not lost.
+
+    Args:
+        window (int): FFT size.
+        sample_rate (int): Samples per second.
+        fmin (float): Lowest frequency used.
+        fmax (float): Highest frequency used.
+
+    Returns:
+        np.ndarray: (12, window // 2 + 1) float32 weights.
+    """
+    frequencies = np.fft.rfftfreq(window, 1 / sample_rate)
+    used = (frequencies >= fmin) & (frequencies <= fmax)
+    # fractional MIDI pitch of every bin, folded to 0..12
+    pitch = np.zeros_like(frequencies)
+    pitch[used] = 69 + 12 * np.log2(frequencies[used] / 440.0)
+    lower = np.floor(pitch).astype(int)
+    upper_weight = pitch - lower
+    bank = np.zeros((12, len(frequencies)), dtype=np.float32)
+    bins = np.flatnonzero(used)
+    np.add.at(bank, (lower[bins] % 12, bins), 1 - upper_weight[bins])
+    np.add.at(bank, ((lower[bins] + 1) % 12, bins), upper_weight[bins])
+    return bank
+
+
+def chord_tones(notes):
+    """
+    Return the pitch classes of chord notes.
+
+    Args:
+        notes (list): Note names.
+
+    Returns:
+        list: Distinct pitch classes 0-11; unknown names are skipped.
+    """
+    tones = {note_to_pitch_class(note) for note in notes}
+    tones.discard(None)
+    return sorted(tones)
+
+
+def chord_template(notes):
+    """
+    Turn chord notes into the unit chroma vector a strum of them is expected to give.
+
+    Every note also contributes its first partials (HARMONICS), since a string
+    never sounds as a pure tone; without them the fifth above every note is
+    missing from the template and real strums score far too low.
+
+    Args:
+        notes (list): Note names, e.g. the 'chord_notes' of a chord entry.
+
+    Returns:
+        np.ndarray: 12 float32 values.
+    """
+    template = np.zeros(12, dtype=np.float32)
+    for pitch_class in chord_tones(notes):
+        for interval, weight in HARMONICS:
+            template[(pitch_class + interval) % 12] += weight
+    norm = np.linalg.norm(template)
+    return template / norm if norm else template
+
+
+class ChromaAnalyzer:
+    """
+    Windowed FFT and chroma vector of audio frames.
+
+    The window function and the filterbank are computed once; an analysis is
+    one rfft and one matrix product, and analyze_frames() does a whole
+    recording in one batched FFT.
+    """
+
+    def __init__(self, sample_rate, window=WINDOW):
+        """
+        Args:
+            sample_rate (int): Samples per second.
+            window (int): Samples per analysis.
+        """
+        self.sample_rate = sample_rate
+        self.window = window
+        self._hann = np.hanning(window).astype(np.float32)
+        self._bank = chroma_filterbank(window, sample_rate)
+
+    def _chroma(self, magnitudes):
+        """Fold magnitude spectra (..., bins) to unit chroma vectors (..., 12)."""
+        # square root compression keeps the strongest string from hiding the others
+        chroma = np.sqrt(magnitudes) @ self._bank.T
+        norm = np.linalg.norm(chroma, axis=-1, keepdims=True)
+        return chroma / np.where(norm > 0, norm, 1)
+
+    def analyze(self, samples):
+        """
+        Compute the chroma vector of the last window of samples.
+
+        Args:
+            samples (np.ndarray): float32 samples; only the last `window` are used.
+
+        Returns:
+            tuple: (chroma, rms) with a unit 12-vector and the signal level.
+        """
+        frame = np.asarray(samples[-self.window:], dtype=np.float32)
+        if len(frame) < self.window:
+            frame = np.pad(frame, (self.window - len(frame), 0))
+        rms = float(np.sqrt(np.mean(frame * frame)))
+        return self._chroma(np.abs(np.fft.rfft(frame * self._hann))), rms
+
+    def analyze_frames(self, signal, hop):
+        """
+        Compute chroma vectors of a whole recording.
+
+        Args:
+            signal (np.ndarray): float32 samples.
+            hop (int): Samples between the ends of two analysis windows.
+
+        Returns:
+            tuple: (chroma, rms, ends) arrays with one row/value per frame; ends are
+                the sample positions the windows end at.
+        """
+        if len(signal) < self.window:
+            signal = np.pad(signal, (self.window - len(signal), 0))
+        frames = np.lib.stride_tricks.sliding_window_view(signal, self.window)[::hop]
+        rms = np.sqrt(np.mean(frames * frames, axis=1))
+        chroma = self._chroma(np.abs(np.fft.rfft(frames * self._hann, axis=1)))
+        ends = np.arange(len(frames)) * hop + self.window
+        return chroma, rms, ends
+
+
+def match_chord(chroma, template, tones, rms, threshold=MATCH_THRESHOLD):
+    """
+    Decide whether a chroma vector is the chord of a template.
+
+    Args:
+        chroma (np.ndarray): Unit chroma vector, or an (n, 12) array of them.
+        template (np.ndarray): Unit template from chord_template().
+        tones (list): Pitch classes of the chord, from chord_tones().
+        rms (float or np.ndarray): Signal level of the frame(s).
+        threshold (float): Minimum cosine similarity.
+
+    Returns:
+        tuple: (matches, scores); booleans and similarities, scalars or arrays like chroma.
+    """
+    scores = chroma @ template
+    strongest = chroma.max(axis=-1)
+    # all chord tones must sound, not just a louder subset of them
+    present = (chroma[..., tones] >= NOTE_PRESENCE * np.expand_dims(strongest, -1)).all(axis=-1)
+    return (scores >= threshold) & present & (rms >= NOISE_FLOOR), scores
+
+
+class ChordVerifier:
+    """
+    Streaming check that the current chord is played.
+
+    A chord counts as played once `hold` analyses in a row match, so a single
+    strum of a different chord that happens to share notes is not enough.
+    """
+
+    def __init__(self, notes, hold=3, threshold=MATCH_THRESHOLD):
+        """
+        Args:
+            notes (list): Chord notes to listen for.
+            hold (int): Matching analyses in a row needed.
+            threshold (float): Minimum cosine similarity.
+        """
+        self.template = chord_template(notes)
+        self.tones = chord_tones(notes)
+        self.hold = hold
+        self.threshold = threshold
+        self.streak = 0
+        self.score = 0.0
+
+    def feed(self, chroma, rms):
+        """
+        Add one analysis.
+
+        Args:
+            chroma (np.ndarray): Unit chroma vector.
+            rms (float): Signal level.
+
+        Returns:
+            bool: True once the chord has been heard for `hold` analyses.
+        """
+        matched, self.score = match_chord(chroma, self.template, self.tones, rms, self.threshold)
+        self.streak = self.streak + 1 if matched else 0
+        return self.streak >= self.hold
@@ -0,0 +1,412 @@
+import asyncio
+import json
+import math
+import os
+import random
+import config
+from collections import Counter
+from urllib.parse import parse_qs, urlsplit
+from utils.chord_keys import ChordKeyIndex
+from utils.session_engine import MAX_HISTORY, TIMER_INTERVAL_MS, TrainerSession
+from utils.tunings import chord_fingering, get_tuning
+from utils.websocket import (OP_CLOSE, OP_PING, OP_PONG, OP_TEXT, WebSocketError, encode_frame, handshake_response,
+                             read_frame, read_http_head)
+
+
+SEND_BUFFER_LIMIT = 256 * 1024   # a student this far behind is dropped instead of holding up the class
+MIN_TIMER_MS = 500
+PAGES = {"/": "student.html", "/teacher": "teacher.html"}
+
+
+def _timer_interval(request, default):
+    """Return the 'interval_ms' of a timer request (at least MIN_TIMER_MS), or None if it is not a whole number."""
+    value = request.get("interval_ms", default)
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value) or value != int(value):
+        return None
+    return max(MIN_TIMER_MS, int(value))
+
+
+class Student:
+    """
+    One connected student: a TrainerSession and the connection it is mirrored to.
+
+    Attributes:
+        student_id (int): Number of the connection, unique per server run.
+        name (str): Name the student gave, for the teacher's overview.
+        session (TrainerSession): The student's own chord history.
+        writer (asyncio.StreamWriter): The WebSocket connection.
+        timer (asyncio.Task or None): Automatic advancing of this student, if started.
+    """
+
+    def __init__(self, student_id, name, session, writer):
+        self.student_id = student_id
+        self.name = name
+        self.session = session
+        self.writer = writer
+        self.timer = None
+
+
+class ClassroomServer:
+    """
+    Serves many trainer sessions at once over HTTP and WebSocket, for a class
+    practicing on their own devices.
+
+    Every student connection (/ws) gets its own TrainerSession and can step
+    through chords on its own. Teacher connections (/ws/teacher) push a chord
+    to everybody at once: the message is encoded once and written to every
+    connection, so a broadcast costs one JSON encoding plus a buffer copy per
+    student. All sessions share the chord list and its lookup index. The
+    server runs on a single asyncio event loop; nothing blocks it except the
+    per-message work, which is a few microseconds.
+
+    Protocol: clients send JSON objects with an 'action' and optionally an 'id'
+    that is echoed in the reply. Students: next, previous, forward, show
+    (with 'chord'), timer (with 'enabled' and optionally 'interval_ms') and
+    state. Teachers: next, show, difficulty (with 'level'), timer and status.
+    """
+
+    def __init__(self, library, difficulty="easy", tuning=None, max_history=MAX_HISTORY,
+                 timer_interval_ms=TIMER_INTERVAL_MS, teacher_key=None, seed=None, page_dir=None):
+        """
+        Args:
+            library (dict): Chord data grouped by difficulty level.
+            difficulty (str): Level the class starts with.
+            tuning (Tuning, optional): Tuning of the fingerings sent; standard tuning if omitted.
+            max_history (int): History length of every session.
+            timer_interval_ms (int): Default time between two chords of the timers.
+            teacher_key (str, optional): Required as 'key' query parameter of teacher connections.
+            seed (int, optional): Seed of the random chord order, for reproducible runs.
+            page_dir (str, optional): Directory of the student and teacher pages.
+        """
+        if not library.get(difficulty):
+            raise ValueError(f"no chords for difficulty {difficulty!r}")
+        self.library = library
+        self.difficulty = difficulty
+        self.tuning = tuning or get_tuning("standard")
+        self.max_history = max_history
+        self.timer_interval_ms = timer_interval_ms
+        self.teacher_key = teacher_key
+        self.page_dir = page_dir or config.CLASSROOM_PAGE_DIR
+        self.students = {}
+        self.teachers = set()
+        self.broadcasts = 0
+        self.server = None
+        self._rng = random.Random(seed)
+        self._next_id = 1
+        self._class_timer = None
+        self._connections = set()
+        self._chord_keys = ChordKeyIndex(library[difficulty])
+        # the teacher's session decides the order of broadcast chords, without repeats
+        self.teacher_session = self.new_session()
+
+    def new_session(self):
+        """
+        Create a session on the class's current chord list.
+
+        Returns:
+            TrainerSession: A fresh session with its own random order.
+        """
+        return TrainerSession(self.library[self.difficulty], self.difficulty, self.max_history,
+                              self.timer_interval_ms, self.tuning, random.Random(self._rng.random()),
+                              self._chord_keys)
+
+    async def start(self, host="127.0.0.1", port=0):
+        """
+        Start listening.
+
+        Args:
+            host (str): Address to bind; the default only accepts local connections.
+            port (int): Port; 0 picks a free one, see the port attribute.
+
+        Returns:
+            asyncio.Server: The listening server.
+        """
+        self.server = await asyncio.start_server(self._handle, host, port, backlog=1024)
+        return self.server
+
+    @property
+    def port(self):
+        """int: Port the server listens on."""
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        """ Stop the timers, close every connection and stop listening. """
+        if self._class_timer is not None:
+            self._class_timer.cancel()
+        if self.server is not None:
+            self.server.close()
+        for student in list(self.students.values()):
+            student.writer.close()
+        for writer in list(self.teachers):
+            writer.close()
+        # the handlers end once their reads see the closed connections
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        if self.server is not None:
+            await self.server.wait_closed()
+
+    def status(self):
+        """
+        Describe the class, for the teacher page and the /status endpoint.
+
+        Returns:
+            dict: 'students', 'teachers', 'difficulty', 'levels', 'broadcasts', 'chord'
+                (last broadcast) and 'showing' (number of students per chord on screen).
+        """
+        return {
+            "students": len(self.students),
+            "teachers": len(self.teachers),
+            "difficulty": self.difficulty,
+            "levels": list(self.library),
+            "broadcasts": self.broadcasts,
+            "chord": self.teacher_session.current,
+            "showing": dict(Counter(s.session.current for s in self.students.values())),
+        }
+
+    async def _handle(self, reader, writer):
+        """Serve one connection: a page, the status or a WebSocket."""
+        self._connections.add(asyncio.current_task())
+        try:
+            start, headers = await read_http_head(reader)
+            url = urlsplit(start[1])
+            query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+            if headers.get("upgrade", "").lower() == "websocket":
+                if url.path == "/ws":
+                    await self._serve_student(reader, writer, headers, query)
+                elif url.path == "/ws/teacher" and self.teacher_key in (None, query.get("key")):
+                    await self._serve_teacher(reader, writer, headers)
+                else:
+                    self._respond(writer, "403 Forbidden", "text/plain", b"forbidden")
+            elif start[0] != "GET":
+                self._respond(writer, "405 Method Not Allowed", "text/plain", b"method not allowed")
+            elif url.path == "/status":
+                self._respond(writer, "200 OK", "application/json", json.dumps(self.status()).encode("utf-8"))
+            elif url.path in PAGES:
+                with open(os.path.join(self.page_dir, PAGES[url.path]), "rb") as f:
+                    self._respond(writer, "200 OK", "text/html; charset=utf-8", f.read())
+            else:
+                self._respond(writer, "404 Not Found", "text/plain", b"not found")
+            await writer.drain()
+        except (WebSocketError, ConnectionError, OSError):
+            pass
+        finally:
+            writer.close()
+            self._connections.discard(asyncio.current_task())
+
+    def _respond(self, writer, status, content_type, body):
+        """Write a complete HTTP response; the connection is closed afterwards."""
+        writer.write((f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                      f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n").encode("ascii") + body)
+
+    def _send(self, writer, message):
+        """
+        Queue a JSON message or a prepared frame on a connection.
+
+        Returns False and closes the connection if the peer stopped reading,
+        so one stuck client cannot make the server buffer without limit.
+        """
+        if writer.transport.is_closing():
+            return False
+        if writer.transport.get_write_buffer_size() > SEND_BUFFER_LIMIT:
+            writer.close()
+            return False
+        writer.write(message if isinstance(message, bytes) else encode_frame(json.dumps(message)))
+        return True
+
+    async def _messages(self, reader, writer):
+        """Yield the JSON requests of a WebSocket until it closes; pings are answered here."""
+        while True:
+            opcode, payload = await read_frame(reader)
+            if opcode == OP_CLOSE:
+                self._send(writer, encode_frame(payload[:2], OP_CLOSE))
+                return
+            if opcode == OP_PING:
+                self._send(writer, encode_frame(payload, OP_PONG))
+                continue
+            if opcode != OP_TEXT:
+                continue
+            try:
+                request = json.loads(payload)
+            except ValueError:
+                request = None
+            yield request if isinstance(request, dict) else {}
+            # replies queue up in the transport; waiting here lets slow readers slow down only themselves
+            await writer.drain()
+
+    async def _serve_student(self, reader, writer, headers, query):
+        """Run one student's session for as long as the connection is open."""
+        writer.write(handshake_response(headers))
+        student = Student(self._next_id, query.get("name", ""), self.new_session(), writer)
+        self._next_id += 1
+        self.students[student.student_id] = student
+        try:
+            if self.teacher_session.current:
+                student.session.advance(student.session.chord_keys.get(self.teacher_session.current))
+            else:
+                student.session.advance()
+            self._send(writer, self.student_state(student, "state"))
+            async for request in self._messages(reader, writer):
+                self._send(writer, self.handle_student(student, request))
+        finally:
+            if student.timer is not None:
+                student.timer.cancel()
+            del self.students[student.student_id]
+
+    def student_state(self, student, kind, request_id=None):
+        """
+        Build the message describing a student's session.
+
+        Args:
+            student (Student): The student.
+            kind (str): Message type, e.g. 'state' or 'timer'.
+            request_id (object, optional): Id of the request answered.
+
+        Returns:
+            dict: The message.
+        """
+        message = {"type": kind, "id": request_id, "student": student.student_id}
+        message.update(student.session.state())
+        return message
+
+    def handle_student(self, student, request):
+        """
+        Apply one student request to the student's session.
+
+        Args:
+            student (Student): The student who sent it.
+            request (dict): The decoded request.
+
+        Returns:
+            dict: The reply, a 'state' message or an 'error' with a reason.
+        """
+        session = student.session
+        action = request.get("action")
+        request_id = request.get("id")
+        if action == "next":
+            session.advance()
+        elif action == "previous":
+            if session.back() is None:
+                return {"type": "error", "id": request_id, "error": "no_more_back"}
+        elif action == "forward":
+            if session.forward() is None:
+                return {"type": "error", "id": request_id, "error": "already_latest"}
+        elif action == "show":
+            chord = session.chord_keys.get(str(request.get("chord", "")))
+            if chord is None:
+                return {"type": "error", "id": request_id, "error": "unknown_chord"}
+            session.advance(chord)
+        elif action == "timer":
+            interval = _timer_interval(request, session.timer_interval_ms)
+            if request.get("enabled") and interval is None:
+                return {"type": "error", "id": request_id, "error": "bad_interval"}
+            if student.timer is not None:
+                student.timer.cancel()
+                student.timer = None
+            if request.get("enabled"):
+                session.timer_interval_ms = interval
+                student.timer = asyncio.ensure_future(self._run_student_timer(student))
+        elif action != "state":
+            return {"type": "error", "id": request_id, "error": "unknown_action"}
+        return self.student_state(student, "state", request_id)
+
+    async def _run_student_timer(self, student):
+        """Advance one student's session every timer interval."""
+        while True:
+            await asyncio.sleep(student.session.timer_interval_ms / 1000)
+            student.session.advance()
+            self._send(student.writer, self.student_state(student, "timer"))
+
+    async def _serve_teacher(self, reader, writer, headers):
+        """Take broadcast commands from a teacher for as long as the connection is open."""
+        writer.write(handshake_response(headers))
+        self.teachers.add(writer)
+        try:
+            self._send(writer, dict(self.status(), type="status"))
+            async for request in self._messages(reader, writer):
+                self._send(writer, self.handle_teacher(request))
+        finally:
+            self.teachers.discard(writer)
+
+    def handle_teacher(self, request):
+        """
+        Apply one teacher request to the whole class.
+
+        Args:
+            request (dict): The decoded request.
+
+        Returns:
+            dict: The reply, a 'broadcast' or 'status' message or an 'error'.
+        """
+        action = request.get("action")
+        request_id = request.get("id")
+        if action == "next":
+            chord = self.teacher_session.pick_next_chord()
+        elif action == "show":
+            chord = self.teacher_session.chord_keys.get(str(request.get("chord", "")))
+            if chord is None:
+                return {"type": "error", "id": request_id, "error": "unknown_chord"}
+        elif action == "difficulty":
+            level = request.get("level")
+            if not self.library.get(level):
+                return {"type": "error", "id": request_id, "error": "unknown_difficulty"}
+            self.set_difficulty(level)
+            chord = self.teacher_session.pick_next_chord()
+        elif action == "timer":
+            interval = _timer_interval(request, self.timer_interval_ms)
+            if request.get("enabled") and interval is None:
+                return {"type": "error", "id": request_id, "error": "bad_interval"}
+            if self._class_timer is not None:
+                self._class_timer.cancel()
+                self._class_timer = None
+            if request.get("enabled"):
+                self.timer_interval_ms = interval
+                self._class_timer = asyncio.ensure_future(self._run_class_timer())
+            return dict(self.status(), type="status", id=request_id, timer=self._class_timer is not None)
+        elif action == "status":
+            return dict(self.status(), type="status", id=request_id)
+        else:
+            return {"type": "error", "id": request_id, "error": "unknown_action"}
+        sent = self.broadcast(chord)
+        return {"type": "broadcast", "id": request_id, "seq": self.broadcasts, "chord": chord["name"], "students": sent}
+
+    def set_difficulty(self, level):
+        """
+        Switch the whole class to another difficulty; every history starts over.
+
+        Args:
+            level (str): Difficulty level of the library.
+        """
+        self.difficulty = level
+        self._chord_keys = ChordKeyIndex(self.library[level])
+        for session in [self.teacher_session] + [s.session for s in self.students.values()]:
+            session.set_chords(self.library[level], level, self._chord_keys)
+            session.clear_history()
+
+    def broadcast(self, chord):
+        """
+        Show a chord to every student at the same time.
+
+        Args:
+            chord (dict): The chord, from the class's chord list.
+
+        Returns:
+            int: Number of students it was sent to.
+        """
+        self.teacher_session.advance(chord)
+        self.broadcasts += 1
+        fingering, fingers = chord_fingering(chord, self.tuning)
+        frame = encode_frame(json.dumps({"type": "broadcast", "seq": self.broadcasts, "chord": chord["name"].strip(),
+                                         "fingering": fingering, "fingers": fingers,
+                                         "chord_notes": chord.get("chord_notes", [])}))
+        sent = 0
+        for student in list(self.students.values()):
+            student.session.advance(chord)
+            sent += self._send(student.writer, frame)
+        for writer in list(self.teachers):
+            self._send(writer, frame)
+        return sent
+
+    async def _run_class_timer(self):
+        """Broadcast the next chord every timer interval."""
+        while True:
+            await asyncio.sleep(self.timer_interval_ms / 1000)
+            self.broadcast(self.teacher_session.pick_next_chord())
@@ -0,0 +1,141 @@
+import numpy as np
+
+
+LEVELS = ["easy", "medium", "hard"]
+
+# scores below the first threshold are easy, below the second medium, the rest hard
+DEFAULT_THRESHOLDS = (3.0, 5.5)
+
+SPAN_WEIGHT = 1.0
+BARRE_WEIGHT = 1.5
+FRETTED_STRING_WEIGHT = 0.75
+POSITION_WEIGHT = 0.25
+PINKY_WEIGHT = 0.75
+FINGER_STRETCH_WEIGHT = 0.5
+
+
+def _shape_arrays(chords):
+    """
+    Parse fingering and fingers of all chords into int arrays.
+
+    Identical (fingering, fingers) pairs are parsed only once.
+
+    Args:
+        chords (list): Chord dictionaries.
+
+    Returns:
+        tuple: (frets, fingers, shape_ids); frets and fingers have one row per
+            distinct shape (-1 for muted or missing strings), shape_ids maps each chord to its row.
+    """
+    shapes = {}
+    shape_ids = np.fromiter(
+        (shapes.setdefault((tuple(c.get("fingering", ())), tuple(c.get("fingers", ()))), len(shapes)) for c in chords),
+        dtype=np.int32, count=len(chords))
+    width = max((max(len(f), len(n)) for f, n in shapes), default=0)
+    frets = np.full((len(shapes), width), -1, dtype=np.int16)
+    fingers = np.full((len(shapes), width), -1, dtype=np.int16)
+    for row, (fingering, finger_numbers) in enumerate(shapes):
+        frets[row, :len(fingering)] = [int(f) if str(f).strip().isdigit() else -1 for f in fingering]
+        fingers[row, :len(finger_numbers)] = [int(f) if str(f).strip().isdigit() else -1 for f in finger_numbers]
+    return frets, fingers, shape_ids
+
+
+def score_shapes(frets, fingers):
+    """
+    Compute difficulty scores for fret/finger arrays.
+
+    The score grows with the fret span, barres, the number of fretted strings,
+    the position up the neck, use of the pinky and fingers spread over more
+    frets than the hand naturally covers.
+
+    Args:
+        frets (np.ndarray): Fret per string, shape (N, strings), -1 for muted.
+        fingers (np.ndarray): Finger per string, same shape, 0 or -1 if unknown.
+
+    Returns:
+        np.ndarray: One float score per row, higher is harder.
+    """
+    fretted = frets > 0
+    fretted_count = fretted.sum(axis=1)
+    highest = np.where(fretted, frets, 0).max(axis=1, initial=0)
+    lowest = np.where(fretted, frets, 99).min(axis=1, initial=99)
+    lowest = np.where(fretted_count > 0, lowest, 0)
+    span = np.where(fretted_count > 0, highest - lowest, 0)
+
+    # barre: one finger on several strings, or without finger data several strings on the lowest fret
+    finger_ids = np.arange(1, 5)[:, None, None]
+    strings_per_finger = ((fingers[None] == finger_ids) & fretted[None]).sum(axis=2)
+    finger_barre = (strings_per_finger >= 2).any(axis=0)
+    has_fingers = (fingers > 0).any(axis=1)
+    shape_barre = (fretted & (frets == lowest[:, None])).sum(axis=1) >= 2
+    barre = np.where(has_fingers, finger_barre, shape_barre & (fretted_count >= 3))
+
+    pinky = ((fingers == 4) & fretted).any(axis=1)
+
+    # neighbouring fingers should sit about one fret apart, starting with the lowest finger on the lowest fret
+    used = (fingers > 0) & fretted
+    first_finger = np.where(used, fingers, 5).min(axis=1, initial=5)
+    expected = lowest[:, None] + fingers - first_finger[:, None]
+    stretch = np.where(used, np.abs(frets - expected), 0).max(axis=1, initial=0)
+
+    return (SPAN_WEIGHT * span
+            + BARRE_WEIGHT * barre
+            + FRETTED_STRING_WEIGHT * fretted_count
+            + POSITION_WEIGHT * np.maximum(lowest - 1, 0)
+            + PINKY_WEIGHT * pinky
+            + FINGER_STRETCH_WEIGHT * stretch).astype(np.float32)
+
+
+def score_chords(chords):
+    """
+    Compute difficulty scores for a list of chords in one pass.
+
+    Args:
+        chords (list): Chord dictionaries with 'fingering' and 'fingers'.
+
+    Returns:
+        np.ndarray: One float score per chord.
+    """
+    if not chords:
+        return np.zeros(0, dtype=np.float32)
+    frets, fingers, shape_ids = _shape_arrays(chords)
+    return score_shapes(frets, fingers)[shape_ids]
+
+
+def levels_for_scores(scores, thresholds=DEFAULT_THRESHOLDS):
+    """
+    Map difficulty scores to level names.
+
+    Args:
+        scores (np.ndarray): Scores from score_chords.
+        thresholds (tuple): Upper bounds of the easy and medium levels.
+
+    Returns:
+        list: Level name per score.
+    """
+    indices = np.searchsorted(np.asarray(thresholds), scores, side="right")
+    return [LEVELS[i] for i in indices.tolist()]
+
+
+def rebucket(data, thresholds=DEFAULT_THRESHOLDS):
+    """
+    Sort every chord of a chord pack into the level its computed score suggests.
+
+    Args:
+        data (dict): Chord data grouped by difficulty level.
+        thresholds (tuple): Upper bounds of the easy and medium levels.
+
+    Returns:
+        tuple: (new_data, moves) where moves lists (name, old_level, new_level, score).
+    """
+    chords = [(level, chord) for level, level_chords in data.items() for chord in level_chords]
+    scores = score_chords([chord for _, chord in chords])
+    new_levels = levels_for_scores(scores, thresholds)
+
+    new_data = {level: [] for level in LEVELS}
+    moves = []
+    for (old_level, chord), new_level, score in zip(chords, new_levels, scores.tolist()):
+        new_data[new_level].append(chord)
+        if new_level != old_level:
+            moves.append((chord["name"], old_level, new_level, score))
+    return new_data, moves
@@ -0,0 +1,192 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+
+DEBOUNCE_SECONDS = 0.3   # quiet time after the last event before the callback runs
+MAX_DELAY_SECONDS = 2.0  # a steady stream of events still triggers the callback this often
+POLL_SECONDS = 1.0
+
+# inotify constants from <sys/inotify.h>
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def _load_inotify():
+    """Return libc if it provides inotify, else None."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        libc.inotify_init1  # noqa: B018 - raises AttributeError without inotify
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class FileWatcher:
+    """
+    Watch files and directories and report changes after they settle.
+
+    Uses inotify on Linux and falls back to polling modification times
+    elsewhere. Bursts of events (an editor writing a file in several steps, or
+    several quick saves) are coalesced into a single callback.
+    """
+
+    def __init__(self, paths, callback, debounce=DEBOUNCE_SECONDS, poll_interval=POLL_SECONDS, use_inotify=True):
+        """
+        Args:
+            paths (list): Files and directories to watch. For directories every *.json file counts.
+            callback (callable): Called from the watcher thread with the set of changed paths.
+            debounce (float): Quiet time in seconds before the callback runs.
+            poll_interval (float): Seconds between checks when polling.
+            use_inotify (bool): Use inotify where available.
+        """
+        self.paths = [os.path.abspath(p) for p in paths]
+        self.callback = callback
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self._libc = _load_inotify() if use_inotify else None
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def mode(self):
+        """'inotify' or 'polling'."""
+        return "inotify" if self._libc else "polling"
+
+    def start(self):
+        """Start watching in a daemon thread."""
+        self._stop.clear()
+        target = self._run_inotify if self._libc else self._run_polling
+        self._thread = threading.Thread(target=target, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop watching and wait for the thread to end."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def _matches(self, path):
+        """Check whether a changed path is one of the watched files or inside a watched directory."""
+        for watched in self.paths:
+            if path == watched:
+                return True
+            if os.path.dirname(path) == watched and path.endswith(".json"):
+                return True
+        return False
+
+    def _settle(self, pending, wait_for_events):
+        """
+        Collect events until none arrived for the debounce time, then run the callback.
+
+        Args:
+            pending (set): Paths changed so far.
+            wait_for_events (callable): Takes a timeout, returns newly changed paths.
+        """
+        first = last = time.monotonic()
+        while not self._stop.is_set():
+            now = time.monotonic()
+            if now - last >= self.debounce or now - first >= MAX_DELAY_SECONDS:
+                break
+            more = wait_for_events(min(self.debounce - (now - last), MAX_DELAY_SECONDS - (now - first)))
+            if more:
+                pending |= more
+                last = time.monotonic()
+        if pending and not self._stop.is_set():
+            self.callback(pending)
+
+    def _snapshot(self):
+        """Return {path: (mtime_ns, size)} of everything watched."""
+        stamps = {}
+        for watched in self.paths:
+            files = [watched]
+            if os.path.isdir(watched):
+                files = [os.path.join(watched, f) for f in os.listdir(watched) if f.endswith(".json")]
+            for path in files:
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                stamps[path] = (stat.st_mtime_ns, stat.st_size)
+        return stamps
+
+    def _run_polling(self):
+        """Compare modification times at a fixed interval."""
+        snapshot = self._snapshot()
+
+        def poll(timeout):
+            nonlocal snapshot
+            self._stop.wait(timeout)
+            current = self._snapshot()
+            changed = {p for p in current.keys() | snapshot.keys() if current.get(p) != snapshot.get(p)}
+            snapshot = current
+            return changed
+
+        while not self._stop.is_set():
+            changed = poll(self.poll_interval)
+            if changed:
+                self._settle(changed, lambda timeout: poll(max(timeout, self.poll_interval / 4)))
+
+    def _run_inotify(self):
+        """Wait for inotify events on the watched directories."""
+        fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            self._libc = None
+            self._run_polling()
+            return
+
+        # files are watched through their directory, so atomic replaces (write + rename) are seen too
+        directories = {}
+        for watched in self.paths:
+            directory = watched if os.path.isdir(watched) else os.path.dirname(watched)
+            if directory in directories.values() or not os.path.isdir(directory):
+                continue
+            wd = self._libc.inotify_add_watch(fd, os.fsencode(directory), WATCH_MASK)
+            if wd >= 0:
+                directories[wd] = directory
+
+        def read_events(timeout):
+            ready, _, _ = select.select([fd], [], [], max(timeout, 0))
+            if not ready:
+                return set()
+            try:
+                buffer = os.read(fd, 64 * 1024)
+            except BlockingIOError:
+                return set()
+            changed = set()
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(buffer):
+                wd, _, _, length = _EVENT_HEADER.unpack_from(buffer, offset)
+                offset += _EVENT_HEADER.size
+                name = buffer[offset:offset + length].rstrip(b"\0")
+                offset += length
+                if wd in directories and name:
+                    path = os.path.join(directories[wd], os.fsdecode(name))
+                    if self._matches(path):
+                        changed.add(path)
+            return changed
+
+        try:
+            while not self._stop.is_set():
+                changed = read_events(0.5)
+                if changed:
+                    self._settle(changed, read_events)
+        finally:
+            os.close(fd)
@@ -0,0 +1,265 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+
+FINGERS = (1, 2, 3, 4)
+MAX_SPAN = 4               # frets one hand position can cover
+
+STRETCH_COST = 1.0         # per fret a finger sits away from its natural fret
+PINKY_COST = 0.75
+BARRE_COST = 0.5           # index finger barre, other fingers pay three times as much
+POSITION_SHIFT_COST = 0.5  # per fret the hand leaves first position while open strings ring
+
+PARALLEL_THRESHOLD = 2000  # distinct shapes needed before a process pool pays off
+
+
+def _parse(fingering):
+    """Convert a fingering into ints, -1 for muted or unreadable strings."""
+    return tuple(int(f) if str(f).strip().isdigit() else -1 for f in fingering)
+
+
+def normalize_shape(fingering):
+    """
+    Reduce a fingering to the shape the solution depends on.
+
+    Closed shapes are moved down so their lowest fret is 1; shapes with open
+    strings keep their absolute frets because the hand is tied to the nut.
+
+    Args:
+        fingering (list): Fret per string.
+
+    Returns:
+        tuple: (shape, offset) where adding offset to the fretted shape frets restores the fingering.
+    """
+    frets = _parse(fingering)
+    fretted = [f for f in frets if f > 0]
+    if not fretted or 0 in frets:
+        return frets, 0
+    offset = min(fretted) - 1
+    return tuple(f - offset if f > 0 else f for f in frets), offset
+
+
+def _barre_allowed(shape, strings, fret):
+    """Check that every string under a barre is fretted at or above the barre fret."""
+    low, high = min(strings), max(strings)
+    return all(shape[s] >= fret for s in range(low, high + 1))
+
+
+@lru_cache(maxsize=4096)
+def _solve_shape(shape):
+    """
+    Find the cheapest finger assignment for a normalized shape.
+
+    Fretted notes are assigned in order of rising fret with a depth-first
+    branch and bound: a branch is dropped as soon as its cost reaches the best
+    complete assignment found so far.
+
+    Args:
+        shape (tuple): Normalized fret per string.
+
+    Returns:
+        tuple or None: Finger per string (0 for open/muted), or None if unplayable.
+    """
+    notes = sorted((fret, string) for string, fret in enumerate(shape) if fret > 0)
+    if not notes:
+        return tuple(0 for _ in shape)
+    lowest, highest = notes[0][0], notes[-1][0]
+    if highest - lowest >= MAX_SPAN:
+        return None
+
+    has_open = 0 in shape
+    best_cost = float("inf")
+    best = None
+
+    for position in range(max(1, highest - MAX_SPAN + 1), lowest + 1):
+        shift_cost = POSITION_SHIFT_COST * (position - 1) if has_open else 0.0
+        assignment = {}
+        finger_frets = {}
+        finger_strings = {}
+
+        def search(index, cost):
+            nonlocal best_cost, best
+            if cost >= best_cost:
+                return
+            if index == len(notes):
+                best_cost = cost
+                best = dict(assignment)
+                return
+            fret, string = notes[index]
+            for finger in FINGERS:
+                if finger in finger_frets:
+                    # the same finger again means a barre on the same fret
+                    if finger_frets[finger] != fret:
+                        continue
+                    strings = finger_strings[finger] + [string]
+                    if not _barre_allowed(shape, strings, fret):
+                        continue
+                    extra = BARRE_COST if finger == 1 else 3 * BARRE_COST
+                    if len(finger_strings[finger]) > 1:
+                        extra = 0.0
+                    finger_strings[finger].append(string)
+                    assignment[string] = finger
+                    search(index + 1, cost + extra)
+                    del assignment[string]
+                    finger_strings[finger].pop()
+                    continue
+
+                # notes come in rising fret order, so a higher finger already in use must be on this fret
+                if any(used > finger and used_fret != fret for used, used_fret in finger_frets.items()):
+                    continue
+                natural = fret - position + 1
+                extra = STRETCH_COST * abs(finger - natural)
+                if finger == 4:
+                    extra += PINKY_COST
+                finger_frets[finger] = fret
+                finger_strings[finger] = [string]
+                assignment[string] = finger
+                search(index + 1, cost + extra)
+                del assignment[string]
+                del finger_strings[finger]
+                del finger_frets[finger]
+
+        search(0, shift_cost)
+
+    if best is None:
+        return None
+    return tuple(best.get(string, 0) for string in range(len(shape)))
+
+
+def solve_fingers(fingering):
+    """
+    Suggest which finger (1-4) to put on every fretted string.
+
+    Args:
+        fingering (list): Fret per string.
+
+    Returns:
+        list or None: Finger per string as strings ('0' for open strings), or None if unplayable.
+    """
+    shape, _ = normalize_shape(fingering)
+    solution = _solve_shape(shape)
+    if solution is None:
+        return None
+    return [str(finger) for finger in solution]
+
+
+def check_fingers(fingering, fingers):
+    """
+    Check a hand-written finger assignment for obvious mistakes.
+
+    Args:
+        fingering (list): Fret per string.
+        fingers (list): Finger per string.
+
+    Returns:
+        list: (problem, string_index) tuples; empty if the assignment is playable.
+    """
+    frets = _parse(fingering)
+    numbers = _parse(fingers)
+    problems = []
+    finger_frets = {}
+    finger_strings = {}
+    for string, (fret, finger) in enumerate(zip(frets, numbers)):
+        if fret > 0 and finger not in FINGERS:
+            problems.append(("missing_finger", string))
+        elif fret <= 0 and finger > 0:
+            problems.append(("finger_on_open_string", string))
+        elif fret > 0:
+            finger_strings.setdefault(finger, string)
+            if finger_frets.setdefault(finger, fret) != fret:
+                problems.append(("finger_on_two_frets", string))
+    for finger, fret in finger_frets.items():
+        for other, other_fret in finger_frets.items():
+            if finger < other and fret > other_fret:
+                problems.append(("crossed_fingers", finger_strings[finger]))
+    return problems
+
+
+def _solve_shapes(shapes):
+    """Solve a batch of normalized shapes (used by worker processes)."""
+    return [_solve_shape(shape) for shape in shapes]
+
+
+def solve_many(fingerings, workers=None):
+    """
+    Solve finger assignments for many fingerings, e.g. a whole chord pack.
+
+    Fingerings are reduced to distinct normalized shapes first; large batches of
+    shapes are split over a process pool.
+
+    Args:
+        fingerings (iterable): Fingerings to solve.
+        workers (int, optional): Number of worker processes; defaults to the CPU count.
+
+    Returns:
+        list: One result of solve_fingers per fingering.
+    """
+    shapes = [normalize_shape(f)[0] for f in fingerings]
+    unique = list(dict.fromkeys(shapes))
+
+    if len(unique) >= PARALLEL_THRESHOLD and workers != 1:
+        chunk = max(1, len(unique) // ((workers or os.cpu_count() or 1) * 4))
+        batches = [unique[i:i + chunk] for i in range(0, len(unique), chunk)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            solved = [s for batch in pool.map(_solve_shapes, batches) for s in batch]
+    else:
+        solved = _solve_shapes(unique)
+
+    solutions = dict(zip(unique, solved))
+    return [None if solutions[s] is None else [str(f) for f in solutions[s]] for s in shapes]
+
+
+def verify_fingers(fingering, fingers):
+    """
+    Check a hand-written finger assignment and compare it with the solver.
+
+    Args:
+        fingering (list): Fret per string.
+        fingers (list): Finger per string.
+
+    Returns:
+        tuple: (problems, suggestion) where problems are (problem, string_index)
+            tuples as in check_fingers, plus ('unplayable', None) if the solver
+            finds no assignment at all, and suggestion is the solver's finger
+            list when there are problems and the shape can be played, else None.
+    """
+    problems = check_fingers(fingering, fingers)
+    solution = solve_fingers(fingering)
+    if solution is None:
+        problems.append(("unplayable", None))
+    return problems, (solution if problems else None)
+
+
+def _verify_batch(pairs):
+    """Verify a batch of (fingering, fingers) pairs (used by worker processes)."""
+    return [verify_fingers(fingering, fingers) for fingering, fingers in pairs]
+
+
+def verify_many(pairs, workers=None):
+    """
+    Verify the finger numbers of many chords, e.g. a whole chord pack.
+
+    Repeated (fingering, fingers) pairs are only checked once; large batches
+    are split over a process pool like in solve_many().
+
+    Args:
+        pairs (iterable): (fingering, fingers) per chord.
+        workers (int, optional): Number of worker processes; defaults to the CPU count.
+
+    Returns:
+        list: One result of verify_fingers per pair.
+    """
+    keys = [(tuple(fingering), tuple(fingers)) for fingering, fingers in pairs]
+    unique = list(dict.fromkeys(keys))
+
+    if len(unique) >= PARALLEL_THRESHOLD and workers != 1:
+        chunk = max(1, len(unique) // ((workers or os.cpu_count() or 1) * 4))
+        batches = [unique[i:i + chunk] for i in range(0, len(unique), chunk)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            verified = [v for batch in pool.map(_verify_batch, batches) for v in batch]
+    else:
+        verified = _verify_batch(unique)
+
+    results = dict(zip(unique, verified))
+    return [results[key] for key in keys]
@@ -1,12 +1,45 @@
 import json
 import os
+import re
 import webbrowser
 import config
 from tkinter import messagebox
 from version import __VERSION__
+from utils.chord_store import get_chord_store
+from utils.chord_packs import get_pack_library
+from utils.tracing import traced
 
 
-def load_chords(lang, filter_by_difficulty=True):
+@traced("loader.load_chords")
+def load_chords(lang, filter_by_difficulty=True, include_packs=True):
+    """
+    Load chords from the chord file (or library) with the chord packs merged on top.
+
+    Args:
+        lang (dict): Language strings used for error messages.
+        filter_by_difficulty (bool): Return only the chords of config.DIFFICULTY.
+        include_packs (bool): Merge the packs from config.CHORD_PACK_DIR; the editor only edits the base file.
+
+    Returns:
+        list or dict: Chords of the active difficulty, or all chords grouped by difficulty.
+    """
+    chords = load_base_chords(lang, filter_by_difficulty)
+    if not include_packs or not os.path.isdir(config.CHORD_PACK_DIR):
+        return chords
+
+    library = get_pack_library(config.CHORD_PACK_DIR, config.DISABLED_PACKS)
+    for path, error in library.errors.items():
+        print(lang["error_chord_pack"].format(path=path, error=error))
+    if filter_by_difficulty:
+        return library.merge({config.DIFFICULTY: chords}).get(config.DIFFICULTY, [])
+    return library.merge(chords)
+
+
+@traced("loader.load_base_chords")
+def load_base_chords(lang, filter_by_difficulty=True):
+    if config.CHORD_STORAGE == "sqlite":
+        return load_chords_from_store(lang, filter_by_difficulty)
+
     if not os.path.exists(config.CHORD_PATH):
         print(f"{lang['error_missing_chords_file']}")
         return [] if filter_by_difficulty else {}
@@ -23,6 +56,43 @@ def load_chords(lang, filter_by_difficulty=True):
     return data
 
 
+def load_chords_from_store(lang, filter_by_difficulty=True):
+    """
+    Load chords from the SQLite chord library; only the active difficulty is read when filtering.
+
+    Args:
+        lang (dict): Language strings used for error messages.
+        filter_by_difficulty (bool): Return only the chords of config.DIFFICULTY.
+
+    Returns:
+        list or dict: Chords of the active difficulty, or all chords grouped by difficulty.
+    """
+    if not os.path.exists(config.CHORD_DB_PATH):
+        print(f"{lang['error_missing_chords_file']}")
+        return [] if filter_by_difficulty else {}
+
+    store = get_chord_store(config.CHORD_DB_PATH)
+    if filter_by_difficulty:
+        chords = store.load_level(config.DIFFICULTY)
+        if not chords:
+            print(f"{lang['error_no_chords_for_difficulty']} ({config.DIFFICULTY})")
+        return chords
+    return store.export_data()
+
+
+def json_dumps_compact_lists(data):
+    """Serialize chord data to JSON with every string list kept on one line."""
+    text = json.dumps(data, ensure_ascii=False, indent=4)
+    pattern = re.compile(r'\[\s*(\".*?\"(?:,\s*\".*?\")*)\s*\]', re.DOTALL)
+
+    def replacer(match):
+        content = match.group(1)
+        compact = content.replace('\n', '').replace(' ', '')
+        return f'[{compact}]'
+
+    return pattern.sub(replacer, text)
+
+
 def show_info(lang):
     info_text = (
         f"{lang['info_title']}\n"
@@ -39,6 +109,29 @@ def show_tutorial(lang):
     messagebox.showinfo(lang["short_manual_title"], text)
     
 
+def show_practice_stats(lang, practice_log):
+    """
+    Show the slowest chords and the weekly progress from the practice log.
+
+    Args:
+        lang (dict): Language strings.
+        practice_log (PracticeLog or None): The practice log; None if it is turned off.
+    """
+    if practice_log is not None:
+        practice_log.flush()
+    if practice_log is None or not practice_log.total_shown():
+        messagebox.showinfo(lang["practice_stats_title"], lang["practice_stats_empty"])
+        return
+    lines = [lang["practice_stats_total"].format(count=practice_log.total_shown()), "",
+             lang["practice_stats_weakest"]]
+    for chord, shown, mean in practice_log.weakest_chords():
+        lines.append(f"  {chord}: {mean:.1f} s ({shown}x)")
+    lines += ["", lang["practice_stats_weeks"]]
+    for week, shown, mean in practice_log.weekly_progress()[-8:]:
+        lines.append(f"  {week}: {shown}x, {mean:.1f} s")
+    messagebox.showinfo(lang["practice_stats_title"], "\n".join(lines))
+
+
 def open_github():
     webbrowser.open("https://github.com/Ma-Ko-dev/UkuleleAkkordtrainer")
 
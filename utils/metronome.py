@@ -0,0 +1,215 @@
+import queue
+from functools import lru_cache
+from typing import NamedTuple
+import numpy as np
+from utils.synth import SAMPLE_RATE, render_chord
+
+
+SUBDIVISIONS_PER_BEAT = 2     # one pattern step per eighth note
+CLICK_SECONDS = 0.03
+CLICK_VOLUME = 0.6
+STRUM_VOLUME = 0.5
+STRUM_SECONDS = 1.0
+# one character per eighth note: D = down strum, U = up strum, - = rest
+STRUM_PATTERNS = {
+    "quarters": "D-D-D-D-",
+    "folk": "D-DU-UDU",
+    "eighths": "DUDUDUDU",
+    "clicks": "--------",
+}
+
+
+class ChordChange(NamedTuple):
+    """
+    A chord change on the audio timeline.
+
+    Attributes:
+        sample (int): Sample position of the change since the engine started.
+        time (float or None): Stream time the change is heard at, None when rendering offline.
+        payload (object): What was passed to queue_chord(), e.g. the chord dict.
+    """
+    sample: int
+    time: object
+    payload: object
+
+
+def click_sound(frequency, sample_rate=SAMPLE_RATE):
+    """
+    Render one metronome click: a short sine burst with a fast decay.
+
+    Args:
+        frequency (float): Pitch of the click in Hz.
+        sample_rate (int): Samples per second.
+
+    Returns:
+        np.ndarray: Read-only float32 samples.
+    """
+    t = np.arange(int(sample_rate * CLICK_SECONDS)) / sample_rate
+    click = (np.sin(2 * np.pi * frequency * t) * np.exp(-t * 150) * CLICK_VOLUME).astype(np.float32)
+    click.flags.writeable = False
+    return click
+
+
+def strum_sounds(pitches, sample_rate=SAMPLE_RATE):
+    """
+    Render the down and up strum of a voicing at strum volume.
+
+    Args:
+        pitches (list): MIDI pitches of the voicing; empty for no strums.
+        sample_rate (int): Samples per second.
+
+    Returns:
+        dict: Read-only float32 samples per pattern character ('D', 'U'), empty without pitches.
+    """
+    return _strum_sounds(tuple(pitches), sample_rate) if pitches else {}
+
+
+@lru_cache(maxsize=64)
+def _strum_sounds(pitches, sample_rate):
+    """Cached part of strum_sounds(); the result is shared, so it must not be modified."""
+    strums = {}
+    for stroke, pattern in (("D", "down"), ("U", "up")):
+        strum = (render_chord(pitches, pattern, STRUM_SECONDS, sample_rate) * STRUM_VOLUME).astype(np.float32)
+        strum.flags.writeable = False
+        strums[stroke] = strum
+    return strums
+
+
+class RhythmEngine:
+    """
+    Metronome and strum pattern generator driven by the audio callback.
+
+    render() is called for every block of the output stream. Clicks and strums
+    are mixed in at the exact sample of their step, and chord changes are
+    taken at bar boundaries from the audio side. The GUI only learns about a
+    change through the events queue, together with the stream time it is
+    heard at, so the fretboard follows the audio clock. Strums are rendered
+    when a chord is queued, so the audio callback only mixes ready buffers.
+    """
+
+    def __init__(self, bpm=80, beats_per_bar=4, bars_per_chord=1, pattern="folk",
+                 pitches=(), sample_rate=SAMPLE_RATE):
+        """
+        Args:
+            bpm (float): Beats per minute.
+            beats_per_bar (int): Beats per bar; the first one is accented.
+            bars_per_chord (int): Bars until the next queued chord is taken.
+            pattern (str): Key of STRUM_PATTERNS or a pattern string, one character per eighth note.
+            pitches (tuple): MIDI pitches strummed until the first chord change.
+            sample_rate (int): Samples per second.
+        """
+        self.sample_rate = sample_rate
+        self.beats_per_bar = beats_per_bar
+        self.bars_per_chord = bars_per_chord
+        self.pattern = STRUM_PATTERNS.get(pattern, pattern)
+        self.position = 0
+        self.events = queue.Queue()
+        self._step = 0
+        self._tempo = (0, 0, self._step_length(bpm))
+        self._strums = strum_sounds(pitches, sample_rate)
+        self._upcoming = None
+        self._ringing = []      # (samples, offset) of sounds that continue into the next block
+        self._accent = click_sound(1760, sample_rate)
+        self._click = click_sound(1320, sample_rate)
+
+    def _step_length(self, bpm):
+        """Samples per pattern step; kept as a float so rounding never accumulates."""
+        return self.sample_rate * 60.0 / bpm / SUBDIVISIONS_PER_BEAT
+
+    @property
+    def bpm(self):
+        """float: Current tempo."""
+        return self.sample_rate * 60.0 / self._tempo[2] / SUBDIVISIONS_PER_BEAT
+
+    def set_bpm(self, bpm):
+        """
+        Change the tempo from the next step on, without a jump in the beat.
+
+        Args:
+            bpm (float): Beats per minute.
+        """
+        step = self._step
+        self._tempo = (step, self.step_sample(step), self._step_length(bpm))
+
+    def step_sample(self, step):
+        """
+        Return the sample position of a pattern step.
+
+        Args:
+            step (int): Step number since the start.
+
+        Returns:
+            int: Sample position.
+        """
+        origin_step, origin_sample, length = self._tempo
+        return origin_sample + int(round((step - origin_step) * length))
+
+    def queue_chord(self, payload, pitches):
+        """
+        Set the chord taken at the next chord change (thread-safe). Renders its strums
+        on the calling thread, not in the audio callback.
+
+        Args:
+            payload (object): Passed back in the ChordChange event.
+            pitches (list): MIDI pitches to strum from the change on.
+        """
+        self._upcoming = (payload, strum_sounds(pitches, self.sample_rate))
+
+    def _mix(self, out, sound, offset):
+        """Add sound to the block from offset on and keep the rest ringing."""
+        length = min(len(sound), len(out) - offset)
+        out[offset:offset + length] += sound[:length]
+        if length < len(sound):
+            self._ringing.append((sound, length))
+
+    def render(self, frame_count, block_time=None):
+        """
+        Render the next block of the click and strum track.
+
+        Args:
+            frame_count (int): Samples in the block.
+            block_time (float, optional): Stream time the first sample is heard at
+                (PortAudio's output_buffer_dac_time).
+
+        Returns:
+            np.ndarray: float32 samples.
+        """
+        out = np.zeros(frame_count, dtype=np.float32)
+        ringing, self._ringing = self._ringing, []
+        for sound, offset in ringing:
+            self._mix(out, sound[offset:], 0)
+
+        steps_per_beat = SUBDIVISIONS_PER_BEAT
+        steps_per_bar = self.beats_per_bar * steps_per_beat
+        end = self.position + frame_count
+        while (sample := self.step_sample(self._step)) < end:
+            step = self._step
+            offset = sample - self.position
+            if step and step % (steps_per_bar * self.bars_per_chord) == 0 and self._upcoming is not None:
+                payload, self._strums = self._upcoming
+                self._upcoming = None
+                when = None if block_time is None else block_time + offset / self.sample_rate
+                self.events.put(ChordChange(sample, when, payload))
+            if step % steps_per_beat == 0:
+                self._mix(out, self._accent if step % steps_per_bar == 0 else self._click, offset)
+            strum = self._strums.get(self.pattern[step % len(self.pattern)])
+            if strum is not None:
+                self._mix(out, strum, offset)
+            self._step += 1
+        self.position = end
+        return np.clip(out, -1.0, 1.0, out=out)
+
+    def render_seconds(self, seconds, block=256):
+        """
+        Render a stretch of the track offline, block by block as the stream would.
+
+        Args:
+            seconds (float): Length to render.
+            block (int): Samples per block.
+
+        Returns:
+            np.ndarray: float32 samples.
+        """
+        total = int(seconds * self.sample_rate)
+        blocks = [self.render(min(block, total - start)) for start in range(0, total, block)]
+        return np.concatenate(blocks) if blocks else np.zeros(0, dtype=np.float32)
@@ -0,0 +1,166 @@
+import math
+from typing import NamedTuple
+import numpy as np
+
+
+WINDOW = 4096             # samples per estimate, ~93 ms at 44.1 kHz; many periods even of a baritone D
+MIN_FREQUENCY = 60.0      # below the baritone D string
+MAX_FREQUENCY = 1000.0    # above the open A string with some headroom
+YIN_THRESHOLD = 0.15      # dip in the normalized difference that counts as a period
+NOISE_FLOOR = 1e-3        # RMS below this counts as silence
+MIN_CLARITY = 0.95        # weaker detections, e.g. a fading string in room noise, are not shown
+
+
+def frequency_to_midi(frequency):
+    """
+    Convert a frequency to a fractional MIDI pitch (A4 = 69 = 440 Hz).
+
+    Args:
+        frequency (float): Frequency in Hz.
+
+    Returns:
+        float: MIDI pitch.
+    """
+    return 69 + 12 * math.log2(frequency / 440.0)
+
+
+class PitchDetector:
+    """
+    Fundamental frequency estimation with the YIN algorithm.
+
+    YIN looks for the first lag whose cumulative mean normalized difference
+    dips below a threshold. The difference function is computed for all lags
+    at once from an FFT autocorrelation and running sums of the squared
+    signal, so one estimate is two FFTs and a few vector operations instead
+    of the O(window * lags) loop of the textbook version.
+    """
+
+    def __init__(self, sample_rate, window=WINDOW, fmin=MIN_FREQUENCY, fmax=MAX_FREQUENCY,
+                 threshold=YIN_THRESHOLD):
+        """
+        Args:
+            sample_rate (int): Samples per second.
+            window (int): Samples per estimate.
+            fmin (float): Lowest frequency detected.
+            fmax (float): Highest frequency detected.
+            threshold (float): YIN threshold; lower is stricter.
+        """
+        self.sample_rate = sample_rate
+        self.window = window
+        self.threshold = threshold
+        # lags are compared over the first half of the window, so the longest period is half of it
+        self.max_lag = min(window // 2, int(sample_rate / fmin) + 1)
+        self.min_lag = max(2, int(sample_rate / fmax))
+        self._fft_size = 1 << (window + self.max_lag - 1).bit_length()
+
+    def difference(self, frame):
+        """
+        Compute the YIN difference function d(tau) for tau in 0..max_lag.
+
+        d(tau) = sum over j of (x[j] - x[j + tau])^2 for the first window - max_lag samples,
+        expanded into energy(0) + energy(tau) - 2 * autocorrelation(tau).
+
+        Args:
+            frame (np.ndarray): float samples, window long.
+
+        Returns:
+            np.ndarray: max_lag + 1 float64 values.
+        """
+        frame = np.asarray(frame, dtype=np.float64)
+        width = len(frame) - self.max_lag
+        spectrum = np.fft.rfft(frame, self._fft_size)
+        head = np.fft.rfft(frame[:width], self._fft_size)
+        correlation = np.fft.irfft(spectrum * np.conj(head), self._fft_size)[:self.max_lag + 1]
+        squares = np.concatenate(([0.0], np.cumsum(frame * frame)))
+        energy = squares[width:width + self.max_lag + 1] - squares[:self.max_lag + 1]
+        return np.maximum(energy[0] + energy - 2 * correlation, 0.0)
+
+    def detect(self, samples):
+        """
+        Estimate the fundamental of the last window of samples.
+
+        Args:
+            samples (np.ndarray): float samples; only the last `window` are used.
+
+        Returns:
+            tuple: (frequency, clarity); frequency in Hz or None if there is no clear
+                pitch, clarity between 0 and 1 (1 - the normalized difference at the period).
+        """
+        frame = np.asarray(samples[-self.window:], dtype=np.float64)
+        if len(frame) < self.window or np.sqrt(np.mean(frame * frame)) < NOISE_FLOOR:
+            return None, 0.0
+        diff = self.difference(frame)
+        # cumulative mean normalized difference; lag 0 is 1 by definition
+        lags = np.arange(1, len(diff))
+        running = np.cumsum(diff[1:])
+        normalized = np.ones_like(diff)
+        normalized[1:] = diff[1:] * lags / np.where(running > 0, running, 1)
+
+        below = np.flatnonzero(normalized[self.min_lag:] < self.threshold)
+        if not len(below):
+            return None, 0.0
+        lag = self.min_lag + below[0]
+        # walk down to the bottom of the dip
+        while lag + 1 < len(normalized) and normalized[lag + 1] < normalized[lag]:
+            lag += 1
+        clarity = 1.0 - float(normalized[lag])
+        # parabolic interpolation between the neighbouring lags for sub-sample precision
+        if 0 < lag < len(normalized) - 1:
+            left, middle, right = normalized[lag - 1:lag + 2]
+            curvature = left - 2 * middle + right
+            offset = 0.5 * (left - right) / curvature if curvature > 0 else 0.0
+        else:
+            offset = 0.0
+        return self.sample_rate / (lag + offset), clarity
+
+
+class TunerReading(NamedTuple):
+    """
+    Detected pitch relative to the closest open string.
+
+    Attributes:
+        frequency (float): Detected fundamental in Hz.
+        string (int): Index of the closest open string, top string first.
+        cents (float): Deviation from that string; positive is sharp.
+        clarity (float): Confidence of the detection, 0 to 1.
+    """
+    frequency: float
+    string: int
+    cents: float
+    clarity: float
+
+
+def nearest_string(frequency, open_pitches):
+    """
+    Find the open string a frequency is closest to.
+
+    Args:
+        frequency (float): Frequency in Hz.
+        open_pitches (list): MIDI pitches of the open strings, e.g. Tuning.open_pitches.
+
+    Returns:
+        tuple: (string index, cents deviation).
+    """
+    pitch = frequency_to_midi(frequency)
+    string = min(range(len(open_pitches)), key=lambda i: abs(pitch - open_pitches[i]))
+    return string, (pitch - open_pitches[string]) * 100
+
+
+def tuner_reading(detector, samples, open_pitches, min_clarity=MIN_CLARITY):
+    """
+    Detect the pitch of the last window and relate it to the open strings.
+
+    Args:
+        detector (PitchDetector): The detector to use.
+        samples (np.ndarray): float samples.
+        open_pitches (list): MIDI pitches of the open strings.
+        min_clarity (float): Detections below this clarity are dropped.
+
+    Returns:
+        TunerReading or None: None without a clear pitch.
+    """
+    frequency, clarity = detector.detect(samples)
+    if frequency is None or clarity < min_clarity:
+        return None
+    string, cents = nearest_string(frequency, open_pitches)
+    return TunerReading(frequency, string, cents, clarity)
@@ -0,0 +1,227 @@
+import queue
+import sqlite3
+import threading
+import time
+from utils.chord_keys import stored_name_key
+
+
+SCHEMA_VERSION = 2        # 2: chord keys stored as 'root:quality:bass' text instead of a tuple repr
+BATCH_SIZE = 64           # events written per transaction at most
+FLUSH_SECONDS = 5.0       # pending events are written at least this often
+ADVANCE_REASONS = ("button", "timer", "voice", "history", "quiz", "metronome", "played", "remote")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    started_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    session_id INTEGER NOT NULL REFERENCES sessions(id),
+    shown_at REAL NOT NULL,
+    chord TEXT NOT NULL,
+    chord_key TEXT NOT NULL,
+    dwell REAL NOT NULL,
+    advanced_by TEXT NOT NULL,
+    difficulty TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_chord ON events(chord_key, shown_at);
+CREATE INDEX IF NOT EXISTS events_time ON events(shown_at);
+
+-- per day and chord totals, kept up to date with every batch so analytics never scan the raw events
+CREATE TABLE IF NOT EXISTS daily_stats (
+    day TEXT NOT NULL,
+    chord_key TEXT NOT NULL,
+    chord TEXT NOT NULL,
+    shown INTEGER NOT NULL,
+    dwell_sum REAL NOT NULL,
+    PRIMARY KEY (day, chord_key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS daily_stats_chord ON daily_stats(chord_key, day);
+"""
+
+INSERT_EVENT = ("INSERT INTO events (session_id, shown_at, chord, chord_key, dwell, advanced_by, difficulty)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)")
+UPSERT_DAY = """
+INSERT INTO daily_stats (day, chord_key, chord, shown, dwell_sum)
+VALUES (date(?, 'unixepoch', 'localtime'), ?, ?, 1, ?)
+ON CONFLICT (day, chord_key) DO UPDATE SET
+    chord = excluded.chord,
+    shown = shown + 1,
+    dwell_sum = dwell_sum + excluded.dwell_sum
+"""
+
+
+class PracticeLog:
+    """
+    Append-only log of practiced chords in an SQLite database.
+
+    record() only puts the event on a queue; a writer thread creates the
+    session row and stores the events in batches, one transaction each, and
+    keeps per day totals up to date.
+    Queries read those totals, so they stay fast however long the log grows.
+    """
+
+    def __init__(self, path):
+        """
+        Open (and if needed create) a practice log. A new session starts with the first record().
+
+        Args:
+            path (str): Database file, or ':memory:' (events are then only stored by flush()).
+        """
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        self.conn.executescript(SCHEMA)
+        if version < 2:
+            self._migrate_chord_keys()
+        self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.session_id = None
+        self._started_at = None
+        self._session_lock = threading.Lock()
+        self._events = queue.Queue()
+        self._writer = None
+
+    def _migrate_chord_keys(self):
+        """Rewrite chord keys of version 1 logs, which stored repr() of the key tuple."""
+        rows = self.conn.execute("SELECT chord_key, max(chord) FROM events GROUP BY chord_key"
+                                 " UNION SELECT chord_key, max(chord) FROM daily_stats GROUP BY chord_key").fetchall()
+        keys = {old: stored_name_key(chord) for old, chord in rows}
+        with self.conn:
+            for old, new in keys.items():
+                self.conn.execute("UPDATE events SET chord_key = ? WHERE chord_key = ?", (new, old))
+                self.conn.execute("UPDATE daily_stats SET chord_key = ? WHERE chord_key = ?", (new, old))
+
+    def record(self, chord, shown_at, dwell, advanced_by, difficulty):
+        """
+        Log that a chord was practiced. Returns immediately.
+
+        Args:
+            chord (str): Chord name.
+            shown_at (float): Unix time the chord was shown.
+            dwell (float): Seconds the chord was on screen.
+            advanced_by (str): What moved on to the next chord, one of ADVANCE_REASONS.
+            difficulty (str): Active difficulty level.
+        """
+        if self._started_at is None:
+            # the session row itself is written with the first batch, off the calling thread
+            self._started_at = time.time()
+        if self._writer is None and self.path != ":memory:":
+            self._writer = threading.Thread(target=self._write_events, daemon=True)
+            self._writer.start()
+        self._events.put((chord, shown_at, dwell, advanced_by, difficulty))
+
+    def _write_events(self):
+        """Writer thread: store queued events in batches until close() sends None."""
+        conn = sqlite3.connect(self.path)
+        running = True
+        while running:
+            batch = [self._events.get()]
+            # collect more events for a while so a batch costs one transaction
+            deadline = time.monotonic() + FLUSH_SECONDS
+            while batch[-1] is not None and len(batch) < BATCH_SIZE:
+                try:
+                    batch.append(self._events.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            if batch[-1] is None:
+                running = False
+                batch.pop()
+            if batch:
+                self._store(conn, batch)
+        conn.close()
+
+    def _store(self, conn, batch):
+        """Write one batch of events and update the daily totals in one transaction."""
+        with conn:
+            with self._session_lock:
+                if self.session_id is None:
+                    self.session_id = conn.execute(
+                        "INSERT INTO sessions (started_at) VALUES (?)", (self._started_at or time.time(),)).lastrowid
+            rows = [(self.session_id, shown_at, chord, stored_name_key(chord), dwell, advanced_by, difficulty)
+                    for chord, shown_at, dwell, advanced_by, difficulty in batch]
+            conn.executemany(INSERT_EVENT, rows)
+            conn.executemany(UPSERT_DAY, [(row[1], row[3], row[2], row[4]) for row in rows])
+
+    def flush(self):
+        """Write all queued events now, on the calling thread."""
+        batch = []
+        while True:
+            try:
+                event = self._events.get_nowait()
+            except queue.Empty:
+                break
+            if event is not None:
+                batch.append(event)
+        if batch:
+            self._store(self.conn, batch)
+
+    def close(self):
+        """Write the remaining events and close the database."""
+        if self._writer is not None:
+            self._events.put(None)
+            self._writer.join()
+        self.flush()
+        self.conn.close()
+
+    def chord_stats(self, since=None):
+        """
+        Return how often and how long each chord was practiced.
+
+        Args:
+            since (float, optional): Only count days from this Unix time on.
+
+        Returns:
+            list: (chord, times shown, mean seconds on the chord) tuples, most practiced first.
+        """
+        return self.conn.execute(
+            "SELECT max(chord), sum(shown), sum(dwell_sum) / sum(shown) FROM daily_stats"
+            " WHERE day >= coalesce(date(?, 'unixepoch', 'localtime'), '') GROUP BY chord_key"
+            " ORDER BY sum(shown) DESC", (since,)).fetchall()
+
+    def weakest_chords(self, limit=5, min_shown=3, since=None):
+        """
+        Return the chords a student needs longest to play.
+
+        Args:
+            limit (int): Maximum number of chords.
+            min_shown (int): Ignore chords shown fewer times than this.
+            since (float, optional): Only count days from this Unix time on.
+
+        Returns:
+            list: (chord, times shown, mean seconds on the chord) tuples, slowest first.
+        """
+        return self.conn.execute(
+            "SELECT max(chord), sum(shown), sum(dwell_sum) / sum(shown) AS mean FROM daily_stats"
+            " WHERE day >= coalesce(date(?, 'unixepoch', 'localtime'), '') GROUP BY chord_key"
+            " HAVING sum(shown) >= ? ORDER BY mean DESC LIMIT ?", (since, min_shown, limit)).fetchall()
+
+    def weekly_progress(self, chord=None):
+        """
+        Return practice volume and speed per calendar week.
+
+        Args:
+            chord (str, optional): Only this chord (any enharmonic spelling).
+
+        Returns:
+            list: (week 'YYYY-WW', chords shown, mean seconds per chord) tuples, oldest first.
+        """
+        if chord is None:
+            rows = self.conn.execute(
+                "SELECT strftime('%Y-%W', day) AS week, sum(shown), sum(dwell_sum) / sum(shown)"
+                " FROM daily_stats GROUP BY week ORDER BY week")
+        else:
+            rows = self.conn.execute(
+                "SELECT strftime('%Y-%W', day) AS week, sum(shown), sum(dwell_sum) / sum(shown)"
+                " FROM daily_stats WHERE chord_key = ? GROUP BY week ORDER BY week", (stored_name_key(chord),))
+        return rows.fetchall()
+
+    def total_shown(self):
+        """
+        Return how many chords were practiced in all sessions.
+
+        Returns:
+            int: Number of logged events.
+        """
+        return self.conn.execute("SELECT coalesce(sum(shown), 0) FROM daily_stats").fetchone()[0]
@@ -0,0 +1,247 @@
+import random
+import time
+from typing import NamedTuple
+from utils.chord_keys import name_key
+
+
+QUESTION_KINDS = ("diagram", "name")
+
+
+class ReactionHistogram:
+    """
+    Reaction times of one quiz session in fixed-width bins.
+
+    Adding a time is O(1), so the histogram can be updated after every answer
+    even at sub-second pacing.
+    """
+
+    def __init__(self, bin_ms=100, max_ms=5000):
+        """
+        Args:
+            bin_ms (int): Width of one bin in milliseconds.
+            max_ms (int): Times from here on share the last bin.
+        """
+        self.bin_ns = bin_ms * 1_000_000
+        self.counts = [0] * (max_ms // bin_ms + 1)
+        self.total = 0
+        self.sum_ns = 0
+
+    def add(self, reaction_ns):
+        """
+        Count one reaction time.
+
+        Args:
+            reaction_ns (int): Reaction time in nanoseconds.
+        """
+        self.counts[min(reaction_ns // self.bin_ns, len(self.counts) - 1)] += 1
+        self.total += 1
+        self.sum_ns += reaction_ns
+
+    def mean_ms(self):
+        """
+        Returns:
+            float: Mean reaction time in milliseconds, 0 without answers.
+        """
+        return self.sum_ns / self.total / 1_000_000 if self.total else 0.0
+
+    def percentile_ms(self, q):
+        """
+        Return the upper edge of the bin holding the q-th percentile.
+
+        Args:
+            q (float): Percentile between 0 and 100.
+
+        Returns:
+            int: Milliseconds, 0 without answers.
+        """
+        if not self.total:
+            return 0
+        needed = q / 100 * self.total
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= needed and count:
+                return (index + 1) * self.bin_ns // 1_000_000
+        return len(self.counts) * self.bin_ns // 1_000_000
+
+    def format(self, width=20):
+        """
+        Draw the non-empty bins as text bars.
+
+        Args:
+            width (int): Length of the longest bar.
+
+        Returns:
+            str: One line per bin, e.g. '600-700 ms ████ 4'.
+        """
+        peak = max(self.counts, default=0)
+        bin_ms = self.bin_ns // 1_000_000
+        lines = []
+        for index, count in enumerate(self.counts):
+            if not count:
+                continue
+            start = index * bin_ms
+            label = f"{start}-{start + bin_ms} ms" if index < len(self.counts) - 1 else f">={start} ms"
+            lines.append(f"{label:>12} {'█' * max(1, round(count / peak * width))} {count}")
+        return "\n".join(lines)
+
+
+class QuizQuestion(NamedTuple):
+    """
+    One quiz question.
+
+    Attributes:
+        chord (dict): The chord asked for.
+        kind (str): 'diagram' (name the shown fingering) or 'name' (play the shown name).
+        choices (tuple): Chord names offered by the name picker, including the answer.
+    """
+    chord: dict
+    kind: str
+    choices: tuple
+
+
+class QuizResult(NamedTuple):
+    """
+    Outcome of one answer.
+
+    Attributes:
+        correct (bool): Whether the answer was right.
+        reaction_ns (int): Time from the drawn question to the answer.
+        chord (dict): The chord that was asked for.
+    """
+    correct: bool
+    reaction_ns: int
+    chord: dict
+
+
+class ChordQuiz:
+    """
+    Reaction time quiz over a chord list.
+
+    The clock starts when the GUI reports that the question was drawn
+    (stimulus_drawn) and stops at the answer; both use perf_counter_ns.
+    """
+
+    def __init__(self, chords, choices=4, kinds=QUESTION_KINDS, rng=None):
+        """
+        Args:
+            chords (list): Chord dictionaries to ask for.
+            choices (int): Number of names offered by the name picker.
+            kinds (tuple): Question kinds to mix.
+            rng (random.Random, optional): Random source, for reproducible quizzes.
+        """
+        self.rng = rng or random.Random()
+        self.choices = choices
+        self.kinds = kinds
+        self.histogram = ReactionHistogram()
+        self.correct = 0
+        self.answered = 0
+        self.question = None
+        self.shown_ns = None
+        self.set_chords(chords)
+
+    def set_chords(self, chords):
+        """
+        Ask for another chord list from the next question on.
+
+        Args:
+            chords (list): Chord dictionaries.
+        """
+        # one chord per canonical name, so the picker never offers two spellings of the answer
+        unique = {}
+        for chord in chords:
+            unique.setdefault(name_key(chord["name"]), chord)
+        self.chords = list(unique.values())
+
+    def next_question(self):
+        """
+        Pick the next question; the clock starts with stimulus_drawn().
+
+        Returns:
+            QuizQuestion or None: None if there are no chords.
+        """
+        if not self.chords:
+            return None
+        previous = self.question.chord if self.question else None
+        pool = [c for c in self.chords if c is not previous] or self.chords
+        chord = self.rng.choice(pool)
+        others = [c["name"] for c in self.rng.sample(pool, min(len(pool), self.choices)) if c is not chord]
+        names = [chord["name"], *others[:self.choices - 1]]
+        self.rng.shuffle(names)
+        self.question = QuizQuestion(chord, self.rng.choice(self.kinds), tuple(names))
+        self.shown_ns = None
+        return self.question
+
+    def stimulus_drawn(self, stamp_ns=None):
+        """
+        Start the clock for the current question.
+
+        Args:
+            stamp_ns (int, optional): perf_counter_ns() of the frame that showed the question.
+        """
+        self.shown_ns = time.perf_counter_ns() if stamp_ns is None else stamp_ns
+
+    def answer_name(self, name, stamp_ns=None):
+        """
+        Answer the current question with a chord name.
+
+        Args:
+            name (str): The answered name; enharmonic spellings count as right.
+            stamp_ns (int, optional): perf_counter_ns() of the answer, defaults to now.
+
+        Returns:
+            QuizResult or None: None if no question is waiting for an answer.
+        """
+        if not self._waiting(stamp_ns):
+            return None
+        correct = name_key(name) == name_key(self.question.chord["name"])
+        return self._finish(correct, stamp_ns)
+
+    def answer_fingering(self, candidates, stamp_ns=None):
+        """
+        Check a fingering built on the fretboard against the asked chord name.
+
+        The fingering counts as soon as it is any voicing of the chord; until then
+        it is not an answer yet, since the student is still placing fingers.
+
+        Args:
+            candidates (list): Chords the fingering could be, as from ChordIndex.identify.
+            stamp_ns (int, optional): perf_counter_ns() of the click, defaults to now.
+
+        Returns:
+            QuizResult or None: The result once the fingering is right.
+        """
+        if not self._waiting(stamp_ns):
+            return None
+        target = name_key(self.question.chord["name"])
+        if not any(name_key(c["name"]) == target for c in candidates):
+            return None
+        return self._finish(True, stamp_ns)
+
+    def skip(self, stamp_ns=None):
+        """
+        Give up on the current question; counts as a wrong answer.
+
+        Returns:
+            QuizResult or None: None if no question is waiting for an answer.
+        """
+        if not self._waiting(stamp_ns):
+            return None
+        return self._finish(False, stamp_ns)
+
+    def _waiting(self, stamp_ns):
+        """Whether a drawn question waits for an answer given at stamp_ns."""
+        if self.question is None or self.shown_ns is None:
+            return False
+        # e.g. a voice answer spoken before the question appeared
+        return stamp_ns is None or stamp_ns >= self.shown_ns
+
+    def _finish(self, correct, stamp_ns):
+        """Stop the clock and count the answer."""
+        reaction_ns = (time.perf_counter_ns() if stamp_ns is None else stamp_ns) - self.shown_ns
+        self.shown_ns = None
+        self.answered += 1
+        if correct:
+            self.correct += 1
+            self.histogram.add(reaction_ns)
+        return QuizResult(correct, reaction_ns, self.question.chord)
@@ -0,0 +1,264 @@
+import json
+import os
+import queue
+import subprocess
+import threading
+import time
+import wave
+import numpy as np
+import speech_recognition as sr
+from utils.chord_keys import name_key
+
+
+RECORDING_FORMATS = ("wav", "flac")
+BLOCK = 4096              # samples taken from the capture per write
+CHUNK_SECONDS = 300.0     # length of one part file
+INDEX_FILE = "index.jsonl"
+
+
+def part_name(part, audio_format):
+    """
+    Return the file name of one part of a recording.
+
+    Args:
+        part (int): Part number, from 0.
+        audio_format (str): 'wav' or 'flac'.
+
+    Returns:
+        str: e.g. 'part_003.flac'.
+    """
+    return f"part_{part:03d}.{audio_format}"
+
+
+def _pcm16(samples):
+    """Convert float samples to little-endian 16-bit PCM bytes."""
+    return (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+
+
+class _WavPart:
+    """One WAV part file; the header is completed when it is closed."""
+
+    def __init__(self, path, sample_rate):
+        self._file = wave.open(path, "wb")
+        self._file.setnchannels(1)
+        self._file.setsampwidth(2)
+        self._file.setframerate(sample_rate)
+
+    def write(self, pcm):
+        self._file.writeframesraw(pcm)
+
+    def close(self):
+        self._file.close()
+
+
+class _FlacPart:
+    """
+    One FLAC part file, encoded by the FLAC command line encoder that ships
+    with SpeechRecognition. Samples are piped into it as they arrive, so the
+    encoder works in its own process and only a pipe buffer is held in memory.
+    """
+
+    def __init__(self, path, sample_rate):
+        self._process = subprocess.Popen(
+            [sr.get_flac_converter(), "--silent", "--force-raw-format", "--endian=little", "--sign=signed",
+             "--channels=1", "--bps=16", f"--sample-rate={sample_rate}", "--output-name", path, "-"],
+            stdin=subprocess.PIPE)
+
+    def write(self, pcm):
+        self._process.stdin.write(pcm)
+
+    def close(self):
+        self._process.stdin.close()
+        self._process.wait()
+
+
+class PracticeRecorder:
+    """
+    Records the shared microphone capture to disk in the background.
+
+    A writer thread reads fixed-size blocks from its own subscription of the
+    CaptureService and streams them into part files of CHUNK_SECONDS each, so
+    memory use is the capture ring plus one block however long the session
+    runs. mark() only puts the chord change on a queue; the writer turns it
+    into a line of the sidecar index (index.jsonl) with the time in the
+    recording, so a chord can be looked up without listening through it.
+
+    If the disk stalls for longer than the capture ring, the lost audio is
+    written to the index as a gap instead of silently shifting the timeline.
+    """
+
+    def __init__(self, service, directory, audio_format="wav", chunk_seconds=CHUNK_SECONDS):
+        """
+        Args:
+            service (CaptureService): The shared capture to record.
+            directory (str): Parent directory; every recording gets its own session folder.
+            audio_format (str): 'wav' or 'flac'.
+            chunk_seconds (float): Length of one part file.
+        """
+        if audio_format not in RECORDING_FORMATS:
+            raise ValueError(f"unknown recording format {audio_format!r}")
+        self.service = service
+        self.audio_format = audio_format
+        self.sample_rate = service.sample_rate
+        self.chunk_samples = int(chunk_seconds * self.sample_rate)
+        self.directory = os.path.join(directory, time.strftime("session_%Y%m%d_%H%M%S"))
+        os.makedirs(self.directory, exist_ok=True)
+        self.recorded = 0       # samples written to part files
+        self._subscription = service.subscribe("recorder")
+        self._start = self._subscription.cursor
+        self._marks = queue.SimpleQueue()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._header = {"sample_rate": self.sample_rate, "format": audio_format,
+                        "chunk_seconds": chunk_seconds, "started_at": time.time()}
+
+    def start(self):
+        """ Start the writer thread. """
+        self._thread.start()
+
+    def mark(self, chord, advanced_by):
+        """
+        Note that a chord was shown now. Returns immediately.
+
+        Args:
+            chord (str): Chord name.
+            advanced_by (str): What moved on to the chord, as in the practice log.
+        """
+        self._marks.put((self.service.ring.written, time.time(), chord, advanced_by))
+
+    def stop(self):
+        """ Write what is still in the capture ring, close the files and release the capture. """
+        self._stop.set()
+        self._thread.join()
+        self.service.unsubscribe(self._subscription)
+
+    def _run(self):
+        """Writer thread: move captured blocks into part files and marks into the index."""
+        part = None
+        pending = []
+        dropped = 0
+        with open(os.path.join(self.directory, INDEX_FILE), "w", encoding="utf-8") as index:
+            index.write(json.dumps(self._header) + "\n")
+            while True:
+                stopping = self._stop.is_set()
+                if self._subscription.wait(BLOCK, timeout=0.25) or stopping:
+                    samples = self._subscription.read(None if stopping else BLOCK)
+                    if self._subscription.dropped != dropped:
+                        lost = self._subscription.dropped - dropped
+                        dropped = self._subscription.dropped
+                        self._write_index(index, {"gap": round(self.recorded / self.sample_rate, 3),
+                                                  "lost_seconds": round(lost / self.sample_rate, 3)})
+                    part = self._write_samples(part, samples)
+                while not self._marks.empty():
+                    pending.append(self._marks.get())
+                # a mark is placed once the recording has reached its position
+                cursor = self._subscription.cursor
+                while pending and (pending[0][0] <= cursor or stopping):
+                    position, shown_at, chord, advanced_by = pending.pop(0)
+                    seconds = max(0, min(position, cursor) - self._start - dropped) / self.sample_rate
+                    self._write_index(index, {"time": round(seconds, 3),
+                                              "part": int(seconds * self.sample_rate) // self.chunk_samples,
+                                              "chord": chord, "advanced_by": advanced_by,
+                                              "shown_at": round(shown_at, 3)})
+                if stopping and not self._subscription.lag:
+                    break
+        if part is not None:
+            part.close()
+
+    def _write_samples(self, part, samples):
+        """Append samples to the part files, starting a new part at every chunk boundary."""
+        samples = np.frombuffer(samples, dtype=np.float32)
+        while len(samples):
+            if part is None:
+                path = os.path.join(self.directory, part_name(self.recorded // self.chunk_samples, self.audio_format))
+                part = (_FlacPart if self.audio_format == "flac" else _WavPart)(path, self.sample_rate)
+            room = self.chunk_samples - self.recorded % self.chunk_samples
+            part.write(_pcm16(samples[:room]))
+            self.recorded += min(room, len(samples))
+            samples = samples[room:]
+            if self.recorded % self.chunk_samples == 0:
+                part.close()
+                part = None
+        return part
+
+    def _write_index(self, index, entry):
+        """Append one line to the sidecar index; flushed so a crash keeps everything up to here."""
+        index.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        index.flush()
+
+
+def load_recording(directory):
+    """
+    Read the sidecar index of a recording.
+
+    Args:
+        directory (str): Session folder of the recording.
+
+    Returns:
+        tuple: (header, changes, gaps); changes are the chord entries in order, each
+            with an added 'end' (start of the next change, None for the last one).
+    """
+    with open(os.path.join(directory, INDEX_FILE), "r", encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f if line.strip()]
+    header, entries = lines[0], lines[1:]
+    changes = [e for e in entries if "chord" in e]
+    gaps = [e for e in entries if "gap" in e]
+    for change, following in zip(changes, changes[1:] + [None]):
+        change["end"] = following["time"] if following else None
+    return header, changes, gaps
+
+
+def find_chord(changes, chord):
+    """
+    Return the stretches of a recording where a chord was on screen.
+
+    Args:
+        changes (list): Chord entries from load_recording().
+        chord (str): Chord name; enharmonic spellings match.
+
+    Returns:
+        list: The matching entries, each with 'time' and 'end' in seconds.
+    """
+    key = name_key(chord)
+    return [change for change in changes if name_key(change["chord"]) == key]
+
+
+def _read_part(path, audio_format):
+    """Decode one part file to float32 samples."""
+    if audio_format == "flac":
+        raw = subprocess.run([sr.get_flac_converter(), "--decode", "--silent", "--stdout", "--force-raw-format",
+                              "--endian=little", "--sign=signed", path], capture_output=True, check=True).stdout
+    else:
+        with wave.open(path, "rb") as f:
+            raw = f.readframes(f.getnframes())
+    return np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768
+
+
+def read_recording(directory, start, end=None):
+    """
+    Read a stretch of a recording, decoding only the parts it touches.
+
+    Args:
+        directory (str): Session folder of the recording.
+        start (float): Seconds from the start of the recording.
+        end (float, optional): Seconds; the end of the recording if omitted.
+
+    Returns:
+        tuple: (samples, sample_rate) with float32 samples.
+    """
+    header, _, _ = load_recording(directory)
+    sample_rate = header["sample_rate"]
+    chunk = int(header["chunk_seconds"] * sample_rate)
+    first = int(start * sample_rate)
+    last = None if end is None else int(end * sample_rate)
+    pieces = []
+    part = first // chunk
+    while last is None or part * chunk < last:
+        path = os.path.join(directory, part_name(part, header["format"]))
+        if not os.path.exists(path):
+            break
+        samples = _read_part(path, header["format"])
+        offset = part * chunk
+        pieces.append(samples[max(0, first - offset):None if last is None else max(0, last - offset)])
+        part += 1
+    return (np.concatenate(pieces) if pieces else np.zeros(0, dtype=np.float32)), sample_rate
@@ -0,0 +1,211 @@
+import random
+from utils.chord_keys import ChordKeyIndex, name_key
+from utils.tunings import chord_fingering, get_tuning
+
+
+MAX_HISTORY = 4
+TIMER_INTERVAL_MS = 5000
+
+
+class TrainerSession:
+    """
+    The state of one practice session, without any GUI.
+
+    Holds the active chord list, the history of shown chords with the
+    position while stepping back through it, and the learned chord counter.
+    The desktop app keeps one session in GuiLogicManager; the classroom
+    server keeps one per connected student. Nothing here reads the globals
+    in config or touches Tk, so any number of sessions can live in one process.
+
+    Attributes:
+        chords (list): Chord dictionaries that can be shown.
+        chord_keys (ChordKeyIndex): Lookup of the chords by name, enharmonic spellings included.
+        difficulty (str): Difficulty level the chords belong to.
+        max_history (int): Number of shown chords kept in the history.
+        timer_interval_ms (int): Time between two chords when advancing automatically.
+        history (list): Names of the shown chords, oldest first.
+        history_index (int or None): Negative index into the history while stepping back, None at the newest chord.
+        learned (int): Chords shown since the start; the first chord does not count.
+    """
+
+    def __init__(self, chords, difficulty="easy", max_history=MAX_HISTORY, timer_interval_ms=TIMER_INTERVAL_MS,
+                 tuning=None, rng=None, chord_keys=None):
+        """
+        Args:
+            chords (list): Chord dictionaries that can be shown.
+            difficulty (str): Difficulty level the chords belong to.
+            max_history (int): Number of shown chords kept in the history.
+            timer_interval_ms (int): Time between two chords when advancing automatically.
+            tuning (Tuning, optional): Tuning the fingerings are given for; standard tuning if omitted.
+            rng (random.Random, optional): Source of the random picks; the random module if omitted.
+            chord_keys (ChordKeyIndex, optional): Prebuilt lookup of the chords, e.g. shared by many sessions.
+        """
+        self.chords = chords
+        self.chord_keys = chord_keys or ChordKeyIndex(chords)
+        self.difficulty = difficulty
+        self.max_history = max_history
+        self.timer_interval_ms = timer_interval_ms
+        self.tuning = tuning or get_tuning("standard")
+        self.rng = rng or random
+        self.history = []
+        self.history_index = None
+        self.learned = -1
+
+    def set_chords(self, chords, difficulty=None, chord_keys=None):
+        """
+        Replace the chord list, e.g. after a transposition or a difficulty change.
+        The history is left alone; see keep_existing().
+
+        Args:
+            chords (list): The new chord dictionaries.
+            difficulty (str, optional): Their difficulty level, if it changed.
+            chord_keys (ChordKeyIndex, optional): Prebuilt lookup of the chords.
+        """
+        self.chords = chords
+        self.chord_keys = chord_keys or ChordKeyIndex(chords)
+        if difficulty is not None:
+            self.difficulty = difficulty
+
+    def update_chords(self, chords, removed=(), added=()):
+        """
+        Apply a change of the chord library: the lookup is updated in place
+        instead of being rebuilt. The history is left alone; see keep_existing().
+
+        Args:
+            chords (list): The new chord dictionaries.
+            removed (iterable): Chords of the old list that are gone, edited ones included.
+            added (iterable): Chords of the new list that were not in the old one, edited ones included.
+        """
+        for chord in removed:
+            self.chord_keys.remove(chord)
+        for chord in added:
+            self.chord_keys.add(chord)
+        self.chords = chords
+
+    @property
+    def current(self):
+        """str or None: Name of the chord on screen, None before the first one."""
+        if not self.history:
+            return None
+        return self.history[self.history_index if self.history_index is not None else -1]
+
+    def pick_next_chord(self, picker=None):
+        """
+        Pick a chord not recently shown, without showing it.
+
+        Args:
+            picker (callable, optional): Called with the possible chords to choose one,
+                e.g. the transition drill; a random choice if omitted.
+
+        Returns:
+            dict: The picked chord.
+        """
+        past_keys = {name_key(n) for n in self.history}
+
+        possible = [
+            a for a in self.chords
+            if name_key(a["name"]) not in past_keys
+        ]
+
+        if not possible:
+            self.history.clear()
+            possible = self.chords[:]
+
+        if picker is not None:
+            return picker(possible)
+        return self.rng.choice(possible)
+
+    def advance(self, chord=None, picker=None):
+        """
+        Move on to a new chord and add it to the history.
+
+        Args:
+            chord (dict, optional): Show this chord instead of picking one.
+            picker (callable, optional): Passed on to pick_next_chord().
+
+        Returns:
+            dict: The chord now shown.
+        """
+        if chord is None:
+            chord = self.pick_next_chord(picker)
+        self.history.append(chord["name"].strip())
+        if len(self.history) > self.max_history:
+            self.history.pop(0)
+        self.learned += 1
+        self.history_index = None
+        return chord
+
+    def back(self):
+        """
+        Step back to the previous chord of the history.
+
+        Returns:
+            str or None: Name of the chord now shown, None if there is nothing further back.
+        """
+        index = -2 if self.history_index is None else self.history_index - 1
+        if abs(index) > len(self.history):
+            return None
+        self.history_index = index
+        return self.history[index]
+
+    def forward(self):
+        """
+        Step forward again after back().
+
+        Returns:
+            str or None: Name of the chord now shown, None at the newest chord.
+        """
+        if self.history_index is None or self.history_index >= -1:
+            return None
+        self.history_index += 1
+        name = self.history[self.history_index]
+        if self.history_index == -1:
+            self.history_index = None
+        return name
+
+    def clear_history(self):
+        """ Forget the shown chords; the next advance() starts a fresh history. """
+        self.history = []
+        self.history_index = None
+
+    def keep_existing(self):
+        """
+        Drop chords that are no longer in the chord list from the history.
+
+        Returns:
+            str or None: Name of the chord to show at the kept position, None if
+                the chord on screen was dropped and a new one has to be picked.
+        """
+        position = len(self.history) + (self.history_index if self.history_index is not None else -1)
+        kept = [(index, name) for index, name in enumerate(self.history) if self.chord_keys.get(name)]
+        self.history = [name for _, name in kept]
+
+        remaining = [index for index, _ in kept]
+        if position not in remaining:
+            self.history_index = None
+            return None
+        # history indexes count from the end, -1 being the newest chord
+        history_index = remaining.index(position) - len(remaining)
+        self.history_index = history_index if history_index < -1 else None
+        return self.history[history_index]
+
+    def state(self):
+        """
+        Describe the chord on screen, e.g. to send it to a client.
+
+        Returns:
+            dict: 'chord', 'fingering', 'fingers', 'chord_notes', 'history',
+                'history_index' and 'learned'; the chord fields are None before the first chord.
+        """
+        name = self.current
+        chord = self.chord_keys.get(name) if name else None
+        fingering, fingers = chord_fingering(chord, self.tuning) if chord else (None, None)
+        return {
+            "chord": name,
+            "fingering": fingering,
+            "fingers": fingers,
+            "chord_notes": chord.get("chord_notes", []) if chord else None,
+            "history": list(self.history),
+            "history_index": self.history_index,
+            "learned": max(self.learned, 0),
+        }
@@ -0,0 +1,57 @@
+import numpy as np
+import speech_recognition as sr
+
+
+class _SubscriptionStream:
+    """The stream object speech_recognition reads 16-bit PCM from."""
+
+    def __init__(self, subscription, timeout):
+        self.subscription = subscription
+        self.timeout = timeout
+
+    def read(self, size):
+        """Block until size frames are captured and return them as 16-bit PCM; empty once the capture stops."""
+        if not self.subscription.wait(size, self.timeout):
+            return b""
+        samples = np.frombuffer(self.subscription.read(size), dtype=np.float32)
+        return (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+
+
+class CaptureSpeechSource(sr.AudioSource):
+    """
+    A speech_recognition audio source reading from the shared CaptureService
+    instead of opening its own microphone stream.
+
+    Usage is the same as sr.Microphone: `with source:` subscribes to the
+    capture and recognizer.listen(source) reads from it.
+    """
+
+    def __init__(self, service, chunk=1024, timeout=2.0):
+        """
+        Args:
+            service (CaptureService): The shared capture.
+            chunk (int): Frames per read, like sr.Microphone's chunk_size.
+            timeout (float): Seconds a read waits for audio before the source counts as ended.
+        """
+        self.service = service
+        self.SAMPLE_RATE = service.sample_rate
+        self.SAMPLE_WIDTH = 2
+        self.CHUNK = chunk
+        self.timeout = timeout
+        self.subscription = None
+        self.stream = None
+
+    def __enter__(self):
+        self.subscription = self.service.subscribe("speech")
+        self.stream = _SubscriptionStream(self.subscription, self.timeout)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.service.unsubscribe(self.subscription)
+        self.subscription = None
+        self.stream = None
+
+    def skip(self):
+        """ Drop what was captured while nobody listened, e.g. while voice control was paused. """
+        if self.subscription is not None:
+            self.subscription.skip()
@@ -0,0 +1,156 @@
+import wave
+from functools import lru_cache
+import numpy as np
+
+
+SAMPLE_RATE = 44100
+DURATION = 2.0          # seconds rendered per chord
+DECAY_SECONDS = 1.5     # time for the fundamental of a string to fade by 60 dB
+STRUM_PATTERNS = {
+    # pattern -> (delay between strings in ms, strum from the last string to the first)
+    "down": (12, False),
+    "up": (12, True),
+    "arpeggio": (160, False),
+    "block": (0, False),
+}
+
+
+def midi_to_frequency(pitch):
+    """
+    Convert a MIDI pitch to its frequency in Hz (A4 = 69 = 440 Hz).
+
+    Args:
+        pitch (int): MIDI pitch.
+
+    Returns:
+        float: Frequency in Hz.
+    """
+    return 440.0 * 2 ** ((pitch - 69) / 12)
+
+
+def pluck(frequency, samples, sample_rate=SAMPLE_RATE, decay_seconds=DECAY_SECONDS, seed=0):
+    """
+    Synthesize one plucked string with the Karplus-Strong algorithm.
+
+    Karplus-Strong feeds a noise burst of one period through a delay line whose
+    feedback averages neighbouring samples. One round trip through that loop is
+    a fixed linear filter applied to the previous period, so period k is the
+    first period filtered k times. In the frequency domain that is a plain
+    power of the filter response, which lets every period be computed in one
+    inverse FFT instead of a per-sample loop.
+
+    Args:
+        frequency (float): Pitch in Hz.
+        samples (int): Number of samples to render.
+        sample_rate (int): Samples per second.
+        decay_seconds (float): Time for the fundamental to fade by 60 dB.
+        seed (int): Seed of the noise burst, so renders are reproducible.
+
+    Returns:
+        np.ndarray: float32 samples in [-1, 1].
+    """
+    # the averaging filter delays by half a sample, so the loop is half a sample shorter
+    period = max(2, int(round(sample_rate / frequency - 0.5)))
+    periods = -(-samples // period)
+    burst = np.random.default_rng(seed).uniform(-1.0, 1.0, period)
+    burst -= burst.mean()
+
+    # loop response d * (1 + e^-iw) / 2 = d * cos(w/2) * e^(-iw/2), raised to the power k as exp(k * log)
+    gain = 10 ** (-3 * period / (sample_rate * decay_seconds))
+    omega = 2 * np.pi * np.fft.rfftfreq(period)
+    log_response = np.log(gain * np.cos(omega / 2).clip(1e-12)) - 0.5j * omega
+    spectrum = np.fft.rfft(burst) * np.exp(np.arange(periods)[:, None] * log_response)
+    signal = np.fft.irfft(spectrum, n=period, axis=1).ravel()[:samples]
+    return signal.astype(np.float32)
+
+
+@lru_cache(maxsize=128)
+def _plucked_string(pitch, samples, sample_rate):
+    """One plucked string per MIDI pitch; chords share most of their strings, so they are cached too."""
+    signal = pluck(midi_to_frequency(pitch), samples, sample_rate, seed=pitch)
+    signal.flags.writeable = False
+    return signal
+
+
+def render_pitches(pitches, pattern="down", duration=DURATION, sample_rate=SAMPLE_RATE):
+    """
+    Mix plucked strings into one strummed chord.
+
+    Args:
+        pitches (list): MIDI pitch per sounding string, first string first.
+        pattern (str): Key of STRUM_PATTERNS.
+        duration (float): Length of the chord in seconds.
+        sample_rate (int): Samples per second.
+
+    Returns:
+        np.ndarray: float32 mono samples in [-1, 1].
+    """
+    delay_ms, reverse = STRUM_PATTERNS[pattern]
+    order = list(reversed(pitches)) if reverse else list(pitches)
+    delay = int(sample_rate * delay_ms / 1000)
+    total = int(sample_rate * duration)
+    mix = np.zeros(total + delay * len(order), dtype=np.float32)
+    for index, pitch in enumerate(order):
+        start = index * delay
+        mix[start:start + total] += _plucked_string(pitch, total, sample_rate)
+    mix = mix[:total]
+    peak = float(np.abs(mix).max()) if len(mix) else 0.0
+    if peak > 0:
+        mix *= 0.8 / peak
+    return mix
+
+
+@lru_cache(maxsize=64)
+def render_chord(pitches, pattern="down", duration=DURATION, sample_rate=SAMPLE_RATE):
+    """
+    Render a voicing, cached per voicing and strum pattern.
+
+    Args:
+        pitches (tuple): MIDI pitch per sounding string, e.g. from Tuning.pitches().
+        pattern (str): Key of STRUM_PATTERNS.
+        duration (float): Length of the chord in seconds.
+        sample_rate (int): Samples per second.
+
+    Returns:
+        np.ndarray: Read-only float32 mono samples, shared between callers.
+    """
+    samples = render_pitches(list(pitches), pattern, duration, sample_rate)
+    samples.flags.writeable = False
+    return samples
+
+
+def write_wav(path, samples, sample_rate=SAMPLE_RATE):
+    """
+    Write mono float samples to a 16-bit WAV file.
+
+    Args:
+        path (str): Output file.
+        samples (np.ndarray): Samples in [-1, 1].
+        sample_rate (int): Samples per second.
+    """
+    data = (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2")
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(data.tobytes())
+
+
+def read_wav(path):
+    """
+    Read a 16-bit PCM WAV file as mono float samples.
+
+    Args:
+        path (str): WAV file; stereo files are mixed down.
+
+    Returns:
+        tuple: (samples, sample_rate) with float32 samples in [-1, 1].
+    """
+    with wave.open(path, "rb") as f:
+        if f.getsampwidth() != 2:
+            raise ValueError(f"{path}: only 16-bit WAV files are supported")
+        channels = f.getnchannels()
+        sample_rate = f.getframerate()
+        data = np.frombuffer(f.readframes(f.getnframes()), dtype="<i2")
+    samples = data.reshape(-1, channels).mean(axis=1) / 32768
+    return samples.astype(np.float32), sample_rate
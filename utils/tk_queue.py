@@ -0,0 +1,53 @@
+import queue
+from utils.tracing import count
+
+
+class TkCallQueue:
+    """
+    Run calls from background threads on the Tk main thread.
+
+    Tk widgets must only be touched from the thread running the main loop.
+    Worker threads put calls into a queue; the main loop drains it every few
+    milliseconds with after().
+    """
+
+    def __init__(self, master, interval_ms=50):
+        """
+        Args:
+            master (tk.Widget): Any widget of the application, used for after().
+            interval_ms (int): How often the queue is drained.
+        """
+        self.master = master
+        self.interval_ms = interval_ms
+        self._queue = queue.SimpleQueue()
+        self._running = True
+        self.master.after(self.interval_ms, self._drain)
+
+    def put(self, func, *args, **kwargs):
+        """
+        Schedule a call on the main thread; safe to call from any thread.
+
+        Args:
+            func (callable): Function to call.
+            *args, **kwargs: Its arguments.
+        """
+        self._queue.put((func, args, kwargs))
+
+    def stop(self):
+        """Stop draining the queue."""
+        self._running = False
+
+    def _drain(self):
+        """Run all queued calls, then check again later."""
+        try:
+            while True:
+                try:
+                    func, args, kwargs = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                count("tk_queue.calls")
+                func(*args, **kwargs)
+        finally:
+            # a failing call must not stop later calls from running
+            if self._running:
+                self.master.after(self.interval_ms, self._drain)
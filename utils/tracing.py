@@ -0,0 +1,251 @@
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+
+
+ENV_VAR = "UKULELE_TRACE"   # path of a trace file written when the program exits
+MAX_EVENTS = 500_000          # ~100 MB of JSON at most; later events are dropped and counted
+
+
+class _NullSpan:
+    """The span handed out while tracing is off: entering and leaving it does nothing."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """ A timed section; recorded as one complete event when it is left. """
+    __slots__ = ("tracer", "name", "args", "start")
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        self.tracer._record(("X", self.name, self.start, end - self.start, threading.get_ident(), self.args))
+        return False
+
+    def set(self, **args):
+        """
+        Attach arguments known only inside the span, e.g. a result count.
+
+        Args:
+            **args: JSON-serializable values shown with the event.
+        """
+        self.args = dict(self.args or {}, **args)
+
+
+class Tracer:
+    """
+    Collects spans and counters in memory and writes them as a Chrome trace.
+
+    While disabled, span() returns a shared no-op object after a single
+    attribute check, so instrumented code costs about as much as an empty
+    `with` block. While enabled, a span records two perf_counter_ns() reads
+    and appends one tuple; events are only turned into JSON by dump(). The
+    file loads in chrome://tracing and ui.perfetto.dev, with one track per
+    thread and one per counter.
+
+    Attributes:
+        enabled (bool): Whether events are recorded.
+        dropped (int): Events not recorded because MAX_EVENTS was reached.
+    """
+
+    def __init__(self, max_events=MAX_EVENTS):
+        """
+        Args:
+            max_events (int): Events kept at most, to bound memory in long sessions.
+        """
+        self.enabled = False
+        self.max_events = max_events
+        self.dropped = 0
+        self._events = []
+        self._counters = {}
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter_ns()
+        self._thread_names = {}
+
+    def _record(self, event):
+        """Store one event; list.append is atomic, so threads need no lock here."""
+        if len(self._events) < self.max_events:
+            self._events.append(event)
+        else:
+            self.dropped += 1
+
+    def span(self, name, **args):
+        """
+        Time a section of code: `with tracer.span("fretboard.redraw"): ...`.
+
+        Args:
+            name (str): Event name; the part before the first dot is used as category.
+            **args: JSON-serializable values shown with the event.
+
+        Returns:
+            Span: A context manager; a no-op one while tracing is off.
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name, args or None)
+
+    def count(self, name, value=1):
+        """
+        Add to a counter; the trace shows its running total over time.
+
+        Args:
+            name (str): Counter name.
+            value (int or float): Amount added.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            total = self._counters.get(name, 0) + value
+            self._counters[name] = total
+        self._record(("C", name, time.perf_counter_ns(), 0, threading.get_ident(), {name: total}))
+
+    def start(self):
+        """ Drop earlier events and start recording. """
+        with self._lock:
+            self._events = []
+            self._counters = {}
+            self.dropped = 0
+            self._origin = time.perf_counter_ns()
+        self.enabled = True
+
+    def stop(self):
+        """ Stop recording; the events are kept until the next start(). """
+        self.enabled = False
+
+    def events(self):
+        """
+        Convert the recorded events to Chrome trace event dicts.
+
+        Returns:
+            list: Trace events, timestamps in microseconds from start().
+        """
+        for thread in threading.enumerate():
+            self._thread_names[thread.ident] = thread.name
+        pid = os.getpid()
+        origin = self._origin
+        result = []
+        threads = set()
+        for phase, name, start, duration, tid, args in list(self._events):
+            event = {"name": name, "cat": name.split(".", 1)[0], "ph": phase, "ts": (start - origin) / 1000,
+                     "pid": pid, "tid": tid}
+            if phase == "X":
+                event["dur"] = duration / 1000
+            if args:
+                event["args"] = args
+            result.append(event)
+            threads.add(tid)
+        for tid in threads:
+            result.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                           "args": {"name": self._thread_names.get(tid, f"Thread {tid}")}})
+        return result
+
+    def dump(self, path):
+        """
+        Write the recorded events as a Chrome/Perfetto trace file.
+
+        Args:
+            path (str): Target JSON file; missing directories are created.
+
+        Returns:
+            int: Number of events written.
+        """
+        events = self.events()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms",
+                       "otherData": {"dropped_events": self.dropped}}, f)
+        return len(events)
+
+
+# the process-wide tracer used by the instrumented code
+tracer = Tracer()
+
+
+def span(name, **args):
+    """
+    Time a section of code with the process-wide tracer; see Tracer.span().
+
+    Args:
+        name (str): Event name, e.g. 'logic.next_chord'.
+        **args: JSON-serializable values shown with the event.
+
+    Returns:
+        Span: A context manager; a no-op one while tracing is off.
+    """
+    if not tracer.enabled:
+        return _NULL_SPAN
+    return Span(tracer, name, args or None)
+
+
+def count(name, value=1):
+    """
+    Add to a counter of the process-wide tracer; see Tracer.count().
+
+    Args:
+        name (str): Counter name.
+        value (int or float): Amount added.
+    """
+    if tracer.enabled:
+        tracer.count(name, value)
+
+
+def traced(name):
+    """
+    Decorator timing every call of a function as a span.
+
+    Args:
+        name (str): Event name.
+
+    Returns:
+        callable: The decorator.
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with Span(tracer, name, None):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def start_from_environment():
+    """
+    Start tracing if the UKULELE_TRACE environment variable names a file; it is written at exit.
+
+    Returns:
+        str or None: The trace file, None if tracing was not requested.
+    """
+    path = os.environ.get(ENV_VAR)
+    if not path:
+        return None
+    tracer.start()
+    atexit.register(tracer.dump, path)
+    return path
@@ -0,0 +1,185 @@
+import numpy as np
+from utils.chord_keys import name_key
+
+
+FINGER_COUNT = 4
+
+# weights of the three parts of the cost model
+FRET_DISTANCE_WEIGHT = 0.5
+LIFTED_FINGER_WEIGHT = 1.0
+STRING_CROSSING_WEIGHT = 0.75
+
+
+def _shape_key(chord):
+    """Return the part of a chord the cost model depends on."""
+    return tuple(chord.get("fingering", ())), tuple(chord.get("fingers", ()))
+
+
+def _finger_positions(chords, strings):
+    """
+    Convert chords into per-finger arrays.
+
+    Args:
+        chords (list): Chord dictionaries with 'fingering' and 'fingers'.
+        strings (int): Number of strings.
+
+    Returns:
+        tuple: (frets, placed, finger_string, finger_fret) where frets has shape
+            (N, strings) and the finger arrays have shape (N, FINGER_COUNT).
+    """
+    count = len(chords)
+    frets = np.zeros((count, strings), dtype=np.int16)
+    placed = np.zeros((count, FINGER_COUNT), dtype=bool)
+    finger_string = np.zeros((count, FINGER_COUNT), dtype=np.int16)
+    finger_fret = np.zeros((count, FINGER_COUNT), dtype=np.int16)
+
+    for row, chord in enumerate(chords):
+        for string_index, (fret, finger) in enumerate(zip(chord.get("fingering", ()), chord.get("fingers", ()))):
+            try:
+                fret, finger = int(fret), int(finger)
+            except ValueError:
+                continue
+            if string_index >= strings:
+                break
+            frets[row, string_index] = fret
+            if fret > 0 and 1 <= finger <= FINGER_COUNT and not placed[row, finger - 1]:
+                # a barre is reported at the lowest string the finger covers
+                placed[row, finger - 1] = True
+                finger_string[row, finger - 1] = string_index
+                finger_fret[row, finger - 1] = fret
+    return frets, placed, finger_string, finger_fret
+
+
+def _pairwise_costs(source, target):
+    """
+    Compute the change cost from every source chord to every target chord.
+
+    Args:
+        source (tuple): Arrays from _finger_positions for the chords changed from.
+        target (tuple): Arrays from _finger_positions for the chords changed to.
+
+    Returns:
+        np.ndarray: Cost matrix of shape (len(source), len(target)).
+    """
+    frets_a, placed_a, string_a, fret_a = (a[:, None] for a in source)
+    frets_b, placed_b, string_b, fret_b = (b[None, :] for b in target)
+
+    fret_distance = np.abs(frets_a - frets_b).sum(axis=2)
+
+    stays = placed_a & placed_b & (string_a == string_b) & (fret_a == fret_b)
+    lifted = (placed_a & ~stays).sum(axis=2)
+
+    moved = placed_a & placed_b
+    crossings = np.where(moved, np.abs(string_a - string_b), 0).sum(axis=2)
+
+    return (FRET_DISTANCE_WEIGHT * fret_distance
+            + LIFTED_FINGER_WEIGHT * lifted
+            + STRING_CROSSING_WEIGHT * crossings).astype(np.float32)
+
+
+class TransitionCostMatrix:
+    """
+    Physical cost of changing between any two chords of a chord list.
+
+    The cost adds up how far the frets move, how many fingers have to be lifted
+    and how many strings fingers have to cross. The full N x N matrix is computed
+    with array broadcasting; after edits only rows and columns of changed chords
+    are recomputed.
+
+    Attributes:
+        strings (int): Number of strings.
+        names (list): Chord names in matrix order.
+        matrix (np.ndarray): matrix[i, j] is the cost of changing from chord i to chord j.
+    """
+
+    def __init__(self, chords, strings=4):
+        """
+        Build the matrix for a chord list.
+
+        Args:
+            chords (list): Chord dictionaries.
+            strings (int): Number of strings.
+        """
+        self.strings = strings
+        self._keys = [_shape_key(c) for c in chords]
+        self.names = [c["name"].strip() for c in chords]
+        self._positions = _finger_positions(chords, strings)
+        self.matrix = _pairwise_costs(self._positions, self._positions)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def index_of(self, name):
+        """
+        Return the matrix index of a chord name, or None.
+
+        Args:
+            name (str): The chord name.
+
+        Returns:
+            int or None: Row/column index.
+        """
+        key = name_key(name)
+        return next((i for i, n in enumerate(self.names) if name_key(n) == key), None)
+
+    def update(self, chords):
+        """
+        Bring the matrix up to date with a changed chord list.
+
+        Costs between chords whose fingering and fingers did not change are
+        copied; only rows and columns of new or edited chords are computed.
+
+        Args:
+            chords (list): The new chord list.
+
+        Returns:
+            int: Number of chords whose costs were recomputed.
+        """
+        new_keys = [_shape_key(c) for c in chords]
+        old_index = {}
+        for index, key in enumerate(self._keys):
+            old_index.setdefault(key, index)
+
+        reused_new = [i for i, key in enumerate(new_keys) if key in old_index]
+        reused_old = [old_index[new_keys[i]] for i in reused_new]
+        changed = [i for i, key in enumerate(new_keys) if key not in old_index]
+
+        positions = _finger_positions(chords, self.strings)
+        matrix = np.zeros((len(chords), len(chords)), dtype=np.float32)
+        matrix[np.ix_(reused_new, reused_new)] = self.matrix[np.ix_(reused_old, reused_old)]
+
+        if changed:
+            changed_positions = tuple(a[changed] for a in positions)
+            matrix[changed, :] = _pairwise_costs(changed_positions, positions)
+            matrix[:, changed] = _pairwise_costs(positions, changed_positions)
+
+        self._keys = new_keys
+        self.names = [c["name"].strip() for c in chords]
+        self._positions = positions
+        self.matrix = matrix
+        return len(changed)
+
+    def pick_in_band(self, current, candidates, low, high, rng=np.random):
+        """
+        Pick a candidate whose change cost from the current chord lies in a band.
+
+        The band is given as quantiles of the costs to the candidates, so it
+        adapts to easy and hard chord lists alike.
+
+        Args:
+            current (int): Index of the current chord.
+            candidates (list): Indices of allowed next chords.
+            low (float): Lower quantile, 0-1.
+            high (float): Upper quantile, 0-1.
+            rng: Random generator with a choice method.
+
+        Returns:
+            int or None: Index of the picked chord, or None without candidates.
+        """
+        if not candidates:
+            return None
+        candidates = np.asarray(candidates)
+        costs = self.matrix[current, candidates]
+        lower, upper = np.quantile(costs, [low, high])
+        in_band = candidates[(costs >= lower) & (costs <= upper)]
+        return int(rng.choice(in_band if len(in_band) else candidates))
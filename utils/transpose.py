@@ -0,0 +1,207 @@
+import re
+import numpy as np
+from utils.chord_theory import note_to_pitch_class, pitch_class_to_note
+from utils.tunings import get_tuning
+from utils.finger_solver import solve_fingers
+from utils.voicing_generator import generate_voicings
+
+
+# roots whose major / minor keys are written with flats
+FLAT_MAJOR_ROOTS = {1, 3, 5, 8, 10}
+FLAT_MINOR_ROOTS = {0, 2, 3, 5, 7, 10}
+
+_NOTE_PATTERN = re.compile(r"([A-G])([#b♯♭]?)")
+_MINOR_PATTERN = re.compile(r"^m(?!aj)")
+
+
+def _prefers_flats(root, suffix, spelling):
+    """
+    Decide whether a chord should be spelled with flats.
+
+    Args:
+        root (int): Root pitch class after transposing.
+        suffix (str): Everything after the root note in the chord name.
+        spelling (str): 'auto', 'sharps' or 'flats'.
+
+    Returns:
+        bool: True for flats.
+    """
+    if spelling != "auto":
+        return spelling == "flats"
+    if _MINOR_PATTERN.match(suffix):
+        return root in FLAT_MINOR_ROOTS
+    return root in FLAT_MAJOR_ROOTS
+
+
+def transpose_name(name, semitones, spelling="auto"):
+    """
+    Transpose every note letter in a chord name, e.g. 'C6/Am7' +2 -> 'D6/Bm7'.
+
+    Args:
+        name (str): The chord name.
+        semitones (int): Number of semitones.
+        spelling (str): 'auto', 'sharps' or 'flats'.
+
+    Returns:
+        tuple: (new_name, prefer_flats) where prefer_flats is the spelling used for the root.
+    """
+    match = _NOTE_PATTERN.match(name.strip())
+    if not match:
+        return name, False
+    root = (note_to_pitch_class(match.group(0)) + semitones) % 12
+    prefer_flats = _prefers_flats(root, name.strip()[match.end():], spelling)
+
+    def replace(m):
+        pitch_class = (note_to_pitch_class(m.group(0)) + semitones) % 12
+        return pitch_class_to_note(pitch_class, prefer_flats)
+
+    return _NOTE_PATTERN.sub(replace, name.strip()), prefer_flats
+
+
+def _unique_fingerings(chords):
+    """
+    Deduplicate the fingerings of a chord list into an int array.
+
+    Large packs repeat the same shapes many times, so only the distinct shapes
+    are parsed and shifted.
+
+    Args:
+        chords (list): Chord dictionaries.
+
+    Returns:
+        tuple: (frets, shape_ids) where frets has one row per distinct shape
+            (-1 for muted or padded strings) and shape_ids maps each chord to its row.
+    """
+    shapes = {}
+    shape_ids = np.fromiter(
+        (shapes.setdefault(tuple(c.get("fingering", ())), len(shapes)) for c in chords),
+        dtype=np.int32, count=len(chords))
+    width = max((len(shape) for shape in shapes), default=0)
+    frets = np.full((len(shapes), width), -1, dtype=np.int16)
+    for row, shape in enumerate(shapes):
+        frets[row, :len(shape)] = [int(f) if str(f).strip().isdigit() else -1 for f in shape]
+    return frets, shape_ids
+
+
+def transpose_chords(chords, semitones, capo=False, tuning=None, spelling="auto"):
+    """
+    Transpose a whole chord list in one pass.
+
+    In transpose mode every fingering is moved up or down the neck by the given
+    number of semitones. A shape that would leave the neck, e.g. one with open
+    strings moved down, is moved by the same interval an octave the other way
+    instead; if that doesn't fit either, the easiest generated voicing of the
+    new name is used, and only chords without one are dropped. In capo
+    mode the shapes stay the same (relative to the capo) and only the sounding
+    names and notes change; shapes that no longer fit above the capo are dropped.
+
+    Fret arithmetic is done on one array for all chords, and every distinct
+    name and note list is converted only once.
+
+    Args:
+        chords (list): Chord dictionaries.
+        semitones (int): Number of semitones (capo position in capo mode).
+        capo (bool): Keep shapes and only rename them.
+        tuning (Tuning, optional): Profile providing the fret count. Defaults to the active tuning.
+        spelling (str): 'auto', 'sharps' or 'flats'.
+
+    Returns:
+        list: New chord dictionaries; the input list is not modified.
+    """
+    if not chords:
+        return []
+    tuning = tuning or get_tuning()
+    if semitones == 0:
+        return [dict(c) for c in chords]
+
+    frets, shape_ids = _unique_fingerings(chords)
+    fretted = frets >= 0
+    if capo:
+        shifted = frets
+        on_neck = (np.where(fretted, frets, 0) + semitones <= tuning.frets).all(axis=1)
+        keeps_fingers = np.ones(len(chords), dtype=bool)
+    else:
+        shifted = np.where(fretted, frets + semitones, -1)
+        on_neck = (~fretted | ((shifted >= 0) & (shifted <= tuning.frets))).all(axis=1)
+        # e.g. -2 becomes +10: same names and notes, the shape sits an octave higher
+        octave = semitones - 12 if semitones > 0 else semitones + 12
+        moved = np.where(fretted, frets + octave, -1)
+        use_octave = ~on_neck & (~fretted | ((moved >= 0) & (moved <= tuning.frets))).all(axis=1)
+        shifted = np.where(use_octave[:, None], moved, shifted)
+        on_neck |= use_octave
+        # moving a shape with open strings turns them into fretted notes, so the fingers are solved again
+        keeps_fingers = ~(frets == 0).any(axis=1)
+
+    fret_labels = [str(f) for f in range(tuning.frets + 1)]
+    shape_rows = [[fret_labels[f] if f >= 0 else "x" for f in row] for row in shifted.tolist()]
+    on_neck = on_neck.tolist()
+    keeps_fingers = keeps_fingers.tolist()
+
+    name_cache = {}
+    notes_cache = {}
+    fingers_cache = {}
+    voicing_cache = {}
+
+    def move(notes, prefer_flats):
+        key = (*notes, prefer_flats)
+        moved = notes_cache.get(key)
+        if moved is None:
+            moved = notes_cache[key] = [
+                note if pc is None else pitch_class_to_note(pc + semitones, prefer_flats)
+                for note, pc in ((n, note_to_pitch_class(n)) for n in notes)
+            ]
+        return moved[:]
+
+    result = []
+    for chord, shape in zip(chords, shape_ids.tolist()):
+        name = chord["name"]
+        if name not in name_cache:
+            name_cache[name] = transpose_name(name, semitones, spelling)
+        new_name, prefer_flats = name_cache[name]
+
+        if not on_neck[shape]:
+            if capo:
+                # capo shapes are read relative to the capo, a voicing from the open neck would sound wrong
+                continue
+            key = (new_name, prefer_flats)
+            if key not in voicing_cache:
+                voicings = generate_voicings(new_name, tuning.open_pitches, limit=1, max_fret=tuning.frets)
+                if voicings:
+                    fingering = voicings[0]
+                    voicing_cache[key] = (fingering, solve_fingers(fingering) or ["0"] * len(fingering),
+                                          [pitch_class_to_note(int(tuning.pitch_class_table[string, int(fret)]),
+                                                               prefer_flats)
+                                           for string, fret in enumerate(fingering)])
+                else:
+                    voicing_cache[key] = None
+            if voicing_cache[key] is None:
+                continue
+            fingering, fingers, notes = voicing_cache[key]
+            result.append({
+                **chord,
+                "name": new_name,
+                "fingering": fingering[:],
+                "fingers": fingers[:],
+                "notes_on_strings": notes[:],
+                "chord_notes": move(chord.get("chord_notes", ()), prefer_flats),
+            })
+            result[-1].pop("tunings", None)
+            continue
+
+        fingering = shape_rows[shape][:len(chord.get("fingering", ()))]
+        new_chord = {
+            **chord,
+            "name": new_name,
+            "fingering": fingering,
+            "notes_on_strings": move(chord.get("notes_on_strings", ()), prefer_flats),
+            "chord_notes": move(chord.get("chord_notes", ()), prefer_flats),
+        }
+        if not keeps_fingers[shape]:
+            if shape not in fingers_cache:
+                fingers_cache[shape] = solve_fingers(fingering) or ["0"] * len(fingering)
+            new_chord["fingers"] = fingers_cache[shape][:]
+        if not capo:
+            # stored fingerings for other tunings were not moved
+            new_chord.pop("tunings", None)
+        result.append(new_chord)
+    return result
@@ -0,0 +1,148 @@
+import numpy as np
+import config
+from utils.chord_theory import pitch_class_to_note
+from utils.voicing_generator import generate_voicings
+from utils.finger_solver import solve_fingers
+
+
+class Tuning:
+    """
+    An instrument profile: string names, open string pitches and fret count.
+
+    The fret-to-pitch table is computed once when the profile is created, so
+    looking up the notes of a fingering is plain indexing no matter how often
+    the tuning is switched.
+
+    Attributes:
+        key (str): Internal name, used in the config and in the chord database.
+        string_names (list): Note names of the open strings, top to bottom in the diagram.
+        open_pitches (list): MIDI pitches of the open strings.
+        frets (int): Number of frets shown and allowed in fingerings.
+        fingering_key (str): Tuning whose fingerings can be used as-is (e.g. low G uses standard).
+        pitch_table (np.ndarray): MIDI pitch per (string, fret).
+        pitch_class_table (np.ndarray): Pitch class per (string, fret).
+        note_table (list): Note name per [string][fret].
+    """
+
+    def __init__(self, key, string_names, open_pitches, frets=12, fingering_key=None):
+        self.key = key
+        self.string_names = list(string_names)
+        self.open_pitches = list(open_pitches)
+        self.frets = frets
+        self.fingering_key = fingering_key or key
+
+        self.pitch_table = np.asarray(open_pitches, dtype=np.int16)[:, None] + np.arange(frets + 1, dtype=np.int16)
+        self.pitch_table.flags.writeable = False
+        self.pitch_class_table = self.pitch_table % 12
+        self.pitch_class_table.flags.writeable = False
+        self.note_table = [[pitch_class_to_note(pc) for pc in row] for row in self.pitch_class_table.tolist()]
+
+    @property
+    def strings(self):
+        """int: Number of strings."""
+        return len(self.open_pitches)
+
+    def is_valid_fret(self, fret):
+        """
+        Check whether a fret number exists on this instrument.
+
+        Args:
+            fret (int): Fret number.
+
+        Returns:
+            bool: True if 0 <= fret <= frets.
+        """
+        return 0 <= fret <= self.frets
+
+    def pitches(self, fingering):
+        """
+        Look up the sounding MIDI pitches of a fingering, skipping muted strings.
+
+        Args:
+            fingering (list): Fret per string.
+
+        Returns:
+            list: MIDI pitches of all sounding strings.
+        """
+        pitches = []
+        for string_index, fret in enumerate(fingering[:self.strings]):
+            try:
+                fret = int(fret)
+            except (TypeError, ValueError):
+                continue
+            if self.is_valid_fret(fret):
+                pitches.append(int(self.pitch_table[string_index, fret]))
+        return pitches
+
+    def notes(self, fingering):
+        """
+        Look up the note name sounding on every string.
+
+        Args:
+            fingering (list): Fret per string.
+
+        Returns:
+            list or None: Note names, or None if a fret is invalid.
+        """
+        notes = []
+        for string_index, fret in enumerate(fingering[:self.strings]):
+            try:
+                fret = int(fret)
+            except (TypeError, ValueError):
+                return None
+            if not self.is_valid_fret(fret):
+                return None
+            notes.append(self.note_table[string_index][fret])
+        return notes
+
+
+TUNINGS = {
+    "standard": Tuning("standard", ["G", "C", "E", "A"], [67, 60, 64, 69]),
+    "low_g": Tuning("low_g", ["G", "C", "E", "A"], [55, 60, 64, 69], fingering_key="standard"),
+    "d_tuning": Tuning("d_tuning", ["A", "D", "F#", "B"], [69, 62, 66, 71]),
+    "baritone": Tuning("baritone", ["D", "G", "B", "E"], [50, 55, 59, 64]),
+}
+
+
+def get_tuning(key=None):
+    """
+    Return a tuning profile, falling back to standard tuning for unknown keys.
+
+    Args:
+        key (str, optional): Tuning key. Defaults to config.TUNING.
+
+    Returns:
+        Tuning: The tuning profile.
+    """
+    return TUNINGS.get(key or config.TUNING, TUNINGS["standard"])
+
+
+def chord_fingering(chord, tuning=None):
+    """
+    Return fingering and fingers of a chord for the given tuning.
+
+    Chords carry their standard fingering at the top level and may store more
+    under 'tunings', e.g. {"baritone": {"fingering": [...], "fingers": [...]}}.
+    If no fingering is stored for a tuning, the easiest generated voicing is used.
+    Missing finger numbers are filled in by the finger solver.
+
+    Args:
+        chord (dict): The chord entry.
+        tuning (Tuning, optional): Target tuning. Defaults to the active tuning.
+
+    Returns:
+        tuple: (fingering, fingers), both empty lists if the chord can't be played.
+    """
+    tuning = tuning or get_tuning()
+    if tuning.fingering_key == "standard":
+        return chord["fingering"], chord["fingers"]
+
+    stored = chord.get("tunings", {}).get(tuning.fingering_key)
+    if stored:
+        fingers = stored.get("fingers") or solve_fingers(stored["fingering"]) or ["0"] * len(stored["fingering"])
+        return stored["fingering"], fingers
+
+    voicings = generate_voicings(chord["name"], tuning.open_pitches, limit=1, max_fret=tuning.frets)
+    if not voicings:
+        return [], []
+    return voicings[0], solve_fingers(voicings[0]) or ["0"] * len(voicings[0])
@@ -0,0 +1,137 @@
+from functools import lru_cache
+import numpy as np
+from utils.chord_theory import CHORD_QUALITIES, STANDARD_TUNING, mask_from_pitch_classes, rotate_mask
+from utils.chord_parser import parse_chord_symbol
+
+
+MAX_FRET = 12
+MAX_STRETCH = 3            # highest minus lowest fretted fret
+OPEN_STRING_MAX_FRET = 5   # open strings are only combined with low positions
+
+
+@lru_cache(maxsize=None)
+def position_grid(strings=4, max_fret=MAX_FRET):
+    """
+    Return every possible fret combination for the given number of strings.
+
+    Args:
+        strings (int): Number of strings.
+        max_fret (int): Highest fret, inclusive.
+
+    Returns:
+        np.ndarray: Array of shape ((max_fret + 1) ** strings, strings).
+    """
+    grid = np.indices((max_fret + 1,) * strings, dtype=np.int8).reshape(strings, -1).T
+    grid.flags.writeable = False
+    return grid
+
+
+@lru_cache(maxsize=None)
+def _position_features(open_pitches, max_fret=MAX_FRET):
+    """
+    Compute pitch class masks, playability and ranking scores for the whole grid.
+
+    Args:
+        open_pitches (tuple): MIDI pitches of the open strings.
+        max_fret (int): Highest fret, inclusive.
+
+    Returns:
+        tuple: (masks, playable, scores) arrays aligned with position_grid.
+    """
+    grid = position_grid(len(open_pitches), max_fret).astype(np.int16)
+    pitch_classes = (grid + np.asarray(open_pitches, dtype=np.int16)) % 12
+    masks = np.bitwise_or.reduce(np.left_shift(1, pitch_classes), axis=1)
+
+    fretted = grid > 0
+    fretted_count = fretted.sum(axis=1)
+    highest = grid.max(axis=1)
+    lowest = np.where(fretted, grid, max_fret + 1).min(axis=1)
+    span = np.where(fretted_count > 0, highest - lowest, 0)
+    has_open = (~fretted).any(axis=1)
+
+    playable = (span <= MAX_STRETCH) & ~(has_open & (highest > OPEN_STRING_MAX_FRET))
+
+    # lower is easier: short stretch, few fretted strings, close to the nut
+    scores = span * 2.0 + fretted_count + np.where(fretted_count > 0, lowest, 0) * 0.5
+    return masks, playable, scores
+
+
+@lru_cache(maxsize=None)
+def _quality_voicings(open_pitches, quality, max_fret=MAX_FRET):
+    """
+    Find and rank all playable voicings of a chord quality for all twelve roots.
+
+    The position features are shared between qualities; per quality only the
+    twelve transposed target masks are compared against the grid.
+
+    Args:
+        open_pitches (tuple): MIDI pitches of the open strings.
+        quality (str): Key of CHORD_QUALITIES.
+        max_fret (int): Highest fret, inclusive.
+
+    Returns:
+        tuple: Twelve arrays (one per root) of fret rows, easiest voicing first.
+    """
+    intervals = CHORD_QUALITIES[quality]
+    chord_mask = mask_from_pitch_classes(intervals)
+    # the fifth may be left out of chords with four or more tones
+    required_mask = chord_mask
+    if len(intervals) >= 4 and 7 in intervals:
+        required_mask &= ~(1 << 7)
+
+    grid = position_grid(len(open_pitches), max_fret)
+    masks, playable, scores = _position_features(open_pitches, max_fret)
+
+    results = []
+    for root in range(12):
+        allowed = rotate_mask(chord_mask, root)
+        required = rotate_mask(required_mask, root)
+        hits = playable & ((masks & ~allowed) == 0) & ((masks & required) == required)
+        indices = np.flatnonzero(hits)
+        order = indices[np.argsort(scores[indices], kind="stable")]
+        voicings = grid[order]
+        voicings.flags.writeable = False
+        results.append(voicings)
+    return tuple(results)
+
+
+def split_chord_name(name):
+    """
+    Split a chord name into root pitch class and a CHORD_QUALITIES suffix.
+
+    Any spelling the chord symbol parser understands works ('CM7', 'Cmaj7');
+    a slash bass is ignored.
+
+    Args:
+        name (str): The chord name, e.g. 'C#m7' or 'C6/Am7'.
+
+    Returns:
+        tuple or None: (root, quality) or None if the quality is unknown.
+    """
+    symbol = parse_chord_symbol(name)
+    if symbol is None or symbol.quality_key() is None:
+        return None
+    return symbol.root_pitch_class, symbol.quality_key()
+
+
+def generate_voicings(name, open_pitches=STANDARD_TUNING, limit=None, max_fret=MAX_FRET):
+    """
+    Return ranked playable voicings for a chord name.
+
+    Args:
+        name (str): The chord name.
+        open_pitches (list): MIDI pitches of the open strings.
+        limit (int, optional): Maximum number of voicings to return.
+        max_fret (int): Highest fret, inclusive.
+
+    Returns:
+        list: Fingerings as lists of strings, easiest first. Empty for unknown chords.
+    """
+    parsed = split_chord_name(name)
+    if parsed is None:
+        return []
+    root, quality = parsed
+    voicings = _quality_voicings(tuple(open_pitches), quality, max_fret)[root]
+    if limit is not None:
+        voicings = voicings[:limit]
+    return [[str(fret) for fret in row] for row in voicings.tolist()]
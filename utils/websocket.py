@@ -0,0 +1,190 @@
+import asyncio
+import base64
+import hashlib
+import os
+import struct
+
+
+GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"   # fixed by RFC 6455
+OP_CONTINUATION = 0x0
+OP_TEXT = 0x1
+OP_BINARY = 0x2
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+MAX_PAYLOAD = 1 << 16     # trainer messages are small JSON objects
+MAX_HEADER_BYTES = 8192
+
+
+class WebSocketError(Exception):
+    """ The peer broke the protocol or closed the connection. """
+
+
+def accept_key(key):
+    """
+    Compute the Sec-WebSocket-Accept value for a handshake key.
+
+    Args:
+        key (str): The client's Sec-WebSocket-Key header.
+
+    Returns:
+        str: The value the server answers with.
+    """
+    return base64.b64encode(hashlib.sha1((key + GUID).encode("ascii")).digest()).decode("ascii")
+
+
+def _apply_mask(payload, mask):
+    """XOR a payload with a 4-byte mask, as one big integer operation instead of a byte loop."""
+    if not payload:
+        return payload
+    length = len(payload)
+    key = (mask * (length // 4 + 1))[:length]
+    return (int.from_bytes(payload, "little") ^ int.from_bytes(key, "little")).to_bytes(length, "little")
+
+
+def encode_frame(payload, opcode=OP_TEXT, mask=False):
+    """
+    Build one unfragmented frame.
+
+    Args:
+        payload (bytes or str): Message body; str is sent UTF-8 encoded.
+        opcode (int): Frame type, e.g. OP_TEXT or OP_CLOSE.
+        mask (bool): Mask the payload; clients must, servers must not.
+
+    Returns:
+        bytes: The frame ready to be written.
+    """
+    if isinstance(payload, str):
+        payload = payload.encode("utf-8")
+    length = len(payload)
+    mask_bit = 0x80 if mask else 0
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, mask_bit | length)
+    elif length < 1 << 16:
+        header = struct.pack("!BBH", 0x80 | opcode, mask_bit | 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, mask_bit | 127, length)
+    if mask:
+        key = os.urandom(4)
+        return header + key + _apply_mask(payload, key)
+    return header + payload
+
+
+async def read_frame(reader, max_payload=MAX_PAYLOAD):
+    """
+    Read one frame.
+
+    Fragmented messages are not supported; the trainer never sends them.
+
+    Args:
+        reader (asyncio.StreamReader): The connection.
+        max_payload (int): Larger frames are refused.
+
+    Returns:
+        tuple: (opcode, payload bytes), unmasked.
+
+    Raises:
+        WebSocketError: On a protocol violation or when the connection ended.
+    """
+    try:
+        first, second = await reader.readexactly(2)
+        length = second & 0x7F
+        if length == 126:
+            length = struct.unpack("!H", await reader.readexactly(2))[0]
+        elif length == 127:
+            length = struct.unpack("!Q", await reader.readexactly(8))[0]
+        if not first & 0x80 or first & 0x0F == OP_CONTINUATION:
+            raise WebSocketError("fragmented messages are not supported")
+        if length > max_payload:
+            raise WebSocketError(f"frame of {length} bytes is too large")
+        key = await reader.readexactly(4) if second & 0x80 else None
+        payload = await reader.readexactly(length)
+    except (asyncio.IncompleteReadError, ConnectionError) as e:
+        raise WebSocketError("connection closed") from e
+    if key is not None:
+        payload = _apply_mask(payload, key)
+    return first & 0x0F, payload
+
+
+async def read_http_head(reader):
+    """
+    Read the start line and headers of an HTTP request or response.
+
+    Args:
+        reader (asyncio.StreamReader): The connection.
+
+    Returns:
+        tuple: (start line split into at most three parts, headers with lower-case names).
+
+    Raises:
+        WebSocketError: If the connection ended or the head is malformed or too large.
+    """
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError) as e:
+        raise WebSocketError("incomplete HTTP head") from e
+    if len(head) > MAX_HEADER_BYTES:
+        raise WebSocketError("HTTP head too large")
+    lines = head.decode("latin-1").split("\r\n")
+    start = lines[0].split(" ", 2)
+    if len(start) < 2:
+        raise WebSocketError(f"malformed start line {lines[0]!r}")
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+    return start, headers
+
+
+def handshake_response(headers):
+    """
+    Build the server's answer to a WebSocket upgrade request.
+
+    Args:
+        headers (dict): Request headers with lower-case names.
+
+    Returns:
+        bytes: The 101 response.
+
+    Raises:
+        WebSocketError: If the request is not a valid upgrade.
+    """
+    key = headers.get("sec-websocket-key")
+    if headers.get("upgrade", "").lower() != "websocket" or not key:
+        raise WebSocketError("not a WebSocket upgrade")
+    return ("HTTP/1.1 101 Switching Protocols\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept_key(key)}\r\n\r\n").encode("ascii")
+
+
+async def connect(host, port, path="/"):
+    """
+    Open a client connection, e.g. for tools and load tests.
+
+    Args:
+        host (str): Server host.
+        port (int): Server port.
+        path (str): Request path including the query.
+
+    Returns:
+        tuple: (asyncio.StreamReader, asyncio.StreamWriter) after a successful handshake.
+
+    Raises:
+        WebSocketError: If the server does not accept the upgrade.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    key = base64.b64encode(os.urandom(16)).decode("ascii")
+    writer.write((f"GET {path} HTTP/1.1\r\n"
+                  f"Host: {host}:{port}\r\n"
+                  "Upgrade: websocket\r\n"
+                  "Connection: Upgrade\r\n"
+                  f"Sec-WebSocket-Key: {key}\r\n"
+                  "Sec-WebSocket-Version: 13\r\n\r\n").encode("ascii"))
+    await writer.drain()
+    start, headers = await read_http_head(reader)
+    if start[1] != "101" or headers.get("sec-websocket-accept") != accept_key(key):
+        writer.close()
+        raise WebSocketError(f"handshake refused: {' '.join(start)}")
+    return reader, writer